@@ -1,12 +1,21 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
 import asyncio
 import json
 import os
 import sys
 from datetime import datetime
+import hashlib
+import math
+import time
 import traceback
-from config import GUILD_ID, OWNER_ID, LOG_CHANNEL_ID, validate_config
+from config import GUILD_ID, OWNER_ID, LOG_CHANNEL_ID, MEMBER_CACHE_MODE, validate_config
+from member_cache import cache_options
+from memory_stats import format_bytes, process_rss
+from metrics import REGISTRY, install_rate_limit_counter
+from perf import TRACKER, instrument_http, instrument_ui
+from docstore import DOCUMENTS
 
 intents = discord.Intents.default()
 intents.message_content = True
@@ -17,7 +26,42 @@ _log_throttle = {}
 _log_throttle_window = 10
 _log_last_message = None
 
-bot = commands.Bot(command_prefix='!', intents=intents)
+class InstrumentedTree(app_commands.CommandTree):
+    async def _call(self, interaction):
+        data = interaction.data or {}
+        with TRACKER.span(f"/{data.get('name', 'unknown')}"):
+            await super()._call(interaction)
+
+class NewLifeBot(commands.Bot):
+    async def close(self):
+        """Unload cogs, then wait for queued document writes before the loop goes away"""
+        await super().close()
+        try:
+            await asyncio.wait_for(DOCUMENTS.flush_all(), timeout=10)
+        except asyncio.TimeoutError:
+            print("⚠️ Timed out flushing data files on shutdown")
+
+bot = NewLifeBot(command_prefix='!', intents=intents, tree_cls=InstrumentedTree,
+                   **cache_options(MEMBER_CACHE_MODE, intents))
+
+COMMAND_LATENCY = REGISTRY.histogram(
+    "newlife_command_duration_seconds",
+    "Prefix command execution time",
+    ("command", "status"),
+)
+BOT_LOG_PENDING = REGISTRY.gauge(
+    "newlife_bot_log_pending",
+    "bot_log records waiting on a Discord send",
+)
+if __name__ == "__main__":
+    REGISTRY.gauge(
+        "newlife_gateway_latency_seconds",
+        "Discord gateway heartbeat latency",
+        fn=lambda: bot.latency if math.isfinite(bot.latency) else None,
+    )
+install_rate_limit_counter()
+instrument_http(bot.http)
+instrument_ui()
 
 try:
     validate_config()
@@ -40,125 +84,164 @@ async def bot_log(message, *, error=False, force=False, exc_info=None):
             if exc_info:
                 tb = ''.join(traceback.format_exception(None, exc_info, exc_info.__traceback__))
                 content += f"\n```{tb[-1500:]}```"
-            _log_last_message = await channel.send(content)
+            BOT_LOG_PENDING.inc()
+            try:
+                _log_last_message = await channel.send(content)
+            finally:
+                BOT_LOG_PENDING.dec()
         except Exception as e:
             print(f"[BOT-LOG] Could not send log: {e}")
     else:
         print(f"[BOT-LOG] {message}")
 
+_process_started = time.perf_counter()
+_startup_timings = {}
+_ready_once = False
+
+EXTENSION_DEPENDENCIES = {
+    "minecraft_linking": ("minecraft_integration",),
+}
+
+@bot.event
+async def setup_hook():
+    """Load extensions and sync commands once per process, before the gateway connects"""
+    started = time.perf_counter()
+    await load_cogs()
+    _startup_timings["extensions"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await sync_command_tree()
+    _startup_timings["command_sync"] = time.perf_counter() - started
+    _startup_timings["setup_hook"] = time.perf_counter() - _process_started
+
 @bot.event
 async def on_ready():
+    global _ready_once
+    if _ready_once:
+        print(f"Reconnected as {bot.user}")
+        return
+    _ready_once = True
+    _startup_timings["ready"] = time.perf_counter() - _process_started
+
     await bot_log(f'{bot.user} has connected to Discord!')
     await bot_log(f'Bot is in {len(bot.guilds)} guild(s)')
     await bot_log(f"[Bot] Bot started successfully.")
-    await update_server_data()
-    await load_cogs()
-    try:
-        guild = bot.get_guild(GUILD_ID)
-        if guild is not None:
-            synced = await bot.tree.sync(guild=guild)
-            await bot_log(f"Slash commands synced to guild {guild.id}: {len(synced)} command(s)")
-        else:
-            synced = await bot.tree.sync()
-            await bot_log(f"Global slash commands synced: {len(synced)} command(s)")
-    except Exception as e:
-        await bot_log(f"Failed to sync application commands: {e}", error=True, exc_info=e)
 
-async def update_server_data():
-    """Update server channels and roles data"""
-    guild = bot.get_guild(GUILD_ID)
-    if not guild:
-        print(f"Error: Could not find guild with ID {GUILD_ID}")
-        return
+    await report_startup_timings()
 
-    server_data = {
-        "guild_name": guild.name,
-        "guild_id": guild.id,
-        "last_updated": datetime.now().isoformat(),
-        "channels": {},
-        "roles": {},
-        "member_count": guild.member_count
-    }
-
-    for category in guild.categories:
-        server_data["channels"][category.name] = {
-            "category_id": category.id,
-            "channels": []
-        }
-        for channel in category.channels:
-            channel_info = {
-                "name": channel.name,
-                "id": channel.id,
-                "type": str(channel.type)
-            }
-            server_data["channels"][category.name]["channels"].append(channel_info)
-
-    uncategorized_channels = [ch for ch in guild.channels if not ch.category]
-    if uncategorized_channels:
-        server_data["channels"]["Uncategorized"] = {
-            "category_id": None,
-            "channels": []
-        }
-        for channel in uncategorized_channels:
-            channel_info = {
-                "name": channel.name,
-                "id": channel.id,
-                "type": str(channel.type)
-            }
-            server_data["channels"]["Uncategorized"]["channels"].append(channel_info)
-
-    for role in guild.roles:
-        server_data["roles"][role.name] = {
-            "id": role.id,
-            "position": role.position,
-            "permissions": role.permissions.value,
-            "color": str(role.color),
-            "mentionable": role.mentionable,
-            "hoisted": role.hoist
-        }
+async def report_startup_timings():
+    """Log how long each startup phase took"""
+    phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in _startup_timings.items()
+                       if not name.startswith("ext:"))
+    slowest = sorted(((name[4:], seconds) for name, seconds in _startup_timings.items() if name.startswith("ext:")),
+                     key=lambda item: item[1], reverse=True)[:5]
+    memory = f"member cache {MEMBER_CACHE_MODE} ({sum(len(g.members) for g in bot.guilds)} cached), RSS {format_bytes(process_rss())}"
+    print(f"Startup timings: {phases}; {memory}")
+    message = f"[Bot] Startup timings: {phases}\n{memory}"
+    if slowest:
+        message += "\nSlowest extensions: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in slowest)
+    await bot_log(message)
 
-    data_dir = os.path.join(os.path.dirname(__file__), "data")
+def _command_payload_hash(guild):
+    payload = []
+    for command in bot.tree.get_commands(guild=guild):
+        try:
+            payload.append(command.to_dict(bot.tree))
+        except TypeError:
+            payload.append(command.to_dict())
+    payload.sort(key=lambda item: (item.get("type", 1), item.get("name", "")))
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest(), len(payload)
+
+async def sync_command_tree():
+    """Sync application commands only when their payload changed since the last sync"""
+    path = os.path.join(os.path.dirname(__file__), "data", "command_sync.json")
     try:
-        os.makedirs(data_dir, exist_ok=True)
-        with open(os.path.join(data_dir, "server_data.json"), "w", encoding="utf-8") as f:
-            json.dump(server_data, f, indent=2, ensure_ascii=False)
-        print(f"Server data updated for {guild.name}")
-    except Exception as e:
-        print(f"Could not save server data to data folder: {e}")
+        with open(path, "r") as f:
+            synced_hashes = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        synced_hashes = {}
+
+    guild = discord.Object(id=GUILD_ID)
+    scopes = [(f"guild:{GUILD_ID}", guild)]
+    if bot.tree.get_commands():
+        scopes.append(("global", None))
+
+    changed = False
+    for key, scope in scopes:
+        digest, count = _command_payload_hash(scope)
+        if synced_hashes.get(key) == digest:
+            print(f"Slash commands unchanged for {key} ({count} command(s)); skipping sync")
+            continue
+        try:
+            synced = await bot.tree.sync(guild=scope)
+            synced_hashes[key] = digest
+            changed = True
+            print(f"Slash commands synced for {key}: {len(synced)} command(s)")
+        except Exception as e:
+            print(f"Failed to sync application commands for {key}: {e}")
+            await bot_log(f"Failed to sync application commands: {e}", error=True, exc_info=e)
+
+    if changed:
         try:
-            with open("server_data.json", "w", encoding="utf-8") as f:
-                json.dump(server_data, f, indent=2, ensure_ascii=False)
-            print(f"Server data saved as server_data.json in current directory")
-        except Exception as e2:
-            print(f"Could not save server data anywhere: {e2}")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(synced_hashes, f, indent=2)
+        except Exception as e:
+            print(f"Could not save command sync state: {e}")
 
 async def load_cogs():
-    """Load all cogs from the cogs folder"""
+    """Load all extensions concurrently, respecting EXTENSION_DEPENDENCIES"""
+    extensions = []
     cogs_path = os.path.join(os.path.dirname(__file__), "cogs")
-    if not os.path.exists(cogs_path):
+    if os.path.exists(cogs_path):
+        for filename in sorted(os.listdir(cogs_path)):
+            if filename.endswith(".py") and not filename.startswith("__"):
+                extensions.append(f"cogs.{filename[:-3]}")
+    else:
         print("Cogs folder not found")
-        return
+    extensions.extend(["minecraft_integration", "minecraft_linking"])
 
-    for filename in os.listdir(cogs_path):
-        if filename.endswith(".py") and not filename.startswith("__"):
-            try:
-                await bot.load_extension(f"cogs.{filename[:-3]}")
-                print(f"Loaded cog: {filename[:-3]}")
-            except Exception as e:
-                print(f"Failed to load cog {filename}: {e}")
+    loaded = {name: asyncio.Event() for name in extensions}
+    failed = set()
 
-    try:
-        await bot.load_extension("minecraft_integration")
-        print("Loaded: minecraft_integration")
-    except Exception as e:
-        print(f"Minecraft integration not loaded: {e}")
-        print("Create minecraft_config.txt to enable Minecraft integration")
+    async def load(name):
+        try:
+            for dependency in EXTENSION_DEPENDENCIES.get(name, ()):
+                if dependency in loaded:
+                    await loaded[dependency].wait()
+                if dependency in failed:
+                    failed.add(name)
+                    print(f"Skipped {name}: dependency {dependency} failed to load")
+                    return
+            started = time.perf_counter()
+            await bot.load_extension(name)
+            _startup_timings[f"ext:{name}"] = time.perf_counter() - started
+            print(f"Loaded: {name}")
+        except Exception as e:
+            failed.add(name)
+            print(f"Failed to load {name}: {e}")
+            if name == "minecraft_integration":
+                print("Create minecraft_config.txt to enable Minecraft integration")
+        finally:
+            loaded[name].set()
 
-    try:
-        await bot.load_extension("minecraft_linking")
-        print("Loaded: minecraft_linking")
-    except Exception as e:
-        print(f"Minecraft linking not loaded: {e}")
+    await asyncio.gather(*(load(name) for name in extensions))
+
+@bot.before_invoke
+async def start_command_timer(ctx):
+    ctx.command_started_at = time.perf_counter()
+    ctx.perf_token = TRACKER.start(f"!{ctx.command.qualified_name}")
+
+@bot.after_invoke
+async def record_command_latency(ctx):
+    token = getattr(ctx, 'perf_token', None)
+    if token is not None:
+        TRACKER.finish(token)
+    started = getattr(ctx, 'command_started_at', None)
+    if started is None or ctx.command is None:
+        return
+    status = "error" if ctx.command_failed else "ok"
+    COMMAND_LATENCY.observe(time.perf_counter() - started, ctx.command.qualified_name, status)
 
 @bot.event
 async def on_command_error(ctx, error):
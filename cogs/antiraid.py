@@ -0,0 +1,163 @@
+import discord
+from discord.ext import commands
+import asyncio
+import time
+from datetime import datetime, timezone
+from config import GUILD_ID, STAFF_LOG_CHANNEL_ID, RAID_THRESHOLDS, RAID_RESPONSES, RAID_CALM_SECONDS
+from bot import bot_log
+from raid_detector import RaidDetector
+from supervisor import SUPERVISOR
+
+class AntiRaid(commands.Cog):
+    """Watches the join rate and pauses intake while a raid is in progress"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.detector = RaidDetector(**RAID_THRESHOLDS)
+        self.responses = RAID_RESPONSES
+        self.engaged_at = None
+        self.engaged_by = None
+        self.reasons = []
+        self.joins_during_raid = 0
+
+    async def cog_load(self):
+        SUPERVISOR.supervise("antiraid-calm-watch", self.calm_watch, owner="AntiRaid")
+
+    async def cog_unload(self):
+        SUPERVISOR.cancel_owner("AntiRaid")
+
+    @property
+    def engaged(self):
+        return self.engaged_at is not None
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        if member.guild.id != GUILD_ID or member.bot:
+            return
+        now = time.monotonic()
+        account_age = (datetime.now(timezone.utc) - member.created_at).total_seconds()
+        reasons = self.detector.record(now, account_age, member.avatar is not None)
+        if self.engaged:
+            self.joins_during_raid += 1
+        if reasons and not self.engaged:
+            await self.engage(reasons, automatic=True)
+
+    def _set_intake(self, paused_reason):
+        if "pause_tickets" in self.responses:
+            support = self.bot.get_cog('SupportCog')
+            if support:
+                support.intake_paused = paused_reason
+        if "lock_whitelist" in self.responses:
+            whitelist = self.bot.get_cog('WhitelistCog')
+            if whitelist:
+                whitelist.intake_paused = paused_reason
+
+    async def engage(self, reasons, automatic=True, by=None):
+        """Switch on the configured raid responses"""
+        self.engaged_at = time.monotonic()
+        self.engaged_by = "auto" if automatic else str(by)
+        self.detector.last_trigger = self.engaged_at
+        self.reasons = list(reasons)
+        self.joins_during_raid = 0
+        self._set_intake("Raid protection is active")
+        print(f"🛡️ Raid mode engaged ({self.engaged_by}): {', '.join(self.reasons)}")
+        await bot_log(f"[AntiRaid] Raid mode engaged ({self.engaged_by}): {', '.join(self.reasons)}")
+        if "alert_staff" in self.responses:
+            await self.alert_staff(
+                "🚨 Raid Detected" if automatic else "🛡️ Raid Mode Enabled",
+                "\n".join(f"• {reason}" for reason in self.reasons),
+                discord.Color.red()
+            )
+
+    async def disengage(self, automatic=True, by=None):
+        """Switch the raid responses back off"""
+        if not self.engaged:
+            return
+        duration = time.monotonic() - self.engaged_at
+        self.engaged_at = None
+        self.engaged_by = None
+        self._set_intake(None)
+        summary = f"Lifted {'automatically after a quiet period' if automatic else f'by {by}'} after {duration / 60:.1f} minute(s); {self.joins_during_raid} join(s) while active."
+        print(f"🛡️ Raid mode lifted: {summary}")
+        await bot_log(f"[AntiRaid] Raid mode lifted: {summary}")
+        if "alert_staff" in self.responses:
+            await self.alert_staff("✅ Raid Mode Lifted", summary, discord.Color.green())
+
+    async def alert_staff(self, title, description, color):
+        channel = self.bot.get_channel(STAFF_LOG_CHANNEL_ID)
+        if not channel:
+            return
+        stats = self.detector.snapshot(time.monotonic())
+        embed = discord.Embed(title=title, description=description, color=color, timestamp=discord.utils.utcnow())
+        for window, counts in stats.items():
+            young = counts["age_1h"] + counts["age_1d"] + counts["age_7d"]
+            embed.add_field(
+                name=f"Last {window}",
+                value=f"**Joins:** {counts['joins']}\n**< 7 days old:** {young}\n**No avatar:** {counts['no_avatar']}",
+                inline=True
+            )
+        actions = [name.replace("_", " ") for name in self.responses if name != "alert_staff"]
+        if actions:
+            embed.add_field(name="Responses", value=", ".join(actions), inline=False)
+        try:
+            await channel.send(embed=embed)
+        except discord.HTTPException as e:
+            print(f"❌ Could not send raid alert: {e}")
+
+    async def calm_watch(self):
+        """Lift automatic raid mode once no trigger has fired for the calm period"""
+        while True:
+            await asyncio.sleep(30)
+            SUPERVISOR.heartbeat()
+            if self.engaged and self.engaged_by == "auto" and self.detector.is_calm(time.monotonic(), RAID_CALM_SECONDS):
+                await self.disengage(automatic=True)
+
+    @commands.command(name='raidstatus')
+    @commands.has_any_role(1376432927444963420, 1374421915938324583)
+    async def raid_status(self, ctx):
+        """Show join-rate windows and whether raid mode is on"""
+        now = time.monotonic()
+        stats = self.detector.snapshot(now)
+        if self.engaged:
+            description = (f"🛡️ **Raid mode active** ({self.engaged_by}) for {(now - self.engaged_at) / 60:.1f} minute(s)\n"
+                           + "\n".join(f"• {reason}" for reason in self.reasons))
+            color = discord.Color.red()
+        else:
+            description = "✅ No raid in progress"
+            color = discord.Color.green()
+        embed = discord.Embed(title="Anti-Raid Status", description=description, color=color)
+        for window, counts in stats.items():
+            young = counts["age_1h"] + counts["age_1d"] + counts["age_7d"]
+            embed.add_field(
+                name=f"Last {window}",
+                value=f"**Joins:** {counts['joins']}\n**< 1 hour:** {counts['age_1h']}\n**< 7 days:** {young}\n**No avatar:** {counts['no_avatar']}",
+                inline=True
+            )
+        thresholds = self.detector
+        embed.set_footer(text=f"Triggers: {thresholds.joins_10s}/10s, {thresholds.joins_60s}/60s, "
+                              f"{thresholds.young_ratio:.0%} young, {thresholds.no_avatar_ratio:.0%} no avatar")
+        await ctx.send(embed=embed)
+
+    @commands.command(name='raidmode')
+    @commands.has_any_role(1376432927444963420, 1374421915938324583)
+    async def raid_mode(self, ctx, state: str):
+        """Manually turn raid mode on or off"""
+        state = state.lower()
+        if state in ("on", "enable"):
+            if self.engaged:
+                await ctx.send("🛡️ Raid mode is already active.")
+                return
+            await self.engage([f"Enabled manually by {ctx.author}"], automatic=False, by=ctx.author)
+            await ctx.send("🛡️ Raid mode enabled. Whitelist applications and new tickets are paused.")
+        elif state in ("off", "disable"):
+            if not self.engaged:
+                await ctx.send("✅ Raid mode is not active.")
+                return
+            await self.disengage(automatic=False, by=ctx.author)
+            await ctx.send("✅ Raid mode lifted.")
+        else:
+            await ctx.send("Usage: `!raidmode on` or `!raidmode off`")
+
+async def setup(bot):
+    """Setup function for the cog"""
+    await bot.add_cog(AntiRaid(bot))
@@ -0,0 +1,192 @@
+import discord
+from discord.ext import commands
+import asyncio
+import time
+from datetime import datetime
+from config import GUILD_ID
+from bot import bot_log
+from docstore import DOCUMENTS
+from metrics import REGISTRY
+from supervisor import SUPERVISOR
+from word_filter import ACTIONS, ChatFilter, Term, normalize
+
+FILTER_HITS = REGISTRY.counter(
+    "newlife_chat_filter_hits_total",
+    "Messages caught by the chat filter",
+    ("action",),
+)
+FILTER_SCAN = REGISTRY.histogram(
+    "newlife_chat_filter_scan_seconds",
+    "Time spent normalizing and matching one message",
+    buckets=(0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005, 0.01),
+)
+CASE_COOLDOWN = 600
+
+class ChatFilterCog(commands.Cog):
+    """Deletes, warns or opens a case for messages that contain filtered terms"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.document = DOCUMENTS.open("data/chat_filter.json", default=lambda: {"enabled": True, "terms": {}})
+        self.filter = None
+        self._generation = None
+        self.scanned = 0
+        self.recent_cases = {}
+
+    async def cog_load(self):
+        await self.document.load()
+        await self.rebuild()
+        SUPERVISOR.supervise("chat-filter-watch", self.watch_terms, owner="ChatFilterCog")
+
+    async def cog_unload(self):
+        SUPERVISOR.cancel_owner("ChatFilterCog")
+
+    async def rebuild(self):
+        """Compile the current terms off the loop and swap the new filter in"""
+        generation = self.document.generation
+        terms = dict(self.document.data.get("terms", {}))
+        started = time.perf_counter()
+        self.filter = await asyncio.to_thread(ChatFilter, terms)
+        self._generation = generation
+        print(f"🧹 Chat filter compiled: {len(self.filter.terms)} terms, {len(self.filter.automaton)} states in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    async def watch_terms(self):
+        """Pick up hand edits to the terms file without touching disk on the message path"""
+        while True:
+            await asyncio.sleep(30)
+            await self.document.refresh_if_changed(0)
+            if self._generation != self.document.generation:
+                await self.rebuild()
+            SUPERVISOR.heartbeat()
+
+    def case_allowed(self, user_id):
+        """At most one filter case per member per CASE_COOLDOWN; repeats are handled as warnings"""
+        now = time.monotonic()
+        last = self.recent_cases.get(user_id)
+        if last is not None and now - last < CASE_COOLDOWN:
+            return False
+        if len(self.recent_cases) > 1000:
+            self.recent_cases = {uid: at for uid, at in self.recent_cases.items() if now - at < CASE_COOLDOWN}
+        self.recent_cases[user_id] = now
+        return True
+
+    def is_exempt(self, member):
+        if not isinstance(member, discord.Member) or member.bot:
+            return True
+        moderation = self.bot.get_cog('ModerationCog')
+        return bool(moderation and moderation.has_life_team_permissions(member))
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        await self.check_message(message)
+
+    @commands.Cog.listener()
+    async def on_message_edit(self, before, after):
+        if before.content != after.content:
+            await self.check_message(after)
+
+    async def check_message(self, message):
+        if not message.guild or message.guild.id != GUILD_ID or not message.content:
+            return
+        if self.filter is None or not self.document.data.get("enabled", True) or self.is_exempt(message.author):
+            return
+        started = time.perf_counter()
+        action, matches = self.filter.scan(message.content)
+        FILTER_SCAN.observe(time.perf_counter() - started)
+        self.scanned += 1
+        if action:
+            FILTER_HITS.inc(action)
+            await self.enforce(message, action, sorted({match.term.text for match in matches}))
+
+    async def enforce(self, message, action, terms):
+        """Apply the strongest action; every action removes the message"""
+        author = message.author
+        if action == "case" and not self.case_allowed(author.id):
+            action = "warn"
+        try:
+            await message.delete()
+        except discord.NotFound:
+            pass
+        except discord.HTTPException as e:
+            print(f"❌ Chat filter could not delete a message in #{message.channel}: {e}")
+            return
+
+        if action in ("warn", "case"):
+            try:
+                await message.channel.send(f"⚠️ {author.mention}, your message was removed by the chat filter.", delete_after=8)
+            except discord.HTTPException:
+                pass
+
+        if action == "case":
+            moderation = self.bot.get_cog('ModerationCog')
+            if moderation:
+                reason = f"Chat filter in #{message.channel}: {', '.join(terms)}"
+                case_data = {
+                    "case_number": None,
+                    "moderator_id": self.bot.user.id,
+                    "moderator_name": str(self.bot.user),
+                    "target_id": author.id,
+                    "target_name": str(author),
+                    "type": "Chat Filter",
+                    "reason": reason,
+                    "timestamp": datetime.now().isoformat(),
+                    "date": datetime.now().strftime("%m/%d/%Y"),
+                    "time": datetime.now().strftime("%I:%M %p")
+                }
+                case_number = await moderation.add_case(case_data)
+                await moderation.send_staff_log(self.bot.user, author, "Chat Filter", reason, case_number)
+                await moderation.dm_user_infraction(author, "Chat Filter", reason, case_number)
+                return
+
+        await bot_log(f"[ChatFilter] {action} {author} in #{message.channel}: {', '.join(terms)}")
+
+    @commands.command(name='filter')
+    @commands.has_any_role(1376432927444963420, 1374421915938324583)
+    async def filter_command(self, ctx, subcommand: str = "status", *, argument: str = ""):
+        """Manage the chat filter: status, add <delete|warn|case> <term>, remove <term>, test <text>, on, off"""
+        subcommand = subcommand.lower()
+        await self.document.load()
+
+        if subcommand == "add":
+            action, _, raw = argument.partition(" ")
+            action = action.lower()
+            try:
+                Term.parse(raw, action)
+            except ValueError as e:
+                await ctx.send(f"✖ {e}. Usage: `!filter add <{'|'.join(ACTIONS)}> <term>`")
+                return
+            await self.document.update(lambda data: data.setdefault("terms", {}).__setitem__(raw.strip(), action))
+            await self.rebuild()
+            await ctx.send(f"✔ Added `{raw.strip()}` with action **{action}**.")
+        elif subcommand == "remove":
+            removed = await self.document.update(lambda data: data.setdefault("terms", {}).pop(argument.strip(), None))
+            await self.rebuild()
+            await ctx.send(f"✔ Removed `{argument.strip()}`." if removed else f"✖ `{argument.strip()}` is not in the filter.")
+        elif subcommand == "test":
+            action, matches = self.filter.scan(argument)
+            if not action:
+                await ctx.send(f"✅ No match. Normalized: `{normalize(argument)[:200]}`")
+            else:
+                await ctx.send(f"🚫 Would **{action}**: {', '.join(sorted({m.term.text for m in matches}))}")
+        elif subcommand in ("on", "off"):
+            enabled = subcommand == "on"
+            await self.document.update(lambda data: data.__setitem__("enabled", enabled))
+            await ctx.send(f"✔ Chat filter {'enabled' if enabled else 'disabled'}.")
+        else:
+            chat_filter = self.filter
+            counts = {action: 0 for action in ACTIONS}
+            for term in chat_filter.terms:
+                counts[term.action] += 1
+            embed = discord.Embed(
+                title="Chat Filter",
+                description="✅ Enabled" if self.document.data.get("enabled", True) else "⏸️ Disabled",
+                color=discord.Color.blue()
+            )
+            embed.add_field(name="Terms", value="\n".join(f"**{action}:** {count}" for action, count in counts.items()), inline=True)
+            embed.add_field(name="Automaton", value=f"{len(chat_filter.automaton)} states", inline=True)
+            embed.add_field(name="Scanned", value=str(self.scanned), inline=True)
+            await ctx.send(embed=embed)
+
+async def setup(bot):
+    """Setup function for the cog"""
+    await bot.add_cog(ChatFilterCog(bot))
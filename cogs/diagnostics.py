@@ -0,0 +1,303 @@
+import discord
+from discord.ext import commands
+import asyncio
+import io
+import os
+import sys
+import threading
+from datetime import datetime
+import bot as bot_module
+from bot import bot_log
+from loop_watchdog import LoopWatchdog
+from perf import TRACKER
+from supervisor import SUPERVISOR
+from sampling_profiler import StackSampler
+from memory_stats import (GrowthTracker, TracemallocSession, deep_sizeof_sliced, format_bytes,
+                          object_state_sizes_sliced, process_rss)
+
+class Diagnostics(commands.Cog):
+    """Owner-only runtime diagnostics"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.watchdog = LoopWatchdog(
+            threshold=0.25,
+            on_stall=self.report_stall,
+            resolve_owner=self.resolve_cog,
+        )
+        self.profiler = None
+        self.tracemalloc = TracemallocSession()
+        self.memory_growth = GrowthTracker(history=12)
+        self.memory_interval = 900
+        self.memory_task = None
+
+    async def cog_load(self):
+        self.watchdog.start()
+        self.memory_task = SUPERVISOR.supervise("memory-growth", self.track_memory_growth, owner="Diagnostics", base_delay=60).task
+
+    async def cog_unload(self):
+        self.watchdog.stop()
+        SUPERVISOR.cancel_owner("Diagnostics")
+        self.tracemalloc.stop()
+        if self.profiler and self.profiler.running:
+            self.profiler.stop()
+
+    def resolve_cog(self, module_name):
+        """Map a source file name to the cog defined in it"""
+        for cog_name, cog in self.bot.cogs.items():
+            module = sys.modules.get(type(cog).__module__)
+            path = getattr(module, '__file__', None)
+            if path and os.path.splitext(os.path.basename(path))[0] == module_name:
+                return cog_name
+        return module_name
+
+    async def report_stall(self, stall, duration):
+        """Log a captured loop stall with its owning cog"""
+        print(f"🐢 Event loop blocked for {duration * 1000:.0f}ms by {stall.owner} ({stall.location})")
+        await bot_log(
+            f"[Watchdog] Event loop blocked for {duration * 1000:.0f}ms by {stall.owner} at {stall.location}\n```{stall.stack[-1500:]}```",
+            error=True
+        )
+
+    async def memory_report(self):
+        """Approximate deep size of each cog's state plus the shared caches
+
+        Walks are capped at 50k objects per attribute and yield to the loop every
+        few milliseconds, so a big cache only makes the report slower, never the bot.
+        """
+        sizes = {}
+        details = {}
+        for cog_name, cog in list(self.bot.cogs.items()):
+            attrs = await object_state_sizes_sliced(cog, exclude=(commands.Bot,))
+            sizes[f"cog:{cog_name}"] = sum(attrs.values())
+            details[cog_name] = sorted(attrs.items(), key=lambda item: item[1], reverse=True)[:3]
+        sizes["bot:_log_throttle"] = (await deep_sizeof_sliced(getattr(bot_module, '_log_throttle', {})))[0]
+        sizes["discord:members"] = sum(len(guild.members) for guild in self.bot.guilds)
+        sizes["discord:users"] = len(self.bot.users)
+        sizes["discord:messages"] = len(self.bot.cached_messages)
+        rss = process_rss()
+        if rss is not None:
+            sizes["process:rss"] = rss
+        return sizes, details
+
+    async def track_memory_growth(self):
+        """Sample state sizes periodically and log anything that keeps growing"""
+        await self.bot.wait_until_ready()
+        while True:
+            SUPERVISOR.heartbeat()
+            try:
+                sizes, _ = await self.memory_report()
+                self.memory_growth.add({k: v for k, v in sizes.items() if not k.startswith("discord:")})
+                trends = self.memory_growth.trends()
+                if trends:
+                    summary = ", ".join(f"{name} {format_bytes(first)} → {format_bytes(latest)}" for name, first, latest in trends[:5])
+                    print(f"📈 Memory growth: {summary}")
+                    await bot_log(f"[Diagnostics] Memory keeps growing: {summary}")
+            except Exception as e:
+                print(f"⚠️ Memory tracking failed: {e}")
+            await asyncio.sleep(self.memory_interval)
+
+    @commands.command(name='mem')
+    @commands.is_owner()
+    async def memory(self, ctx, action: str = None, limit: int = 10):
+        """Show memory usage by cog, or start/stop/diff tracemalloc"""
+        action = (action or "").lower()
+        if action == "start":
+            await asyncio.to_thread(self.tracemalloc.start)
+            await ctx.send("✅ tracemalloc started; baseline snapshot taken. Use `!mem diff` to see growth.")
+            return
+        if action == "stop":
+            self.tracemalloc.stop()
+            await ctx.send("✅ tracemalloc stopped.")
+            return
+        if action == "diff":
+            try:
+                stats = await asyncio.to_thread(self.tracemalloc.diff, max(1, min(limit, 25)))
+            except RuntimeError as e:
+                await ctx.send(f"❌ {e}")
+                return
+            if not stats:
+                await ctx.send("✅ No allocation sites grew since the last snapshot.")
+                return
+            lines = []
+            for stat in stats:
+                frame = stat.traceback[0]
+                lines.append(f"+{format_bytes(stat.size_diff)} ({stat.count_diff:+d} blocks) "
+                             f"{os.path.basename(frame.filename)}:{frame.lineno}")
+            await ctx.send(f"**Top growing allocation sites since last snapshot**\n```{chr(10).join(lines)[:1900]}```")
+            return
+
+        sizes, details = await self.memory_report()
+        embed = discord.Embed(
+            title="🧠 Memory Usage",
+            description=(f"**Process RSS:** {format_bytes(sizes.get('process:rss'))}\n"
+                         f"**Cached members:** {sizes['discord:members']} · **users:** {sizes['discord:users']} · "
+                         f"**messages:** {sizes['discord:messages']}\n"
+                         f"**bot_log throttle:** {format_bytes(sizes['bot:_log_throttle'])}\n"
+                         f"**tracemalloc:** {'on' if self.tracemalloc.active else 'off'}"),
+            color=discord.Color.blue(),
+            timestamp=discord.utils.utcnow()
+        )
+        cogs = sorted(((name[4:], size) for name, size in sizes.items() if name.startswith("cog:")),
+                      key=lambda item: item[1], reverse=True)
+        for cog_name, size in cogs[:15]:
+            biggest = ", ".join(f"{attr} {format_bytes(attr_size)}" for attr, attr_size in details[cog_name]) or "—"
+            embed.add_field(name=f"{cog_name}: {format_bytes(size)}", value=biggest[:1024], inline=False)
+        await ctx.send(embed=embed)
+
+    @commands.command(name='tasks')
+    @commands.is_owner()
+    async def tasks(self, ctx, owner: str = None):
+        """List live asyncio tasks with age, owner cog and current await point"""
+        rows = SUPERVISOR.inventory(resolve_owner=self.resolve_cog)
+        if owner:
+            rows = [row for row in rows if row["owner"].lower() == owner.lower()]
+
+        def age(seconds):
+            if seconds is None:
+                return "?"
+            if seconds < 120:
+                return f"{seconds:.0f}s"
+            if seconds < 7200:
+                return f"{seconds / 60:.0f}m"
+            return f"{seconds / 3600:.1f}h"
+
+        lines = []
+        for row in rows:
+            line = f"{'★' if row['supervised'] else '·'} {row['name']} [{row['owner']}] age {age(row['age'])}"
+            if row["supervised"]:
+                line += f", {row['state']}, restarts {row['restarts']}, heartbeat {age(row['last_heartbeat'])} ago"
+                if row["last_error"]:
+                    line += f", last error: {row['last_error'][:80]}"
+            line += f"\n    at {row['await']}"
+            lines.append(line)
+
+        for job in SUPERVISOR.jobs.values():
+            if job.done and (not owner or (job.owner or "").lower() == owner.lower()):
+                lines.append(f"✖ {job.name} [{job.owner}] {job.state}, restarts {job.restarts}"
+                             + (f", last error: {job.last_error[:80]}" if job.last_error else ""))
+
+        header = f"**{len(rows)} live task(s)** (★ supervised)"
+        body = "\n".join(lines) or "No tasks."
+        if len(body) > 1800:
+            file = discord.File(io.BytesIO(body.encode('utf-8')), filename="tasks.txt")
+            await ctx.send(header, file=file)
+        else:
+            await ctx.send(f"{header}\n```{body}```")
+
+    @commands.command(name='looplag')
+    @commands.is_owner()
+    async def loop_lag(self, ctx, action: str = None):
+        """Show the worst event loop stalls (use 'reset' to clear)"""
+        if action and action.lower() == "reset":
+            self.watchdog.reset()
+            await ctx.send("✅ Loop stall summary cleared.")
+            return
+
+        embed = discord.Embed(
+            title="🐢 Event Loop Stalls",
+            description=(f"**Current lag:** {self.watchdog.last_lag * 1000:.1f}ms\n"
+                         f"**Worst lag:** {self.watchdog.max_lag * 1000:.1f}ms\n"
+                         f"**Threshold:** {self.watchdog.threshold * 1000:.0f}ms"),
+            color=discord.Color.orange(),
+            timestamp=discord.utils.utcnow()
+        )
+        stalls = self.watchdog.top()
+        if not stalls:
+            embed.add_field(name="No stalls recorded", value="The loop has stayed under the threshold.", inline=False)
+        for stall in stalls:
+            last_seen = datetime.fromtimestamp(stall.last_seen).strftime('%H:%M:%S')
+            embed.add_field(
+                name=f"{stall.owner} — {stall.location}"[:256],
+                value=(f"{stall.count}x, total {stall.total:.2f}s, worst {stall.worst * 1000:.0f}ms, "
+                       f"last at {last_seen}"),
+                inline=False
+            )
+        await ctx.send(embed=embed)
+
+    @commands.command(name='loopstack')
+    @commands.is_owner()
+    async def loop_stack(self, ctx, rank: int = 1):
+        """Show the captured stack for one of the top stalls"""
+        stalls = self.watchdog.top()
+        if rank < 1 or rank > len(stalls):
+            await ctx.send("❌ No stall recorded at that rank.")
+            return
+        stall = stalls[rank - 1]
+        await ctx.send(f"**{stall.owner} — {stall.location}**\n```{stall.stack[-1800:]}```")
+
+    @commands.command(name='perf')
+    @commands.is_owner()
+    async def perf_report(self, ctx, sort_by: str = "p95"):
+        """Show the slowest commands and callbacks over the last hour"""
+        if sort_by not in ("p50", "p95", "p99", "avg", "count"):
+            await ctx.send("❌ Sort by one of: p50, p95, p99, avg, count")
+            return
+
+        rows = TRACKER.report(limit=10, sort_by=sort_by)
+        embed = discord.Embed(
+            title="⏱️ Slowest Commands (last hour)",
+            description=f"Sorted by **{sort_by}**. Time split shows average REST / RCON / disk per call.",
+            color=discord.Color.blue(),
+            timestamp=discord.utils.utcnow()
+        )
+        if not rows:
+            embed.add_field(name="No data", value="Nothing has been timed in the last hour.", inline=False)
+        for row in rows:
+            spent = row["spent"]
+            embed.add_field(
+                name=f"{row['name']} ({row['count']} calls)"[:256],
+                value=(f"p50 **{row['p50'] * 1000:.0f}ms** · p95 **{row['p95'] * 1000:.0f}ms** · "
+                       f"p99 **{row['p99'] * 1000:.0f}ms**\n"
+                       f"REST {spent['rest'] * 1000:.0f}ms · RCON {spent['rcon'] * 1000:.0f}ms · "
+                       f"disk {spent['disk'] * 1000:.0f}ms"),
+                inline=False
+            )
+        await ctx.send(embed=embed)
+
+    @commands.command(name='profile')
+    @commands.is_owner()
+    async def profile(self, ctx, seconds: int = 10, scope: str = "loop"):
+        """Sample the running bot's stacks and upload a flamegraph-ready profile"""
+        if self.profiler and self.profiler.running:
+            await ctx.send("❌ A profile is already running.")
+            return
+        if scope not in ("loop", "all"):
+            await ctx.send("❌ Scope must be 'loop' or 'all'")
+            return
+        seconds = max(1, min(seconds, 120))
+
+        thread_ids = None if scope == "all" else {threading.get_ident()}
+        self.profiler = StackSampler(interval=0.01, thread_ids=thread_ids)
+        await ctx.send(f"🔬 Profiling {'all threads' if scope == 'all' else 'the event loop'} for {seconds}s...")
+        self.profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            await asyncio.to_thread(self.profiler.stop)
+
+        profiler = self.profiler
+        collapsed = await asyncio.to_thread(profiler.collapsed)
+        hot = profiler.hot_frames(15)
+        total = sum(profiler.stacks.values()) or 1
+        lines = [f"{own / total * 100:5.1f}% self {incl / total * 100:5.1f}% incl  {name}" for name, own, incl in hot]
+
+        embed = discord.Embed(
+            title="🔬 Profile Complete",
+            description=(f"**Duration:** {profiler.elapsed:.1f}s\n"
+                         f"**Samples:** {profiler.samples}\n"
+                         f"**Sampler overhead:** {profiler.overhead * 100:.2f}%"),
+            color=discord.Color.blue(),
+            timestamp=discord.utils.utcnow()
+        )
+        if lines:
+            embed.add_field(name="Hot frames", value=f"```{chr(10).join(lines)[:1000]}```", inline=False)
+
+        filename = f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.folded"
+        file = discord.File(io.BytesIO(collapsed.encode('utf-8')), filename=filename)
+        await ctx.send(embed=embed, file=file)
+        await bot_log(f"[Diagnostics] {ctx.author} ran a {seconds}s profile ({profiler.samples} samples)")
+
+async def setup(bot):
+    """Setup function for the cog"""
+    await bot.add_cog(Diagnostics(bot))
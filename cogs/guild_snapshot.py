@@ -0,0 +1,274 @@
+import discord
+from discord.ext import commands
+import asyncio
+import json
+import os
+from datetime import datetime
+from config import GUILD_ID
+from bot import bot_log
+from supervisor import SUPERVISOR
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+SNAPSHOT_PATH = os.path.join(DATA_DIR, "server_data.json")
+JOURNAL_PATH = os.path.join(DATA_DIR, "server_data.journal")
+FLUSH_DELAY = 2.0
+COMPACT_AFTER = 500
+
+def channel_record(channel):
+    return {
+        "name": channel.name,
+        "id": channel.id,
+        "type": str(channel.type),
+        "category_id": channel.category_id if not isinstance(channel, discord.CategoryChannel) else None,
+        "position": channel.position,
+    }
+
+def role_record(role):
+    return {
+        "name": role.name,
+        "id": role.id,
+        "position": role.position,
+        "permissions": role.permissions.value,
+        "color": str(role.color),
+        "mentionable": role.mentionable,
+        "hoisted": role.hoist,
+    }
+
+class GuildSnapshot(commands.Cog):
+    """Keeps data/server_data.json current from gateway events with journaled diffs"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.guild_meta = {}
+        self.channels = {}
+        self.roles = {}
+        self.pending = {}
+        self.journal_entries = 0
+        self._flush_handle = None
+        self._write_lock = asyncio.Lock()
+        self.ready = False
+
+    async def cog_load(self):
+        SUPERVISOR.spawn(self.initialize_when_ready(), name="guild-snapshot-init", owner="GuildSnapshot")
+
+    async def cog_unload(self):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+        if self.ready:
+            await self.flush()
+
+    def load_persisted(self):
+        """Rebuild the last persisted model from the snapshot plus its journal"""
+        channels, roles, meta = {}, {}, {}
+        try:
+            with open(SNAPSHOT_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            meta = {k: data.get(k) for k in ("guild_name", "guild_id", "member_count")}
+            for category_name, group in data.get("channels", {}).items():
+                category_id = group.get("category_id")
+                if category_id is not None and category_id not in channels:
+                    channels[category_id] = {"name": category_name, "id": category_id, "type": "category",
+                                             "category_id": None, "position": group.get("position", 0)}
+                for index, channel in enumerate(group.get("channels", [])):
+                    channels[channel["id"]] = {"name": channel["name"], "id": channel["id"], "type": channel["type"],
+                                               "category_id": category_id, "position": channel.get("position", index)}
+            for role_name, role in data.get("roles", {}).items():
+                roles[role["id"]] = dict(role, name=role_name)
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            pass
+
+        entries = 0
+        try:
+            with open(JOURNAL_PATH, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    entries += 1
+                    target = {"channel": channels, "role": roles}.get(entry.get("kind"))
+                    if entry.get("kind") == "guild":
+                        meta.update(entry.get("data") or {})
+                    elif target is not None:
+                        if entry.get("op") == "delete":
+                            target.pop(entry["id"], None)
+                        else:
+                            target[entry["id"]] = entry["data"]
+        except FileNotFoundError:
+            pass
+        return meta, channels, roles, entries
+
+    async def initialize_when_ready(self):
+        """Reconcile the persisted snapshot with the live guild once, writing only the differences"""
+        await self.bot.wait_until_ready()
+        guild = self.bot.get_guild(GUILD_ID)
+        if not guild:
+            print(f"Error: Could not find guild with ID {GUILD_ID}")
+            return
+
+        meta, channels, roles, entries = await asyncio.to_thread(self.load_persisted)
+        self.guild_meta, self.channels, self.roles = meta, channels, roles
+        self.journal_entries = entries
+
+        live_meta = {"guild_name": guild.name, "guild_id": guild.id, "member_count": guild.member_count}
+        if live_meta != {k: meta.get(k) for k in live_meta}:
+            self.stage("guild", "upsert", guild.id, live_meta)
+        live_channels = {channel.id: channel_record(channel) for channel in guild.channels}
+        live_roles = {role.id: role_record(role) for role in guild.roles}
+        for kind, persisted, live in (("channel", channels, live_channels), ("role", roles, live_roles)):
+            for item_id in persisted.keys() - live.keys():
+                self.stage(kind, "delete", item_id)
+            for item_id, record in live.items():
+                if persisted.get(item_id) != record:
+                    self.stage(kind, "upsert", item_id, record)
+
+        self.ready = True
+        changes = len(self.pending)
+        await self.flush(compact=not os.path.exists(SNAPSHOT_PATH))
+        print(f"Server snapshot reconciled for {guild.name}: {changes} change(s)")
+
+    def stage(self, kind, op, item_id, data=None):
+        """Apply a change to the in-memory model and coalesce it with any unflushed change to the same item"""
+        if kind == "channel":
+            target = self.channels
+        elif kind == "role":
+            target = self.roles
+        else:
+            target = None
+        if target is not None:
+            if op == "delete":
+                target.pop(item_id, None)
+            else:
+                target[item_id] = data
+        else:
+            self.guild_meta.update(data or {})
+        self.pending[(kind, item_id)] = {"op": op, "kind": kind, "id": item_id, "data": data}
+        if self.ready and self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(FLUSH_DELAY, self._schedule_flush)
+
+    def _schedule_flush(self):
+        self._flush_handle = None
+        SUPERVISOR.spawn(self.flush(), name="guild-snapshot-flush", owner="GuildSnapshot")
+
+    async def flush(self, compact=False):
+        """Append pending changes to the journal, compacting into a full snapshot when it grows large"""
+        async with self._write_lock:
+            if not self.pending and not compact:
+                return
+            batch = list(self.pending.values())
+            self.pending.clear()
+            stamp = datetime.now().isoformat()
+            for entry in batch:
+                entry["at"] = stamp
+            if compact or self.journal_entries + len(batch) > COMPACT_AFTER:
+                snapshot = self.render()
+                await asyncio.to_thread(self._write_snapshot, snapshot)
+                self.journal_entries = 0
+            elif batch:
+                await asyncio.to_thread(self._append_journal, batch)
+                self.journal_entries += len(batch)
+
+    def render(self):
+        """Render the model in the server_data.json layout"""
+        categories = {cid: c for cid, c in self.channels.items() if c["type"] == "category"}
+        groups = {}
+        for category_id, category in sorted(categories.items(), key=lambda item: item[1]["position"]):
+            groups[category["name"]] = {"category_id": category_id, "position": category["position"], "channels": []}
+        uncategorized = []
+        for channel in sorted(self.channels.values(), key=lambda c: c["position"]):
+            if channel["type"] == "category":
+                continue
+            info = {"name": channel["name"], "id": channel["id"], "type": channel["type"], "position": channel["position"]}
+            category = categories.get(channel["category_id"])
+            if category:
+                groups[category["name"]]["channels"].append(info)
+            else:
+                uncategorized.append(info)
+        if uncategorized:
+            groups["Uncategorized"] = {"category_id": None, "channels": uncategorized}
+        return {
+            "guild_name": self.guild_meta.get("guild_name"),
+            "guild_id": self.guild_meta.get("guild_id"),
+            "last_updated": datetime.now().isoformat(),
+            "channels": groups,
+            "roles": {role["name"]: {k: v for k, v in role.items() if k != "name"} for role in self.roles.values()},
+            "member_count": self.guild_meta.get("member_count"),
+        }
+
+    def _append_journal(self, batch):
+        os.makedirs(os.path.dirname(JOURNAL_PATH), exist_ok=True)
+        with open(JOURNAL_PATH, "a", encoding="utf-8") as f:
+            for entry in batch:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_snapshot(self, snapshot):
+        os.makedirs(os.path.dirname(SNAPSHOT_PATH), exist_ok=True)
+        tmp_path = f"{SNAPSHOT_PATH}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, SNAPSHOT_PATH)
+        with open(JOURNAL_PATH, "w", encoding="utf-8"):
+            pass
+
+    def _is_ours(self, guild):
+        return guild is not None and guild.id == GUILD_ID
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        if self._is_ours(channel.guild):
+            self.stage("channel", "upsert", channel.id, channel_record(channel))
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        if self._is_ours(after.guild):
+            record = channel_record(after)
+            if self.channels.get(after.id) != record:
+                self.stage("channel", "upsert", after.id, record)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        if self._is_ours(channel.guild):
+            self.stage("channel", "delete", channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        if self._is_ours(role.guild):
+            self.stage("role", "upsert", role.id, role_record(role))
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        if self._is_ours(after.guild):
+            record = role_record(after)
+            if self.roles.get(after.id) != record:
+                self.stage("role", "upsert", after.id, record)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        if self._is_ours(role.guild):
+            self.stage("role", "delete", role.id)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before, after):
+        if self._is_ours(after):
+            meta = {"guild_name": after.name, "guild_id": after.id, "member_count": after.member_count}
+            if {k: self.guild_meta.get(k) for k in meta} != meta:
+                self.stage("guild", "upsert", after.id, meta)
+
+    @commands.command(name='snapshot')
+    @commands.is_owner()
+    async def snapshot(self, ctx):
+        """Flush pending changes and compact server_data.json"""
+        if not self.ready:
+            await ctx.send("⏳ The server snapshot is still loading; try again once the bot has finished starting up.")
+            return
+        await self.flush(compact=True)
+        await ctx.send(f"✅ Server snapshot written: {len(self.channels)} channels, {len(self.roles)} roles.")
+        await bot_log(f"[Snapshot] Server snapshot compacted by {ctx.author}")
+
+async def setup(bot):
+    """Setup function for the cog"""
+    await bot.add_cog(GuildSnapshot(bot))
@@ -1,10 +1,13 @@
 import discord
 from discord.ext import commands
 from discord import ui
-import json
-import os
 from datetime import datetime
 from bot import bot_log
+from case_repository import CASES
+from appeals_store import APPEALS, STATUS_APPROVED, STATUS_DENIED
+from docstore import DOCUMENTS
+
+NOTIFY_USERS = DOCUMENTS.open("data/notify_users.json", default=lambda: {"notify_users": []})
 
 class ServerInfoView(ui.View):
     def __init__(self):
@@ -83,13 +86,7 @@ class ServerInfoView(ui.View):
 
     @ui.button(label='My Moderations', style=discord.ButtonStyle.secondary, custom_id='my_moderations_button')
     async def my_moderations(self, interaction: discord.Interaction, button: ui.Button):
-        try:
-            with open("data/moderation_cases.json", "r") as f:
-                data = json.load(f)
-            cases = data.get("cases", [])
-        except (FileNotFoundError, json.JSONDecodeError):
-            cases = []
-        user_cases = [case for case in cases if case.get("target_id") == interaction.user.id]
+        user_cases = CASES.cases_for(interaction.user.id)
         if not user_cases:
             embed = discord.Embed(
                 title="My Moderations",
@@ -97,7 +94,6 @@ class ServerInfoView(ui.View):
                 color=discord.Color.green(),
             )
         else:
-            user_cases.sort(key=lambda x: x.get("case_number", 0), reverse=True)
             embed = discord.Embed(
                 title="My Moderations",
                 description=f"You have {len(user_cases)} moderation record(s)",
@@ -121,13 +117,7 @@ class ServerInfoView(ui.View):
 
     @ui.button(label='Infraction Appeal', style=discord.ButtonStyle.secondary, custom_id='infraction_appeal_button')
     async def infraction_appeal(self, interaction: discord.Interaction, button: ui.Button):
-        try:
-            with open("data/moderation_cases.json", "r") as f:
-                data = json.load(f)
-            cases = data.get("cases", [])
-        except (FileNotFoundError, json.JSONDecodeError):
-            cases = []
-        user_cases = [case for case in cases if case.get("target_id") == interaction.user.id]
+        user_cases = CASES.cases_for(interaction.user.id)
         if not user_cases:
             embed = discord.Embed(
                 title="No Infractions Found",
@@ -136,7 +126,6 @@ class ServerInfoView(ui.View):
             )
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
-        user_cases.sort(key=lambda x: x.get("case_number", 0), reverse=True)
         view = AppealSelectionView(user_cases, interaction.user)
         embed = discord.Embed(
             title="Select Infraction to Appeal",
@@ -162,20 +151,18 @@ class AppealDecisionView(ui.View):
 
     @ui.button(label='Approve', style=discord.ButtonStyle.success, custom_id='approve_appeal')
     async def approve_appeal(self, interaction: discord.Interaction, button: ui.Button):
-        try:
-            with open("data/appeals.json", "r") as f:
-                appeals_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+        appeal, changed = await APPEALS.transition(
+            self.appeal_data.get("appeal_number"), STATUS_APPROVED,
+            reviewed_by=str(interaction.user), reviewed_at=datetime.now().isoformat(),
+        )
+        if appeal is None:
             await interaction.response.send_message("Appeal data not found.", ephemeral=True)
             return
-        for appeal in appeals_data.get("appeals", []):
-            if appeal.get("appeal_number") == self.appeal_data.get("appeal_number"):
-                appeal["status"] = "approved"
-                appeal["reviewed_by"] = str(interaction.user)
-                appeal["reviewed_at"] = datetime.now().isoformat()
-                break
-        with open("data/appeals.json", "w") as f:
-            json.dump(appeals_data, f, indent=2)
+        if not changed:
+            await interaction.response.send_message(
+                f"This appeal was already {appeal.get('status')} by {appeal.get('reviewed_by', 'another staff member')}.", ephemeral=True)
+            return
+        await interaction.response.send_message("Appeal approved and user notified.", ephemeral=True)
         try:
             user = interaction.client.get_user(self.appeal_data.get("user_id"))
             if user:
@@ -206,7 +193,6 @@ class AppealDecisionView(ui.View):
                 await interaction.message.delete()
         except (discord.NotFound, AttributeError):
             pass
-        await interaction.response.send_message("Appeal approved and user notified.", ephemeral=True)
 
     @ui.button(label='Deny', style=discord.ButtonStyle.danger, custom_id='deny_appeal')
     async def deny_appeal(self, interaction: discord.Interaction, button: ui.Button):
@@ -215,23 +201,17 @@ class AppealDecisionView(ui.View):
 
     @ui.button(label='Notify Me', style=discord.ButtonStyle.secondary, custom_id='notify_toggle')
     async def toggle_notify(self, interaction: discord.Interaction, button: ui.Button):
-        try:
-            with open("data/notify_users.json", "r") as f:
-                notify_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            notify_data = {"notify_users": []}
         user_id = interaction.user.id
-        notify_users = notify_data.get("notify_users", [])
-        if user_id in notify_users:
-            notify_users.remove(user_id)
-            message = "You will no longer be notified of new appeals."
-        else:
+
+        def toggle(notify_data):
+            notify_users = notify_data.setdefault("notify_users", [])
+            if user_id in notify_users:
+                notify_users.remove(user_id)
+                return "You will no longer be notified of new appeals."
             notify_users.append(user_id)
-            message = "You will now be notified of new appeals."
-        notify_data["notify_users"] = notify_users
-        os.makedirs("data", exist_ok=True)
-        with open("data/notify_users.json", "w") as f:
-            json.dump(notify_data, f, indent=2)
+            return "You will now be notified of new appeals."
+
+        message = await NOTIFY_USERS.update(toggle)
         await interaction.response.send_message(message, ephemeral=True)
 
 class DenyReasonModal(ui.Modal):
@@ -249,21 +229,18 @@ class DenyReasonModal(ui.Modal):
 
     async def on_submit(self, interaction: discord.Interaction):
         denial_reason = self.reason_input.value
-        try:
-            with open("data/appeals.json", "r") as f:
-                appeals_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+        appeal, changed = await APPEALS.transition(
+            self.appeal_data.get("appeal_number"), STATUS_DENIED, denial_reason=denial_reason,
+            reviewed_by=str(interaction.user), reviewed_at=datetime.now().isoformat(),
+        )
+        if appeal is None:
             await interaction.response.send_message("Appeal data not found.", ephemeral=True)
             return
-        for appeal in appeals_data.get("appeals", []):
-            if appeal.get("appeal_number") == self.appeal_data.get("appeal_number"):
-                appeal["status"] = "denied"
-                appeal["denial_reason"] = denial_reason
-                appeal["reviewed_by"] = str(interaction.user)
-                appeal["reviewed_at"] = datetime.now().isoformat()
-                break
-        with open("data/appeals.json", "w") as f:
-            json.dump(appeals_data, f, indent=2)
+        if not changed:
+            await interaction.response.send_message(
+                f"This appeal was already {appeal.get('status')} by {appeal.get('reviewed_by', 'another staff member')}.", ephemeral=True)
+            return
+        await interaction.response.send_message("Appeal denied and user notified.", ephemeral=True)
         try:
             user = interaction.client.get_user(self.appeal_data.get("user_id"))
             if user:
@@ -296,7 +273,6 @@ class DenyReasonModal(ui.Modal):
                 await interaction.message.delete()
         except (discord.NotFound, AttributeError):
             pass
-        await interaction.response.send_message("Appeal denied and user notified.", ephemeral=True)
 
 class AppealSelectionView(ui.View):
     def __init__(self, user_cases, user):
@@ -347,29 +323,20 @@ class AppealReasonModal(ui.Modal):
 
     async def on_submit(self, interaction: discord.Interaction):
         appeal_reason = self.reason_input.value
-        try:
-            with open("data/appeals.json", "r") as f:
-                appeals_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            appeals_data = {"appeals": [], "next_appeal_number": 1}
-        appeal_number = appeals_data.get("next_appeal_number", 1)
-        appeals_data["next_appeal_number"] = appeal_number + 1
-        appeal_data = {
-            "appeal_number": appeal_number,
-            "case_number": self.case.get("case_number"),
-            "user_id": self.user.id,
-            "user_name": str(self.user),
-            "appeal_reason": appeal_reason,
-            "original_infraction": self.case,
-            "status": "pending",
-            "timestamp": datetime.now().isoformat(),
-            "date": datetime.now().strftime("%m/%d/%Y"),
-            "time": datetime.now().strftime("%I:%M %p"),
-        }
-        appeals_data.setdefault("appeals", []).append(appeal_data)
-        os.makedirs("data", exist_ok=True)
-        with open("data/appeals.json", "w") as f:
-            json.dump(appeals_data, f, indent=2)
+        appeal_data, created = await APPEALS.create(
+            case_number=self.case.get("case_number"),
+            user_id=self.user.id,
+            user_name=str(self.user),
+            appeal_reason=appeal_reason,
+            original_infraction=self.case,
+            timestamp=datetime.now().isoformat(),
+            date=datetime.now().strftime("%m/%d/%Y"),
+            time=datetime.now().strftime("%I:%M %p"),
+        )
+        if not created:
+            await interaction.response.send_message(
+                f"You already have a pending appeal (#{appeal_data.get('appeal_number')}) for this case.", ephemeral=True)
+            return
         bot = interaction.client
         appeals_channel = bot.get_channel(1419528947561005138)
         if appeals_channel and isinstance(appeals_channel, discord.TextChannel):
@@ -384,18 +351,11 @@ class AppealReasonModal(ui.Modal):
             embed.add_field(name="Original Reason", value=self.case.get("reason",""), inline=False)
             embed.add_field(name="Appeal Reason", value=appeal_reason, inline=False)
             embed.add_field(name="Date", value=f"{self.case.get('date','N/A')} at {self.case.get('time','N/A')}", inline=True)
-            try:
-                with open("data/notify_users.json", "r") as f:
-                    notify_data = json.load(f)
-                notify_users = notify_data.get("notify_users", [])
-            except (FileNotFoundError, json.JSONDecodeError):
-                notify_users = []
+            notify_users = (await NOTIFY_USERS.read()).get("notify_users", [])
             mentions = " ".join([f"<@{user_id}>" for user_id in notify_users]) if notify_users else ""
             view = AppealDecisionView(appeal_data)
             message = await appeals_channel.send(content=mentions, embed=embed, view=view)
-            appeal_data["message_id"] = message.id
-            with open("data/appeals.json", "w") as f:
-                json.dump(appeals_data, f, indent=2)
+            await APPEALS.update(appeal_data["appeal_number"], message_id=message.id)
         embed = discord.Embed(
             title="✔ Appeal Submitted",
             description=f"Your appeal for Case #{self.case.get('case_number','?')} has been submitted.",
@@ -411,6 +371,13 @@ class InfoCommands(commands.Cog):
         self.persistent_view = ServerInfoView()
         self.bot.add_view(self.persistent_view)
 
+    async def cog_load(self):
+        await CASES.preload()
+        await APPEALS.ready()
+
+    async def cog_unload(self):
+        await APPEALS.flush()
+
     @commands.command(name='setup_info')
     async def setup_info(self, ctx):
         authorized_users = [1237471534541439068]
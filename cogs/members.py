@@ -0,0 +1,153 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+from config import GUILD_ID, MEMBER_CACHE_MODE, STAFF_ROLE_IDS, TICKET_CHANNEL_PREFIXES
+from bot import bot_log
+from member_cache import MemberCachePolicy
+from member_index import MemberNameIndex
+from supervisor import SUPERVISOR
+
+class Members(commands.Cog):
+    """Member lookups that respect the configured member cache mode"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.policy = MemberCachePolicy(MEMBER_CACHE_MODE, STAFF_ROLE_IDS)
+        self.index = MemberNameIndex()
+
+    async def cog_load(self):
+        SUPERVISOR.spawn(self.pin_ticket_owners(), name="pin-ticket-owners", owner="Members")
+        SUPERVISOR.spawn(self.build_index(), name="member-index-build", owner="Members")
+
+    @property
+    def mode(self):
+        return self.policy.mode
+
+    async def get_member(self, guild, user_id):
+        member = await self.policy.get_member(guild, int(user_id))
+        if member is not None:
+            self.index.add(member)
+        return member
+
+    async def search(self, guild, query, limit=25):
+        """Ranked members whose name, global name or nickname starts with the query"""
+        member_ids = self.index.search(query, limit)
+        members = [member for member in map(guild.get_member, member_ids) if member is not None]
+        if len(members) < limit and (self.policy.mode != "full" or not guild.chunked):
+            found = {member.id: member for member in members}
+            for member in await self.policy.search(guild, query, limit):
+                self.index.add(member)
+                found[member.id] = member
+            member_ids = self.index.search(query, limit)
+            members = [member for member in (found.get(member_id) or guild.get_member(member_id) for member_id in member_ids)
+                       if member is not None]
+        return members
+
+    async def resolve(self, guild, term):
+        """Resolve a mention, ID or name to the best matching member"""
+        term = term.strip()
+        user_id = term[2:-1].lstrip('!') if term.startswith('<@') and term.endswith('>') else term
+        if user_id.isdigit():
+            return await self.get_member(guild, int(user_id))
+        matches = await self.search(guild, term, limit=1)
+        return matches[0] if matches else None
+
+    async def member_autocomplete(self, interaction: discord.Interaction, current: str):
+        """Autocomplete callback for slash command member name options"""
+        if not interaction.guild or not current:
+            return []
+        members = await self.search(interaction.guild, current, limit=25)
+        return [app_commands.Choice(name=f"{member.display_name} ({member.name})"[:100], value=str(member.id))
+                for member in members]
+
+    async def all_members(self, guild):
+        return await self.policy.all_members(guild)
+
+    async def build_index(self):
+        """Index every cached member once the guild is available"""
+        await self.bot.wait_until_ready()
+        guild = self.bot.get_guild(GUILD_ID)
+        if guild:
+            self.index.build(guild.members)
+            print(f"Indexed {len(self.index)} member name(s)")
+
+    def _open_ticket_owner_ids(self):
+        owner_ids = set()
+        for cog_name, attr in (("SupportCog", "active_tickets"), ("WhitelistCog", "active_whitelist_tickets")):
+            cog = self.bot.get_cog(cog_name)
+            for user_id, ticket_data in getattr(cog, attr, {}).items():
+                owner_id = ticket_data.get("owner_id", user_id) if isinstance(ticket_data, dict) else user_id
+                if str(owner_id).isdigit():
+                    owner_ids.add(int(owner_id))
+        return owner_ids
+
+    async def pin_ticket_owners(self):
+        """Make sure open ticket owners resolve from cache when members are not chunked"""
+        await self.bot.wait_until_ready()
+        if self.policy.mode == "full":
+            return
+        guild = self.bot.get_guild(GUILD_ID)
+        if not guild:
+            return
+        owner_ids = self._open_ticket_owner_ids()
+        if owner_ids:
+            members = await self.policy.get_members(guild, owner_ids, permanent=True)
+            print(f"Pinned {len(members)} open ticket owner(s) in {self.policy.mode} member cache mode")
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        self.index.add(member)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        if before.nick != after.nick:
+            self.index.add(after)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before, after):
+        if after.id in self.index and (before.name != after.name or before.global_name != after.global_name):
+            for guild in self.bot.guilds:
+                member = guild.get_member(after.id)
+                if member:
+                    self.index.add(member)
+                    break
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.index.remove(member.id)
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        if self.policy.mode != "staff" or not isinstance(message.author, discord.Member):
+            return
+        channel_name = getattr(message.channel, "name", "") or ""
+        if channel_name.startswith(TICKET_CHANNEL_PREFIXES) or self.policy.is_staff(message.author):
+            self.policy.pin(message.author)
+
+    @commands.Cog.listener()
+    async def on_interaction(self, interaction):
+        if self.policy.mode == "staff" and isinstance(interaction.user, discord.Member):
+            self.policy.pin(interaction.user)
+
+    @commands.command(name='membercache')
+    @commands.is_owner()
+    async def member_cache_status(self, ctx):
+        """Show the member cache mode and how many members are held"""
+        guild = ctx.guild or self.bot.get_guild(GUILD_ID)
+        cached = len(guild.members) if guild else 0
+        total = guild.member_count if guild else 0
+        embed = discord.Embed(
+            title="👥 Member Cache",
+            description=(f"**Mode:** {self.policy.mode}\n"
+                         f"**Cached:** {cached} / {total}\n"
+                         f"**Chunked:** {'yes' if guild and guild.chunked else 'no'}\n"
+                         f"**Pinned (evictable):** {len(self.policy.pinned)}\n"
+                         f"**Name index:** {len(self.index)} members"),
+            color=discord.Color.blue()
+        )
+        await ctx.send(embed=embed)
+        await bot_log(f"[Members] Member cache status viewed by {ctx.author}")
+
+async def setup(bot):
+    """Setup function for the cog"""
+    await bot.add_cog(Members(bot))
@@ -7,8 +7,15 @@ import json
 import os
 from datetime import datetime, timedelta
 import asyncio
+import time
 from bot import bot_log
-from config import STAFF_LOG_CHANNEL_ID
+from config import STAFF_LOG_CHANNEL_ID, LOCKDOWN_CONCURRENCY
+from case_index import CaseQuery
+from case_repository import CASES
+from appeals_store import APPEALS
+from docstore import DOCUMENTS
+from purge import PurgeFilter, purge_messages
+from lockdown import already_locked, locked_overwrite, run_bounded, snapshot_overwrite, stored_overwrite
 
 class ModerationCog(commands.Cog):
     """Moderation system with logging and case management"""
@@ -27,64 +34,40 @@ class ModerationCog(commands.Cog):
         self.owner_role_name = "Owner"
         self.owner_id = 1374421925790482483
 
+    async def cog_load(self):
+        await CASES.preload()
+
     def ensure_data_file(self):
-        """Create moderation data file if it doesn't exist"""
-        os.makedirs("data", exist_ok=True)
-        if not os.path.exists(self.data_file):
-            with open(self.data_file, "w") as f:
-                json.dump({"cases": [], "next_case_number": 1}, f)
-        if not os.path.exists(self.appeals_file):
-            with open(self.appeals_file, "w") as f:
-                json.dump({"appeals": [], "next_appeal_number": 1}, f)
-        if not os.path.exists(self.notify_users_file):
-            with open(self.notify_users_file, "w") as f:
-                json.dump({"notify_users": []}, f)
+        """Open the shared documents backing moderation data"""
+        self.cases_doc = CASES.document
+        self.notify_users_doc = DOCUMENTS.open(self.notify_users_file, default=lambda: {"notify_users": []})
+        self.lockdown_doc = DOCUMENTS.open("data/lockdown.json", default=lambda: {"active": False, "channels": {}})
 
     def load_cases(self):
-        """Load moderation cases from file"""
-        with open(self.data_file, "r") as f:
-            return json.load(f)
-
-    def save_cases(self, data):
-        """Save moderation cases to file"""
-        with open(self.data_file, "w") as f:
-            json.dump(data, f, indent=2)
-
-    def get_next_case_number(self):
-        """Get the next case number and increment it"""
-        data = self.load_cases()
-        case_number = data["next_case_number"]
-        data["next_case_number"] += 1
-        self.save_cases(data)
+        """Current moderation cases document (read-only; change it through add_case)"""
+        return self.cases_doc.load_sync()
+
+    @property
+    def case_index(self):
+        """Search index over all cases, shared with the info panel through CASES"""
+        return CASES.index
+
+    async def add_case(self, case_data):
+        """Assign the next case number and append the case in one transaction"""
+        def append(data):
+            case_number = data.get("next_case_number", 1)
+            data["next_case_number"] = case_number + 1
+            case_data["case_number"] = case_number
+            data.setdefault("cases", []).append(case_data)
+            return case_number
+
+        case_number = await self.cases_doc.update(append)
+        CASES.record(case_data)
         return case_number
 
-    def load_appeals(self):
-        """Load appeals from file"""
-        with open(self.appeals_file, "r") as f:
-            return json.load(f)
-
-    def save_appeals(self, data):
-        """Save appeals to file"""
-        with open(self.appeals_file, "w") as f:
-            json.dump(data, f, indent=2)
-
-    def get_next_appeal_number(self):
-        """Get the next appeal number and increment it"""
-        data = self.load_appeals()
-        appeal_number = data["next_appeal_number"]
-        data["next_appeal_number"] += 1
-        self.save_appeals(data)
-        return appeal_number
-
-    def load_notify_users(self):
+    async def load_notify_users(self):
         """Load notify users list"""
-        with open(self.notify_users_file, "r") as f:
-            return json.load(f)
-
-    def save_notify_users(self, data):
-        """Save notify users list"""
-        with open(self.notify_users_file, "w") as f:
-            json.dump(data, f, indent=2)
+        return await self.notify_users_doc.read()
 
     def has_life_team_permissions(self, member):
         """Check if member has Life Team permissions or higher"""
@@ -174,10 +157,8 @@ class ModerationCog(commands.Cog):
             pass
         try:
             await target.ban(reason=f"Banned by {ctx.author}: {reason}")
-            case_number = self.get_next_case_number()
-            data = self.load_cases()
             case_data = {
-                "case_number": case_number,
+                "case_number": None,
                 "moderator_id": ctx.author.id,
                 "moderator_name": str(ctx.author),
                 "target_id": target.id,
@@ -188,8 +169,7 @@ class ModerationCog(commands.Cog):
                 "date": datetime.now().strftime("%m/%d/%Y"),
                 "time": datetime.now().strftime("%I:%M %p")
             }
-            data["cases"].append(case_data)
-            self.save_cases(data)
+            case_number = await self.add_case(case_data)
             await self.send_staff_log(ctx.author, target, "Discord Ban", reason, case_number)
             msg = await ctx.send(f"✔ {target.mention} was banned.")
             await asyncio.sleep(5)
@@ -213,20 +193,7 @@ class ModerationCog(commands.Cog):
         except discord.NotFound:
             pass
         try:
-            if duration.endswith('m') or duration.endswith('min'):
-                minutes = int(duration.replace('m', '').replace('in', ''))
-                duration_text = f"{minutes} minute(s)"
-            elif duration.endswith('h') or duration.endswith('hour'):
-                hours = int(duration.replace('h', '').replace('our', ''))
-                minutes = hours * 60
-                duration_text = f"{hours} hour(s)"
-            elif duration.endswith('d') or duration.endswith('day'):
-                days = int(duration.replace('d', '').replace('ay', ''))
-                minutes = days * 24 * 60
-                duration_text = f"{days} day(s)"
-            else:
-                minutes = int(duration)
-                duration_text = f"{minutes} minute(s)"
+            minutes, duration_text = self.parse_duration(duration)
         except ValueError:
             await ctx.send("✖ Invalid duration format. Use: 5m, 2h, 1d, or just a number for minutes.")
             return
@@ -234,25 +201,7 @@ class ModerationCog(commands.Cog):
             await ctx.send("✖ Maximum timeout duration is 28 days.")
             return
         try:
-            timeout_until = datetime.now() + timedelta(minutes=minutes)
-            await target.timeout(timeout_until, reason=f"Muted by {ctx.author}: {reason}")
-            case_number = self.get_next_case_number()
-            data = self.load_cases()
-            case_data = {
-                "case_number": case_number,
-                "moderator_id": ctx.author.id,
-                "moderator_name": str(ctx.author),
-                "target_id": target.id,
-                "target_name": str(target),
-                "type": f"Timeout ({duration_text})",
-                "reason": reason,
-                "timestamp": datetime.now().isoformat(),
-                "date": datetime.now().strftime("%m/%d/%Y"),
-                "time": datetime.now().strftime("%I:%M %p")
-            }
-            data["cases"].append(case_data)
-            self.save_cases(data)
-            await self.send_staff_log(ctx.author, target, f"Timeout ({duration_text})", reason, case_number)
+            await self.timeout_member(ctx.author, target, minutes, duration_text, reason)
             msg = await ctx.send(f"✔ {target.mention} was muted for {duration_text}.")
             await asyncio.sleep(5)
             try:
@@ -264,6 +213,40 @@ class ModerationCog(commands.Cog):
         except Exception as e:
             await ctx.send(f"✖ Error muting user: {str(e)}")
 
+    def parse_duration(self, duration):
+        """Turn 5m, 2h, 1d or a bare number of minutes into (minutes, display text)"""
+        if duration.endswith('m') or duration.endswith('min'):
+            minutes = int(duration.replace('m', '').replace('in', ''))
+            return minutes, f"{minutes} minute(s)"
+        if duration.endswith('h') or duration.endswith('hour'):
+            hours = int(duration.replace('h', '').replace('our', ''))
+            return hours * 60, f"{hours} hour(s)"
+        if duration.endswith('d') or duration.endswith('day'):
+            days = int(duration.replace('d', '').replace('ay', ''))
+            return days * 24 * 60, f"{days} day(s)"
+        minutes = int(duration)
+        return minutes, f"{minutes} minute(s)"
+
+    async def timeout_member(self, moderator, target, minutes, duration_text, reason):
+        """Time a member out, record the case and log it; returns the case number"""
+        timeout_until = datetime.now() + timedelta(minutes=minutes)
+        await target.timeout(timeout_until, reason=f"Muted by {moderator}: {reason}")
+        case_data = {
+            "case_number": None,
+            "moderator_id": moderator.id,
+            "moderator_name": str(moderator),
+            "target_id": target.id,
+            "target_name": str(target),
+            "type": f"Timeout ({duration_text})",
+            "reason": reason,
+            "timestamp": datetime.now().isoformat(),
+            "date": datetime.now().strftime("%m/%d/%Y"),
+            "time": datetime.now().strftime("%I:%M %p")
+        }
+        case_number = await self.add_case(case_data)
+        await self.send_staff_log(moderator, target, f"Timeout ({duration_text})", reason, case_number)
+        return case_number
+
     @commands.command(name='lock')
     async def lock_channel(self, ctx, channel: Optional[discord.TextChannel] = None):
         """Lock a channel (Life Team+)"""
@@ -320,6 +303,251 @@ class ModerationCog(commands.Cog):
         except Exception as e:
             await ctx.send(f"✖ Error unlocking channel: {str(e)}")
 
+    def parse_lockdown_options(self, options):
+        """Split '[dry] [reason]' into a dry-run flag and a reason"""
+        words = options.split(maxsplit=1)
+        if words and words[0].lower() in ("dry", "dry-run", "--dry-run"):
+            return True, words[1] if len(words) > 1 else None
+        return False, options or None
+
+    def lockdown_embed(self, title, color, counts, channels=None):
+        embed = discord.Embed(title=title, color=color, timestamp=discord.utils.utcnow())
+        for name, value in counts.items():
+            embed.add_field(name=name, value=str(value), inline=True)
+        if channels:
+            listed = ", ".join(channel.mention for channel in channels[:25])
+            if len(channels) > 25:
+                listed += f" and {len(channels) - 25} more"
+            embed.add_field(name="Channels", value=listed, inline=False)
+        return embed
+
+    @commands.command(name='lockdown')
+    async def lockdown(self, ctx, *, options: str = ""):
+        """Lock every public text channel, remembering the previous overwrites (Life Team+)"""
+        if not self.has_life_team_permissions(ctx.author):
+            await ctx.send("✖ You don't have permission to use this command.")
+            return
+
+        dry_run, reason = self.parse_lockdown_options(options)
+        state = await self.lockdown_doc.load()
+        if state.get("active") and not dry_run:
+            await ctx.send("✖ The server is already in lockdown. Use `!unlockdown` to restore it first.")
+            return
+
+        guild = ctx.guild
+        everyone = guild.default_role
+        snapshot = {}
+        targets = []
+        unmanageable = []
+        already = 0
+        for channel in guild.text_channels:
+            if not channel.permissions_for(everyone).view_channel:
+                continue
+            if not channel.permissions_for(guild.me).manage_roles:
+                unmanageable.append(channel)
+                continue
+            entry = snapshot_overwrite(channel, everyone)
+            if already_locked(entry):
+                already += 1
+                continue
+            snapshot[str(channel.id)] = entry
+            targets.append(channel)
+
+        counts = {"To lock": len(targets), "Already locked": already, "No permission": len(unmanageable)}
+        if dry_run:
+            await ctx.send(embed=self.lockdown_embed("🔍 Lockdown Dry Run", discord.Color.blue(), counts, targets))
+            return
+
+        await self.lockdown_doc.replace({
+            "active": True,
+            "started_by": ctx.author.id,
+            "started_at": discord.utils.utcnow().isoformat(),
+            "reason": reason,
+            "channels": snapshot
+        })
+
+        status = await ctx.send(f"🔒 Locking {len(targets)} channel(s)...")
+        audit_reason = f"Lockdown by {ctx.author}" + (f": {reason}" if reason else "")
+
+        async def lock(channel):
+            await channel.set_permissions(everyone, overwrite=locked_overwrite(snapshot[str(channel.id)]), reason=audit_reason)
+
+        async def progress(done, failed, total):
+            await status.edit(content=f"🔒 Locking channels... {done + failed}/{total}")
+
+        started = time.perf_counter()
+        results = await run_bounded(targets, lock, LOCKDOWN_CONCURRENCY, progress)
+        elapsed = time.perf_counter() - started
+
+        counts = {"Locked": len(results["done"]), "Failed": len(results["failed"]), **{k: v for k, v in counts.items() if k != "To lock"}}
+        embed = self.lockdown_embed("🔒 Server Lockdown", discord.Color.red(), counts, [channel for channel, _ in results["failed"]])
+        embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
+        embed.add_field(name="Reason", value=reason or "No reason provided", inline=True)
+        embed.set_footer(text=f"Finished in {elapsed:.1f}s • Use !unlockdown to restore")
+        await status.edit(content=None, embed=embed)
+        print(f"🔒 Lockdown by {ctx.author}: {len(results['done'])} locked, {len(results['failed'])} failed in {elapsed:.1f}s")
+        await bot_log(f"[Moderation] Lockdown by {ctx.author}: {len(results['done'])} channel(s) locked, {len(results['failed'])} failed")
+
+    @commands.command(name='unlockdown')
+    async def unlockdown(self, ctx, *, options: str = ""):
+        """Restore every channel touched by !lockdown to its exact previous overwrite (Life Team+)"""
+        if not self.has_life_team_permissions(ctx.author):
+            await ctx.send("✖ You don't have permission to use this command.")
+            return
+
+        dry_run, _ = self.parse_lockdown_options(options)
+        state = await self.lockdown_doc.load()
+        if not state.get("active"):
+            await ctx.send("✖ The server is not in lockdown.")
+            return
+
+        guild = ctx.guild
+        everyone = guild.default_role
+        snapshot = state.get("channels", {})
+        targets = []
+        missing = []
+        for channel_id in snapshot:
+            channel = guild.get_channel(int(channel_id))
+            if channel is None:
+                missing.append(channel_id)
+            else:
+                targets.append(channel)
+
+        counts = {"To restore": len(targets), "Deleted since lockdown": len(missing)}
+        if dry_run:
+            await ctx.send(embed=self.lockdown_embed("🔍 Unlockdown Dry Run", discord.Color.blue(), counts, targets))
+            return
+
+        status = await ctx.send(f"🔓 Restoring {len(targets)} channel(s)...")
+        audit_reason = f"Lockdown lifted by {ctx.author}"
+
+        async def restore(channel):
+            await channel.set_permissions(everyone, overwrite=stored_overwrite(snapshot[str(channel.id)]), reason=audit_reason)
+
+        async def progress(done, failed, total):
+            await status.edit(content=f"🔓 Restoring channels... {done + failed}/{total}")
+
+        started = time.perf_counter()
+        results = await run_bounded(targets, restore, LOCKDOWN_CONCURRENCY, progress)
+        elapsed = time.perf_counter() - started
+
+        remaining = {str(channel.id): snapshot[str(channel.id)] for channel, _ in results["failed"]}
+        if remaining:
+            await self.lockdown_doc.replace({**state, "channels": remaining})
+        else:
+            await self.lockdown_doc.replace({"active": False, "channels": {}})
+
+        counts = {"Restored": len(results["done"]), "Failed": len(results["failed"]), "Deleted since lockdown": len(missing)}
+        embed = self.lockdown_embed("🔓 Lockdown Lifted" if not remaining else "⚠️ Lockdown Partially Lifted",
+                                    discord.Color.green() if not remaining else discord.Color.orange(),
+                                    counts, [channel for channel, _ in results["failed"]])
+        embed.add_field(name="Moderator", value=ctx.author.mention, inline=True)
+        embed.set_footer(text=f"Finished in {elapsed:.1f}s" + (" • Run !unlockdown again to retry" if remaining else ""))
+        await status.edit(content=None, embed=embed)
+        print(f"🔓 Lockdown lifted by {ctx.author}: {len(results['done'])} restored, {len(results['failed'])} failed in {elapsed:.1f}s")
+        await bot_log(f"[Moderation] Lockdown lifted by {ctx.author}: {len(results['done'])} channel(s) restored, {len(results['failed'])} failed")
+
+    @commands.command(name='purge')
+    async def purge(self, ctx, *, options: str = ""):
+        """Bulk delete messages: !purge [N] [user:@x] [contains:text] [regex:pattern] [bots] [attachments] [after:id] (Life Team+)"""
+        if not self.has_life_team_permissions(ctx.author):
+            await ctx.send("✖ You don't have permission to use this command.")
+            return
+
+        try:
+            purge_filter = PurgeFilter.parse(options)
+        except ValueError as e:
+            await ctx.send(f"✖ {e}")
+            return
+
+        if not ctx.channel.permissions_for(ctx.guild.me).manage_messages:
+            await ctx.send("✖ I don't have permission to delete messages in this channel.")
+            return
+
+        status = await ctx.send(f"🧹 Purging {purge_filter.describe()}...")
+
+        async def progress(deleted, scanned):
+            try:
+                await status.edit(content=f"🧹 Purging... {deleted} deleted, {scanned} scanned")
+            except discord.HTTPException:
+                pass
+
+        started = time.perf_counter()
+        manifest = await purge_messages(ctx.channel, purge_filter, before=ctx.message, progress=progress)
+        elapsed = time.perf_counter() - started
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            pass
+
+        manifest.update({
+            "channel_id": ctx.channel.id,
+            "filters": purge_filter.describe(),
+            "first_id": str(manifest["first_id"]) if manifest["first_id"] else None,
+            "last_id": str(manifest["last_id"]) if manifest["last_id"] else None
+        })
+        author_ids = manifest.pop("author_ids")
+        case_number = None
+        if manifest["deleted"]:
+            if len(purge_filter.user_ids) == 1:
+                target_id = purge_filter.user_ids[0]
+            else:
+                target_id = author_ids[0] if len(author_ids) == 1 else None
+            case_data = {
+                "case_number": None,
+                "moderator_id": ctx.author.id,
+                "moderator_name": str(ctx.author),
+                "target_id": target_id,
+                "target_ids": author_ids,
+                "target_name": f"#{ctx.channel.name}",
+                "type": "Purge",
+                "reason": f"Purged {manifest['deleted']} message(s): {purge_filter.describe()}",
+                "timestamp": datetime.now().isoformat(),
+                "date": datetime.now().strftime("%m/%d/%Y"),
+                "time": datetime.now().strftime("%I:%M %p"),
+                "purge": manifest
+            }
+            case_number = await self.add_case(case_data)
+
+        summary = f"✔ Deleted {manifest['deleted']} message(s) ({manifest['bulk']} bulk, {manifest['single']} older than 14 days)"
+        if manifest["failed"]:
+            summary += f", {manifest['failed']} failed"
+        summary += f" in {elapsed:.1f}s."
+        if case_number:
+            summary += f" Logged as case #{case_number}."
+        await status.edit(content=summary)
+        await bot_log(f"[Moderation] {ctx.author} purged {manifest['deleted']} message(s) in #{ctx.channel.name} ({purge_filter.describe()})")
+        await asyncio.sleep(5)
+        try:
+            await status.delete()
+        except discord.HTTPException:
+            pass
+
+    @commands.command(name='appeals')
+    async def pending_appeals(self, ctx):
+        """List appeals that are still awaiting a decision (Life Team+)"""
+        if not self.has_life_team_permissions(ctx.author):
+            await ctx.send("✖ You don't have permission to use this command.")
+            return
+
+        await APPEALS.ready()
+        pending = APPEALS.pending()
+        embed = discord.Embed(
+            title="Pending Appeals",
+            description=f"{len(pending)} appeal(s) awaiting review" if pending else "No appeals are awaiting review.",
+            color=discord.Color.yellow() if pending else discord.Color.green()
+        )
+        for appeal in pending[:10]:
+            reason = str(appeal.get("appeal_reason", ""))
+            embed.add_field(
+                name=f"Appeal #{appeal.get('appeal_number')} • Case #{appeal.get('case_number')}",
+                value=f"**User**: {appeal.get('user_name', 'Unknown')}\n**Submitted**: {appeal.get('date', 'N/A')}\n*{reason[:100]}{'...' if len(reason) > 100 else ''}*",
+                inline=False
+            )
+        if len(pending) > 10:
+            embed.set_footer(text=f"Showing the 10 oldest of {len(pending)} pending appeals.")
+        await ctx.send(embed=embed)
+
     @commands.command(name='lookup')
     async def lookup_infractions(self, ctx, *, search_term):
         """Search for infractions, tickets, and whitelist data by username or ID (Life Team+)"""
@@ -327,17 +555,28 @@ class ModerationCog(commands.Cog):
             await ctx.send("✖ You don't have permission to use this command.")
             return
 
+        try:
+            query = CaseQuery.parse(search_term)
+        except ValueError as e:
+            await ctx.send(f"✖ {e}")
+            return
+        filtered = bool(query.fields or query.before or query.after)
+
         user = None
-        if search_term.startswith('<@') and search_term.endswith('>'):
-            user_id = int(search_term[2:-1].replace('!', ''))
-            user = self.bot.get_user(user_id)
-        elif search_term.isdigit():
-            user = self.bot.get_user(int(search_term))
-        else:
-            for member in ctx.guild.members:
-                if search_term.lower() in member.display_name.lower() or search_term.lower() in member.name.lower():
-                    user = member
-                    break
+        if not filtered:
+            directory = self.bot.get_cog('Members')
+            if search_term.startswith('<@') and search_term.endswith('>'):
+                user_id = int(search_term[2:-1].replace('!', ''))
+                user = self.bot.get_user(user_id)
+            elif search_term.isdigit():
+                user = self.bot.get_user(int(search_term))
+            if user is None and directory:
+                user = await directory.resolve(ctx.guild, search_term)
+            elif user is None and not search_term.isdigit():
+                for member in ctx.guild.members:
+                    if search_term.lower() in member.display_name.lower() or search_term.lower() in member.name.lower():
+                        user = member
+                        break
 
         embed = discord.Embed(
             title=f"Lookup Results for '{search_term}'",
@@ -371,8 +610,8 @@ class ModerationCog(commands.Cog):
 
         try:
             support_cog = self.bot.get_cog('SupportCog')
-            if support_cog and user and user.id in support_cog.active_tickets:
-                ticket_data = support_cog.active_tickets[user.id]
+            if support_cog and user and str(user.id) in support_cog.active_tickets:
+                ticket_data = support_cog.active_tickets[str(user.id)]
                 channel_id = ticket_data.get("channel_id") if isinstance(ticket_data, dict) else ticket_data
                 channel = self.bot.get_channel(channel_id)
                 if channel:
@@ -380,8 +619,8 @@ class ModerationCog(commands.Cog):
 
             whitelist_cog = self.bot.get_cog('WhitelistCog')
             if whitelist_cog and user:
-                if hasattr(whitelist_cog, 'active_whitelist_tickets') and user.id in whitelist_cog.active_whitelist_tickets:
-                    ticket_data = whitelist_cog.active_whitelist_tickets[user.id]
+                if hasattr(whitelist_cog, 'active_whitelist_tickets') and str(user.id) in whitelist_cog.active_whitelist_tickets:
+                    ticket_data = whitelist_cog.active_whitelist_tickets[str(user.id)]
                     channel_id = ticket_data.get("channel_id") if isinstance(ticket_data, dict) else ticket_data
                     channel = self.bot.get_channel(channel_id)
                     if channel:
@@ -397,55 +636,33 @@ class ModerationCog(commands.Cog):
         except Exception as e:
             print(f"Error accessing ticket data: {e}")
 
-        data = self.load_cases()
-        cases = data.get("cases", [])
+        if search_term.startswith('<@') and user:
+            query = CaseQuery.parse(str(user.id))
+        matching_cases = self.case_index.search(query)
+        if not matching_cases and user and not filtered:
+            matching_cases = self.case_index.search(str(user.id))
 
-        if cases:
-            matching_cases = []
-            search_lower = search_term.lower()
+        if matching_cases:
+            embed.add_field(name="Recent Infractions", value=f"Found {len(matching_cases)} case(s)", inline=False)
 
-            for case in cases:
-                if search_term.isdigit() and case["case_number"] == int(search_term):
-                    matching_cases.append(case)
-                    continue
-
-                if (search_lower in case["target_name"].lower() or
-                    search_lower in case["moderator_name"].lower()):
-                    matching_cases.append(case)
-                    continue
-
-                if search_lower in case["type"].lower():
-                    matching_cases.append(case)
-                    continue
-
-                if (search_term.isdigit() and
-                    (case["target_id"] == int(search_term) or case["moderator_id"] == int(search_term))):
-                    matching_cases.append(case)
-                    continue
-
-            if matching_cases:
-                matching_cases.sort(key=lambda x: x["case_number"], reverse=True)
-
-                embed.add_field(name="Recent Infractions", value=f"Found {len(matching_cases)} case(s)", inline=False)
-
-                for i, case in enumerate(matching_cases[:5]):
-                    case_info = f"**{case['type']}** | {case['target_name']} | {case['date']}"
-                    if len(case['reason']) > 50:
-                        case_info += f"\n*{case['reason'][:50]}...*"
-                    else:
-                        case_info += f"\n*{case['reason']}*"
+            for i, case in enumerate(matching_cases[:5]):
+                case_info = f"**{case['type']}** | {case['target_name']} | {case['date']}"
+                if len(case['reason']) > 50:
+                    case_info += f"\n*{case['reason'][:50]}...*"
+                else:
+                    case_info += f"\n*{case['reason']}*"
 
-                    embed.add_field(
-                        name=f"Case
-                        value=case_info,
-                        inline=True
-                    )
+                embed.add_field(
+                    name=f"Case
+                    value=case_info,
+                    inline=True
+                )
 
-                if len(matching_cases) > 5:
-                    embed.set_footer(text=f"Showing 5 of {len(matching_cases)} infractions. Use case number for details.")
+            if len(matching_cases) > 5:
+                embed.set_footer(text=f"Showing 5 of {len(matching_cases)} infractions. Use case number for details.")
 
         if user:
-            view = LookupView(user, matching_cases if 'matching_cases' in locals() else [], self.bot)
+            view = LookupView(user, matching_cases, self.bot)
             await ctx.send(embed=embed, view=view)
         else:
             await ctx.send(embed=embed)
@@ -509,8 +726,8 @@ class LookupView(ui.View):
                 else:
                     embed.add_field(name="Status", value="✖ Not Whitelisted", inline=False)
 
-            if hasattr(whitelist_cog, 'active_whitelist_tickets') and self.user.id in whitelist_cog.active_whitelist_tickets:
-                ticket_data = whitelist_cog.active_whitelist_tickets[self.user.id]
+            if hasattr(whitelist_cog, 'active_whitelist_tickets') and str(self.user.id) in whitelist_cog.active_whitelist_tickets:
+                ticket_data = whitelist_cog.active_whitelist_tickets[str(self.user.id)]
                 channel_id = ticket_data.get("channel_id") if isinstance(ticket_data, dict) else ticket_data
                 if channel_id:
                     channel = self.bot.get_channel(int(channel_id))
@@ -543,8 +760,8 @@ class LookupView(ui.View):
             )
 
             support_cog = self.bot.get_cog('SupportCog')
-            if support_cog and hasattr(support_cog, 'active_tickets') and self.user.id in support_cog.active_tickets:
-                ticket_data = support_cog.active_tickets[self.user.id]
+            if support_cog and hasattr(support_cog, 'active_tickets') and str(self.user.id) in support_cog.active_tickets:
+                ticket_data = support_cog.active_tickets[str(self.user.id)]
                 channel_id = ticket_data.get("channel_id") if isinstance(ticket_data, dict) else ticket_data
                 if channel_id:
                     channel = self.bot.get_channel(int(channel_id))
@@ -552,8 +769,8 @@ class LookupView(ui.View):
                         embed.add_field(name="Active Support Ticket", value=channel.mention, inline=False)
 
             whitelist_cog = self.bot.get_cog('WhitelistCog')
-            if whitelist_cog and hasattr(whitelist_cog, 'active_whitelist_tickets') and self.user.id in whitelist_cog.active_whitelist_tickets:
-                ticket_data = whitelist_cog.active_whitelist_tickets[self.user.id]
+            if whitelist_cog and hasattr(whitelist_cog, 'active_whitelist_tickets') and str(self.user.id) in whitelist_cog.active_whitelist_tickets:
+                ticket_data = whitelist_cog.active_whitelist_tickets[str(self.user.id)]
                 channel_id = ticket_data.get("channel_id") if isinstance(ticket_data, dict) else ticket_data
                 if channel_id:
                     channel = self.bot.get_channel(int(channel_id))
@@ -629,11 +846,8 @@ class ReasonModal(ui.Modal):
         """Process the infraction when modal is submitted"""
         reason = self.reason_input.value
 
-        case_number = self.moderation_cog.get_next_case_number()
-
-        data = self.moderation_cog.load_cases()
         case_data = {
-            "case_number": case_number,
+            "case_number": None,
             "moderator_id": self.moderator.id,
             "moderator_name": str(self.moderator),
             "target_id": self.target_user.id,
@@ -644,8 +858,7 @@ class ReasonModal(ui.Modal):
             "date": datetime.now().strftime("%m/%d/%Y"),
             "time": datetime.now().strftime("%I:%M %p")
         }
-        data["cases"].append(case_data)
-        self.moderation_cog.save_cases(data)
+        case_number = await self.moderation_cog.add_case(case_data)
 
         await self.moderation_cog.send_staff_log(self.moderator, self.target_user, self.infraction_type, reason, case_number)
         await self.moderation_cog.dm_user_infraction(self.target_user, self.infraction_type, reason, case_number)
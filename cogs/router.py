@@ -0,0 +1,47 @@
+import discord
+from discord.ext import commands
+from message_router import ANY_WEBHOOK, ROUTER
+
+class MessageRouterCog(commands.Cog):
+    """Single on_message entry point that feeds the shared message router"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        if message.author.id == self.bot.user.id:
+            return
+        await ROUTER.dispatch(message)
+
+    @commands.command(name='routes')
+    @commands.is_owner()
+    async def list_routes(self, ctx):
+        """Show registered message routes and how often each fired"""
+        embed = discord.Embed(
+            title="📬 Message Routes",
+            description=(f"**Seen:** {ROUTER.seen} • **Unrouted:** {ROUTER.unrouted} "
+                         f"({ROUTER.unrouted / ROUTER.seen:.1%} returned immediately)" if ROUTER.seen else "No messages routed yet."),
+            color=discord.Color.blue()
+        )
+        for route in sorted(ROUTER.routes.values(), key=lambda r: r.name):
+            keys = []
+            if route.channel_id is not None:
+                keys.append(f"<#{route.channel_id}>")
+            if route.webhook is not None:
+                keys.append("any webhook" if route.webhook == ANY_WEBHOOK else f"webhook {route.webhook}")
+            if route.titles:
+                keys.append("title: " + " / ".join(route.titles))
+            average = route.total_time / route.delivered * 1000 if route.delivered else 0.0
+            embed.add_field(
+                name=route.name,
+                value=f"{', '.join(keys)}\n**Delivered:** {route.delivered} • **Errors:** {route.errors} • **Avg:** {average:.1f}ms",
+                inline=False
+            )
+        waiting = sum(1 for bucket in (*ROUTER.by_channel.values(), *ROUTER.by_webhook.values()) for route in bucket if route.future)
+        embed.set_footer(text=f"{len(ROUTER.routes)} route(s) • {waiting} pending wait(s)")
+        await ctx.send(embed=embed)
+
+async def setup(bot):
+    """Setup function for the cog"""
+    await bot.add_cog(MessageRouterCog(bot))
@@ -0,0 +1,86 @@
+import discord
+from discord.ext import commands
+import time
+from config import GUILD_ID, SPAM_THRESHOLDS, SPAM_TIMEOUT
+from bot import bot_log
+from metrics import REGISTRY
+from spam_detector import SpamDetector, count_links
+
+SPAM_TRIGGERS = REGISTRY.counter(
+    "newlife_spam_triggers_total",
+    "Members timed out by the spam guard",
+)
+
+class SpamGuard(commands.Cog):
+    """Times out members who flood, repeat themselves or mass-mention"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.detector = SpamDetector(**SPAM_THRESHOLDS)
+        self.triggered = 0
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        if not message.guild or message.guild.id != GUILD_ID or not isinstance(message.author, discord.Member):
+            return
+        author = message.author
+        if author.bot or author.is_timed_out():
+            return
+        moderation = self.bot.get_cog('ModerationCog')
+        if not moderation or moderation.has_life_team_permissions(author):
+            return
+        mentions = len(message.raw_mentions) + len(message.raw_role_mentions) + (1 if message.mention_everyone else 0)
+        reason = self.detector.check(author.id, message.channel.id, message.content, mentions,
+                                     count_links(message.content), time.monotonic())
+        if reason:
+            self.detector.reset(author.id)
+            await self.punish(moderation, message, reason)
+
+    async def punish(self, moderation, message, reason):
+        """Apply the !mute timeout for SPAM_TIMEOUT and record the case"""
+        author = message.author
+        self.triggered += 1
+        SPAM_TRIGGERS.inc()
+        try:
+            await message.delete()
+        except discord.HTTPException:
+            pass
+        minutes, duration_text = moderation.parse_duration(SPAM_TIMEOUT)
+        try:
+            case_number = await moderation.timeout_member(self.bot.user, author, minutes, duration_text, f"Spam guard: {reason}")
+        except discord.Forbidden:
+            print(f"❌ Spam guard could not time out {author}: missing permissions")
+            await bot_log(f"[SpamGuard] Could not time out {author}: {reason}", error=True)
+            return
+        except discord.HTTPException as e:
+            print(f"❌ Spam guard could not time out {author}: {e}")
+            return
+        await moderation.dm_user_infraction(author, f"Timeout ({duration_text})", f"Spam guard: {reason}", case_number)
+        try:
+            await message.channel.send(f"🔇 {author.mention} was muted for {duration_text} for spamming.", delete_after=10)
+        except discord.HTTPException:
+            pass
+
+    @commands.command(name='spamstats')
+    @commands.has_any_role(1376432927444963420, 1374421915938324583)
+    async def spam_stats(self, ctx):
+        """Show spam guard thresholds and how many members it is tracking"""
+        detector = self.detector
+        embed = discord.Embed(title="Spam Guard", color=discord.Color.blue())
+        embed.add_field(name="Tracked members", value=f"{len(detector.users)} / {detector.max_users}", inline=True)
+        embed.add_field(name="Evicted idle", value=str(detector.evicted), inline=True)
+        embed.add_field(name="Timeouts issued", value=str(self.triggered), inline=True)
+        embed.add_field(
+            name="Thresholds",
+            value=(f"**Burst:** {detector.burst:g} messages, refill {detector.rate:g}/s\n"
+                   f"**Mentions:** {detector.mention_burst:g}, refill {detector.mention_rate:g}/s\n"
+                   f"**Links:** {detector.link_burst:g}, refill {detector.link_rate:g}/s\n"
+                   f"**Duplicates:** {detector.duplicates} within {detector.duplicate_window:g}s\n"
+                   f"**Timeout:** {SPAM_TIMEOUT}"),
+            inline=False
+        )
+        await ctx.send(embed=embed)
+
+async def setup(bot):
+    """Setup function for the cog"""
+    await bot.add_cog(SpamGuard(bot))
@@ -5,6 +5,7 @@ import os
 import json
 from typing import Dict
 from bot import bot_log
+from docstore import DOCUMENTS
 
 SUGGESTIONS_CHANNEL_ID = 1388221470865489930
 GUILD_ID = 1372672239245459498
@@ -16,68 +17,61 @@ def ensure_data_dir() -> str:
     return base
 
 class SuggestionStore:
+    """Suggestion votes kept in the document; every change is a transaction on the document actor"""
+
     def __init__(self):
         self.path = os.path.join(ensure_data_dir(), "suggestions.json")
-        self.data = {"suggestions": {}}
-        self._load()
+        self.document = DOCUMENTS.open(self.path, default=lambda: {"suggestions": {}})
+        self.document.load_sync().setdefault("suggestions", {})
 
-    def _load(self):
-        try:
-            if os.path.exists(self.path):
-                with open(self.path, "r", encoding="utf-8") as f:
-                    self.data = json.load(f)
-        except Exception:
-            self.data = {"suggestions": {}}
+    @property
+    def data(self) -> dict:
+        return self.document.data
 
-    def _save(self):
-        try:
-            with open(self.path, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, indent=2)
-        except Exception:
-            pass
-
-    def init_suggestion(self, message_id: int, author_id: int, channel_id: int):
-        self.data["suggestions"][str(message_id)] = {
-            "author_id": author_id,
-            "channel_id": channel_id,
-            "votes": {},
-            "up": 0,
-            "down": 0,
-        }
-        self._save()
+    async def init_suggestion(self, message_id: int, author_id: int, channel_id: int):
+        def apply(data):
+            data.setdefault("suggestions", {})[str(message_id)] = {
+                "author_id": author_id,
+                "channel_id": channel_id,
+                "votes": {},
+                "up": 0,
+                "down": 0,
+            }
+
+        await self.document.update(apply)
 
     def get_counts(self, message_id: int):
-        s = self.data["suggestions"].get(str(message_id))
+        s = self.data.get("suggestions", {}).get(str(message_id))
         if not s:
             return 0, 0
         return int(s.get("up", 0)), int(s.get("down", 0))
 
-    def apply_vote(self, message_id: int, user_id: int, vote: int):
-        key = str(message_id)
-        s = self.data["suggestions"].get(key)
-        if not s:
-            return 0, 0
-        votes: Dict[str, int] = s.get("votes", {})
-        current = int(votes.get(str(user_id), 0))
-
-        if current == 1:
-            s["up"] = max(0, int(s.get("up", 0)) - 1)
-        elif current == -1:
-            s["down"] = max(0, int(s.get("down", 0)) - 1)
-
-        if vote == 1:
-            s["up"] = int(s.get("up", 0)) + 1
-            votes[str(user_id)] = 1
-        elif vote == -1:
-            s["down"] = int(s.get("down", 0)) + 1
-            votes[str(user_id)] = -1
-        else:
-            votes.pop(str(user_id), None)
-
-        s["votes"] = votes
-        self.data["suggestions"][key] = s
-        self._save()
-        return int(s.get("up", 0)), int(s.get("down", 0))
+    async def apply_vote(self, message_id: int, user_id: int, vote: int, toggle: bool = False):
+        """Set a user's vote (1, -1 or 0); with toggle, repeating the current vote clears it"""
+        def apply(data):
+            s = data.setdefault("suggestions", {}).get(str(message_id))
+            if not s:
+                return 0, 0
+            votes: Dict[str, int] = s.setdefault("votes", {})
+            current = int(votes.get(str(user_id), 0))
+            new_vote = 0 if toggle and current == vote else vote
+
+            if current == 1:
+                s["up"] = max(0, int(s.get("up", 0)) - 1)
+            elif current == -1:
+                s["down"] = max(0, int(s.get("down", 0)) - 1)
+
+            if new_vote == 1:
+                s["up"] = int(s.get("up", 0)) + 1
+                votes[str(user_id)] = 1
+            elif new_vote == -1:
+                s["down"] = int(s.get("down", 0)) + 1
+                votes[str(user_id)] = -1
+            else:
+                votes.pop(str(user_id), None)
+            return int(s.get("up", 0)), int(s.get("down", 0))
+
+        return await self.document.update(apply)
 
 class SuggestionView(discord.ui.View):
     def __init__(self, store: SuggestionStore, message_id: int, up: int, down: int):
@@ -89,26 +83,12 @@ class SuggestionView(discord.ui.View):
 
     @discord.ui.button(style=discord.ButtonStyle.success, label="⬆ Upvote (0)")
     async def upvote(self, interaction: discord.Interaction, button: discord.ui.Button):
-        user_id = interaction.user.id
-        key = str(self.message_id)
-        current = 0
-        data = self.store.data.get("suggestions", {}).get(key)
-        if data:
-            current = int(data.get("votes", {}).get(str(user_id), 0))
-        new_vote = 0 if current == 1 else 1
-        up, down = self.store.apply_vote(self.message_id, user_id, new_vote)
+        up, down = await self.store.apply_vote(self.message_id, interaction.user.id, 1, toggle=True)
         await self._update(interaction, up, down)
 
     @discord.ui.button(style=discord.ButtonStyle.danger, label="⬇ Downvote (0)")
     async def downvote(self, interaction: discord.Interaction, button: discord.ui.Button):
-        user_id = interaction.user.id
-        key = str(self.message_id)
-        current = 0
-        data = self.store.data.get("suggestions", {}).get(key)
-        if data:
-            current = int(data.get("votes", {}).get(str(user_id), 0))
-        new_vote = 0 if current == -1 else -1
-        up, down = self.store.apply_vote(self.message_id, user_id, new_vote)
+        up, down = await self.store.apply_vote(self.message_id, interaction.user.id, -1, toggle=True)
         await self._update(interaction, up, down)
 
     async def _update(self, interaction: discord.Interaction, up: int, down: int):
@@ -164,7 +144,7 @@ class Suggestions(commands.Cog):
 
         msg = await channel.send(embed=embed)
 
-        self.store.init_suggestion(msg.id, author.id, channel.id)
+        await self.store.init_suggestion(msg.id, author.id, channel.id)
         await bot_log(f"[Suggestions] Suggestion submitted by {author.id}")
 
         view = SuggestionView(self.store, msg.id, 0, 0)
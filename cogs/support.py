@@ -9,53 +9,70 @@ from typing import Optional, cast
 import aiohttp
 from config import LOG_CHANNEL_ID, STAFF_LOG_CHANNEL_ID
 from bot import bot_log
+from metrics import REGISTRY
+from supervisor import SUPERVISOR
+from docstore import DOCUMENTS
 
 class SupportCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.active_tickets = {}
         self.close_timers = {}
-        self.support_panel_message_id = None
+        self.intake_paused = None
+        self.tickets_doc = DOCUMENTS.open("data/active_tickets.json")
+        self.panel_doc = DOCUMENTS.open("data/support_panel.json")
         self.load_active_tickets()
         self.load_support_panel_data()
+        REGISTRY.gauge(
+            "newlife_open_tickets",
+            "Support tickets currently open",
+            fn=lambda: len(self.active_tickets),
+        )
+
+    @property
+    def active_tickets(self) -> dict:
+        """Open tickets keyed by owner id; the document is the only copy"""
+        return self.tickets_doc.data
+
+    @property
+    def support_panel_message_id(self):
+        return self.panel_doc.data.get("message_id")
 
     def load_active_tickets(self):
-        """Load active tickets from data file"""
-        try:
-            with open("data/active_tickets.json", "r") as f:
-                data = json.load(f)
-                self.active_tickets = {}
-                for user_id, ticket_data in data.items():
-                    if isinstance(ticket_data, dict):
-                        self.active_tickets[user_id] = ticket_data
-                    else:
-                        self.active_tickets[user_id] = {
-                            "channel_id": ticket_data,
-                            "owner_id": int(user_id)
-                        }
-        except (FileNotFoundError, json.JSONDecodeError):
-            self.active_tickets = {}
-
-    def save_active_tickets(self):
-        """Save active tickets to data file"""
-        os.makedirs("data", exist_ok=True)
-        with open("data/active_tickets.json", "w") as f:
-            json.dump(self.active_tickets, f, indent=2)
+        """Load active tickets from data file, upgrading bare channel ids to ticket records"""
+        tickets = self.tickets_doc.load_sync()
+        for user_id, ticket_data in list(tickets.items()):
+            if not isinstance(ticket_data, dict):
+                tickets[user_id] = {
+                    "channel_id": ticket_data,
+                    "owner_id": int(user_id)
+                }
+
+    async def save_ticket(self, user_id: int, channel_id: int):
+        """Record an open ticket in one document transaction"""
+        def apply(tickets):
+            tickets[str(user_id)] = {"channel_id": channel_id, "owner_id": user_id}
+
+        await self.tickets_doc.update(apply)
+
+    async def forget_ticket(self, user_id: Optional[int] = None, channel_id: Optional[int] = None):
+        """Drop a ticket by owner or by channel in one document transaction and return its record"""
+        def apply(tickets):
+            if user_id is not None:
+                return tickets.pop(str(user_id), None)
+            for owner_id, ticket_data in list(tickets.items()):
+                if ticket_data.get("channel_id") == channel_id:
+                    return tickets.pop(owner_id)
+            return None
+
+        return await self.tickets_doc.update(apply)
 
     def load_support_panel_data(self):
         """Load support panel message ID"""
-        try:
-            with open("data/support_panel.json", "r") as f:
-                data = json.load(f)
-                self.support_panel_message_id = data.get("message_id")
-        except (FileNotFoundError, json.JSONDecodeError):
-            self.support_panel_message_id = None
+        self.panel_doc.load_sync()
 
-    def save_support_panel_data(self):
+    async def save_support_panel_data(self, message_id: Optional[int]):
         """Save support panel message ID"""
-        os.makedirs("data", exist_ok=True)
-        with open("data/support_panel.json", "w") as f:
-            json.dump({"message_id": self.support_panel_message_id}, f, indent=2)
+        await self.panel_doc.update(lambda data: data.__setitem__("message_id", message_id))
 
     async def cog_load(self):
         """Add persistent views when cog loads and ensure support panel exists"""
@@ -63,10 +80,15 @@ class SupportCog(commands.Cog):
         self.bot.add_view(CloseRequestView())
         self.bot.add_view(StaffSupportView())
 
-        await self.ensure_support_panel()
+        SUPERVISOR.spawn(self.ensure_support_panel_when_ready(), name="support-panel", owner="SupportCog")
 
         print("Support cog loaded and persistent views added")
 
+    async def ensure_support_panel_when_ready(self):
+        """Wait for the channel cache before checking the support panel"""
+        await self.bot.wait_until_ready()
+        await self.ensure_support_panel()
+
     @commands.Cog.listener()
     async def on_ready(self):
         """Bot ready event"""
@@ -80,8 +102,7 @@ class SupportCog(commands.Cog):
             return
 
         if not self.support_panel_message_id:
-            self.support_panel_message_id = 1419543749872062474
-            self.save_support_panel_data()
+            await self.save_support_panel_data(1419543749872062474)
             print(f"Using provided message ID: {self.support_panel_message_id}")
 
         panel_exists = False
@@ -105,8 +126,7 @@ class SupportCog(commands.Cog):
 
             except discord.NotFound:
                 print(f"Stored support panel message {self.support_panel_message_id} not found, will recreate")
-                self.support_panel_message_id = None
-                self.save_support_panel_data()
+                await self.save_support_panel_data(None)
             except Exception as e:
                 print(f"Error checking support panel: {e}")
 
@@ -173,8 +193,7 @@ class SupportCog(commands.Cog):
         view = SupportView()
         message = await support_channel.send(embed=embed, view=view)
 
-        self.support_panel_message_id = message.id
-        self.save_support_panel_data()
+        await self.save_support_panel_data(message.id)
         print("✔ Support panel created and saved!")
 
     @commands.command(name='support_panel')
@@ -211,8 +230,7 @@ class SupportCog(commands.Cog):
             view = SupportView()
             await message.edit(view=view)
 
-            self.support_panel_message_id = message.id
-            self.save_support_panel_data()
+            await self.save_support_panel_data(message.id)
 
             await ctx.send(f"✔ Support panel fixed! Message ID {message.id} now has working buttons.")
 
@@ -320,14 +338,15 @@ class SupportCog(commands.Cog):
                 )
                 await ctx.send(embed=embed)
 
-                whitelist_cog.close_timers[ctx.channel.id] = asyncio.create_task(
-                    whitelist_cog.delayed_close_whitelist(ctx.channel, time_seconds)
+                whitelist_cog.close_timers[ctx.channel.id] = SUPERVISOR.spawn(
+                    whitelist_cog.delayed_close_whitelist(ctx.channel, time_seconds),
+                    name=f"close-timer:{ctx.channel.id}", owner="WhitelistCog"
                 )
                 return
 
         await ctx.message.delete()
 
-        task = asyncio.create_task(self.delayed_close(ctx.channel, time_seconds))
+        task = SUPERVISOR.spawn(self.delayed_close(ctx.channel, time_seconds), name=f"close-timer:{ctx.channel.id}", owner="SupportCog")
         self.close_timers[ctx.channel.id] = task
 
         embed = discord.Embed(
@@ -647,16 +666,7 @@ class SupportCog(commands.Cog):
         try:
             await self.log_ticket_closure(channel, staff_member, f"Closed by {staff_member.name}")
 
-            user_to_remove = None
-            for user_id, ticket_data in self.active_tickets.items():
-                current_channel_id = ticket_data.get("channel_id") if isinstance(ticket_data, dict) else ticket_data
-                if current_channel_id == channel.id:
-                    user_to_remove = user_id
-                    break
-
-            if user_to_remove:
-                del self.active_tickets[user_to_remove]
-                self.save_active_tickets()
+            await self.forget_ticket(channel_id=channel.id)
 
             await asyncio.sleep(3)
             await channel.delete()
@@ -682,16 +692,7 @@ class SupportCog(commands.Cog):
             await channel.send(embed=embed)
             await asyncio.sleep(5)
 
-            user_to_remove = None
-            for user_id, ticket_data in self.active_tickets.items():
-                current_channel_id = ticket_data.get("channel_id") if isinstance(ticket_data, dict) else ticket_data
-                if current_channel_id == channel.id:
-                    user_to_remove = user_id
-                    break
-
-            if user_to_remove:
-                del self.active_tickets[user_to_remove]
-                self.save_active_tickets()
+            await self.forget_ticket(channel_id=channel.id)
 
             if channel.id in self.close_timers:
                 del self.close_timers[channel.id]
@@ -725,9 +726,13 @@ class SupportCog(commands.Cog):
             await interaction.response.send_message("✖ This command can only be used in a server!", ephemeral=True)
             return
 
-        if user.id in self.active_tickets:
-            ticket_data = self.active_tickets[user.id]
-            existing_channel_id = ticket_data.get("channel_id") if isinstance(ticket_data, dict) else ticket_data
+        if self.intake_paused:
+            await interaction.response.send_message(f"⏸️ Ticket creation is temporarily paused ({self.intake_paused}). Please try again later.", ephemeral=True)
+            return
+
+        ticket_data = self.active_tickets.get(str(user.id))
+        if ticket_data:
+            existing_channel_id = ticket_data.get("channel_id")
             if existing_channel_id:
                 existing_channel = guild.get_channel(existing_channel_id)
                 if existing_channel:
@@ -736,8 +741,7 @@ class SupportCog(commands.Cog):
                         ephemeral=True
                     )
                     return
-            del self.active_tickets[user.id]
-            self.save_active_tickets()
+            await self.forget_ticket(user.id)
 
         category = guild.get_channel(1381864421067849800)
         staff_role = guild.get_role(1374421915938324583)
@@ -769,11 +773,7 @@ class SupportCog(commands.Cog):
                 reason=f"Ticket created by {user}"
             )
 
-            self.active_tickets[user.id] = {
-                "channel_id": channel.id,
-                "owner_id": user.id
-            }
-            self.save_active_tickets()
+            await self.save_ticket(user.id, channel.id)
 
             if ticket_type == "general":
                 embed = discord.Embed(
@@ -915,16 +915,7 @@ class CloseRequestView(ui.View):
             bot = cast(commands.Bot, interaction.client)
             cog = cast(SupportCog, bot.get_cog('SupportCog'))
             if cog and interaction.channel:
-                user_to_remove = None
-                for user_id, ticket_data in cog.active_tickets.items():
-                    current_channel_id = ticket_data.get("channel_id") if isinstance(ticket_data, dict) else ticket_data
-                    if current_channel_id == interaction.channel.id:
-                        user_to_remove = user_id
-                        break
-
-                if user_to_remove:
-                    del cog.active_tickets[user_to_remove]
-                    cog.save_active_tickets()
+                await cog.forget_ticket(channel_id=interaction.channel.id)
 
         await asyncio.sleep(3)
         if isinstance(interaction.channel, (discord.TextChannel, discord.Thread)):
@@ -42,9 +42,12 @@ class MassDM(commands.Cog):
 
         members = guild.members
         if not members or len(members) < guild.member_count:
+            directory = self.bot.get_cog('Members')
             try:
-                await guild.fetch_members(limit=None).flatten()
-                members = guild.members
+                if directory:
+                    members = await directory.all_members(guild)
+                else:
+                    members = [member async for member in guild.fetch_members(limit=None)]
             except Exception:
                 pass
 
@@ -1,8 +1,11 @@
 import discord
 from discord.ext import commands
 import json
+import math
 import os
 from bot import bot_log
+from join_pipeline import JoinPipeline
+from throttled_updater import ThrottledUpdater
 
 class Welcome(commands.Cog):
     """Welcome system and member counter"""
@@ -16,70 +19,109 @@ class Welcome(commands.Cog):
 
         self.WELCOME_ROLE_ID = 1374421919373328434
 
+        self.counter_updater = ThrottledUpdater("member-counter", self.rename_member_counter,
+                                                max_calls=2, window=600.0, owner="Welcome")
+        self.join_pipeline = JoinPipeline("join-pipeline", self.send_welcome, self.send_batch_welcome,
+                                          self.grant_welcome_role, owner="Welcome", batch_threshold=5,
+                                          rate_window=60.0, batch_size=25, batch_interval=10.0, role_concurrency=2)
+
+    async def cog_load(self):
+        self.join_pipeline.start()
+
+    async def cog_unload(self):
+        self.counter_updater.cancel()
+        self.join_pipeline.stop()
+
     @commands.Cog.listener()
     async def on_member_join(self, member):
-        """Handle new member joins"""
-        try:
-            welcome_channel = self.bot.get_channel(self.WELCOME_CHANNEL_ID)
-            if not welcome_channel:
-                print(f"❌ Welcome channel {self.WELCOME_CHANNEL_ID} not found")
-                return
+        """Queue new members for the welcome pipeline"""
+        self.join_pipeline.submit(member)
+        self.update_member_counter(member.guild)
+        print(f"📥 {member.display_name} ({member.id}) queued for welcome - Guild now has {member.guild.member_count} members")
 
-            member_count = member.guild.member_count
-
-            embed = discord.Embed(
-                title="🎉 Welcome to New Life SMP!",
-                description=f"Welcome {member.mention} to the New Life SMP! We are now at **{member_count}** members!",
-                color=discord.Color.green()
-            )
+    async def send_welcome(self, member):
+        """Send the welcome embed for one member"""
+        welcome_channel = self.bot.get_channel(self.WELCOME_CHANNEL_ID)
+        if not welcome_channel:
+            print(f"❌ Welcome channel {self.WELCOME_CHANNEL_ID} not found")
+            return
 
-            embed.add_field(
-                name="📝 Get Whitelisted",
-                value=f"Ready to join the server? Apply for whitelist in <
-                inline=False
-            )
+        member_count = member.guild.member_count
 
-            embed.add_field(
-                name="🏠 Server Info",
-                value="Make sure to read the rules and have fun building in our community!",
-                inline=False
-            )
+        embed = discord.Embed(
+            title="🎉 Welcome to New Life SMP!",
+            description=f"Welcome {member.mention} to the New Life SMP! We are now at **{member_count}** members!",
+            color=discord.Color.green()
+        )
 
-            embed.set_thumbnail(url=member.display_avatar.url)
+        embed.add_field(
+            name="📝 Get Whitelisted",
+            value=f"Ready to join the server? Apply for whitelist in <
+            inline=False
+        )
 
-            embed.set_footer(
-                text=f"Member
-                icon_url=member.guild.icon.url if member.guild.icon else None
-            )
+        embed.add_field(
+            name="🏠 Server Info",
+            value="Make sure to read the rules and have fun building in our community!",
+            inline=False
+        )
 
-            await welcome_channel.send(embed=embed)
-            await bot_log(f"[Welcome] {member} joined the server.")
+        embed.set_thumbnail(url=member.display_avatar.url)
 
-            try:
-                role = member.guild.get_role(self.WELCOME_ROLE_ID)
-                if role:
-                    await member.add_roles(role)
-                    print(f"✅ Assigned role {role.name} to {member.display_name}")
-                else:
-                    print(f"❌ Welcome role {self.WELCOME_ROLE_ID} not found")
-            except discord.Forbidden:
-                print(f"❌ No permission to assign role to {member.display_name}")
-            except discord.HTTPException as e:
-                print(f"❌ Failed to assign role to {member.display_name}: {e}")
+        embed.set_footer(
+            text=f"Member
+            icon_url=member.guild.icon.url if member.guild.icon else None
+        )
 
-            await self.update_member_counter(member.guild)
+        await welcome_channel.send(embed=embed)
+        await bot_log(f"[Welcome] {member} joined the server.")
+        print(f"✅ Welcomed {member.display_name} ({member.id}) - Guild now has {member_count} members")
 
-            print(f"✅ Welcomed {member.display_name} ({member.id}) - Guild now has {member_count} members")
+    async def send_batch_welcome(self, members):
+        """Welcome a wave of members with one message"""
+        welcome_channel = self.bot.get_channel(self.WELCOME_CHANNEL_ID)
+        if not welcome_channel:
+            print(f"❌ Welcome channel {self.WELCOME_CHANNEL_ID} not found")
+            return
 
-        except Exception as e:
-            print(f"❌ Error in on_member_join: {e}")
-            await bot_log(f"[Welcome] Error in on_member_join: {e}")
+        guild = members[-1].guild
+        embed = discord.Embed(
+            title="🎉 Welcome to New Life SMP!",
+            description=(f"Welcome {', '.join(member.mention for member in members)} to the New Life SMP! "
+                         f"We are now at **{guild.member_count}** members!"),
+            color=discord.Color.green()
+        )
+        embed.add_field(
+            name="📝 Get Whitelisted",
+            value=f"Ready to join the server? Apply for whitelist in <#{self.WHITELIST_CHANNEL_ID}>!",
+            inline=False
+        )
+        if guild.icon:
+            embed.set_thumbnail(url=guild.icon.url)
+
+        await welcome_channel.send(embed=embed, allowed_mentions=discord.AllowedMentions(users=True, roles=False, everyone=False))
+        await bot_log(f"[Welcome] {len(members)} members joined: {', '.join(str(member) for member in members)}")
+        print(f"✅ Welcomed a wave of {len(members)} members - Guild now has {guild.member_count} members")
+
+    async def grant_welcome_role(self, member):
+        """Give a new member the welcome role"""
+        role = member.guild.get_role(self.WELCOME_ROLE_ID)
+        if not role:
+            print(f"❌ Welcome role {self.WELCOME_ROLE_ID} not found")
+            return
+        try:
+            await member.add_roles(role)
+            print(f"✅ Assigned role {role.name} to {member.display_name}")
+        except discord.Forbidden:
+            print(f"❌ No permission to assign role to {member.display_name}")
+        except discord.NotFound:
+            print(f"📤 {member.display_name} left before the welcome role was assigned")
 
     @commands.Cog.listener()
     async def on_member_remove(self, member):
         """Handle member leaves (update counter)"""
         try:
-            await self.update_member_counter(member.guild)
+            self.update_member_counter(member.guild)
 
             member_count = member.guild.member_count
             print(f"📤 {member.display_name} left - Guild now has {member_count} members")
@@ -89,27 +131,28 @@ class Welcome(commands.Cog):
             print(f"❌ Error in on_member_remove: {e}")
             await bot_log(f"[Welcome] Error in on_member_remove: {e}")
 
-    async def update_member_counter(self, guild):
-        """Update the member counter channel name"""
-        try:
-            member_counter_channel = guild.get_channel(self.MEMBER_COUNTER_CHANNEL_ID)
-            if not member_counter_channel:
-                print(f"❌ Member counter channel {self.MEMBER_COUNTER_CHANNEL_ID} not found")
-                return
+    def update_member_counter(self, guild):
+        """Queue a member counter rename; renames are limited to 2 per 10 minutes, so only the latest count is applied"""
+        self.counter_updater.submit((guild.id, guild.member_count))
 
-            member_count = guild.member_count
-            new_name = f"Members - {member_count}"
+    async def rename_member_counter(self, update):
+        """Rename the member counter channel to the latest count"""
+        guild_id, member_count = update
+        guild = self.bot.get_guild(guild_id)
+        member_counter_channel = guild.get_channel(self.MEMBER_COUNTER_CHANNEL_ID) if guild else None
+        if not member_counter_channel:
+            print(f"❌ Member counter channel {self.MEMBER_COUNTER_CHANNEL_ID} not found")
+            return False
 
-            if member_counter_channel.name != new_name:
-                await member_counter_channel.edit(name=new_name)
-                print(f"📊 Updated member counter to: {new_name}")
+        new_name = f"Members - {member_count}"
+        if member_counter_channel.name == new_name:
+            return False
 
+        try:
+            await member_counter_channel.edit(name=new_name)
+            print(f"📊 Updated member counter to: {new_name}")
         except discord.Forbidden:
             print(f"❌ No permission to edit member counter channel")
-        except discord.HTTPException as e:
-            print(f"❌ Failed to update member counter: {e}")
-        except Exception as e:
-            print(f"❌ Error updating member counter: {e}")
 
     @commands.command(name='test_welcome')
     @commands.has_permissions(administrator=True)
@@ -125,9 +168,13 @@ class Welcome(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def update_counter_command(self, ctx):
         """Manually update member counter (Admin only)"""
-        await self.update_member_counter(ctx.guild)
+        self.update_member_counter(ctx.guild)
         member_count = ctx.guild.member_count
-        await ctx.send(f"📊 Updated member counter to: **{member_count}** members")
+        wait = self.counter_updater.next_slot_in()
+        if wait > 0:
+            await ctx.send(f"📊 Member counter will update to **{member_count}** members in about {math.ceil(wait / 60)} minute(s) (rename rate limit)")
+        else:
+            await ctx.send(f"📊 Updated member counter to: **{member_count}** members")
 
     @commands.command(name='welcome_stats')
     @commands.has_permissions(manage_guild=True)
@@ -183,6 +230,18 @@ class Welcome(commands.Cog):
                 inline=True
             )
 
+        backlog = self.join_pipeline.backlog()
+        embed.add_field(
+            name="📥 Join Pipeline",
+            value=(f"**Mode:** {backlog['mode']} ({backlog['join_rate']} joins/min)\n"
+                   f"**Queued:** {backlog['welcome_queue']} welcome(s), {backlog['role_queue']} role grant(s)\n"
+                   f"**Lag:** welcome {backlog['welcome_lag']:.1f}s, roles {backlog['role_lag']:.1f}s\n"
+                   f"**Processed:** {backlog['welcomed']} welcomed in {backlog['batches']} batch(es), "
+                   f"{backlog['roles_granted']} role(s) granted, {backlog['role_failures']} failed, "
+                   f"{backlog['rate_limited']} rate limited"),
+            inline=False
+        )
+
         await ctx.send(embed=embed)
 
 async def setup(bot):
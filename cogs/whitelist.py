@@ -9,51 +9,67 @@ from datetime import datetime, timedelta
 from typing import Optional, cast
 from config import WHITELIST_PANEL_CHANNEL_ID, WHITELIST_CATEGORY_ID, WHITELIST_STAFF_ROLE_ID, WHITELIST_ROLE_ID, STAFF_LOG_CHANNEL_ID
 from bot import bot_log
+from supervisor import SUPERVISOR
+from docstore import DOCUMENTS
+from message_router import ROUTER
 
 class WhitelistCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.active_whitelist_tickets = {}
-        self.whitelist_panel_message_id = None
         self.pending_whitelist = {}
+        self.intake_paused = None
         self.panel_channel_id = WHITELIST_PANEL_CHANNEL_ID
         self.category_id = WHITELIST_CATEGORY_ID
         self.staff_role_id = WHITELIST_STAFF_ROLE_ID
         self.whitelist_role_id = WHITELIST_ROLE_ID
         self.staff_log_channel_id = STAFF_LOG_CHANNEL_ID
+        self.tickets_doc = DOCUMENTS.open("data/whitelist_tickets.json")
+        self.panel_doc = DOCUMENTS.open("data/whitelist_panel.json")
         self.load_whitelist_data()
 
+    @property
+    def active_whitelist_tickets(self) -> dict:
+        """Open whitelist tickets keyed by owner id; the document is the only copy"""
+        return self.tickets_doc.data
+
+    @property
+    def whitelist_panel_message_id(self):
+        return self.panel_doc.data.get("message_id")
+
     def load_whitelist_data(self):
-        """Load whitelist data from files"""
-        try:
-            with open("data/whitelist_tickets.json", "r") as f:
-                data = json.load(f)
-                self.active_whitelist_tickets = {}
-                for user_id, ticket_data in data.items():
-                    if isinstance(ticket_data, dict):
-                        self.active_whitelist_tickets[user_id] = ticket_data
-                    else:
-                        self.active_whitelist_tickets[user_id] = {
-                            "channel_id": ticket_data,
-                            "owner_id": int(user_id)
-                        }
-        except (FileNotFoundError, json.JSONDecodeError):
-            self.active_whitelist_tickets = {}
+        """Load whitelist data from files, upgrading bare channel ids to ticket records"""
+        tickets = self.tickets_doc.load_sync()
+        for user_id, ticket_data in list(tickets.items()):
+            if not isinstance(ticket_data, dict):
+                tickets[user_id] = {
+                    "channel_id": ticket_data,
+                    "owner_id": int(user_id)
+                }
+
+        self.panel_doc.load_sync()
+
+    async def save_ticket(self, user_id: int, channel_id: int):
+        """Record an open whitelist ticket in one document transaction"""
+        def apply(tickets):
+            tickets[str(user_id)] = {"channel_id": channel_id, "owner_id": user_id}
+
+        await self.tickets_doc.update(apply)
+
+    async def forget_ticket(self, user_id: Optional[int] = None, channel_id: Optional[int] = None):
+        """Drop a whitelist ticket by owner or by channel in one document transaction and return its record"""
+        def apply(tickets):
+            if user_id is not None:
+                return tickets.pop(str(user_id), None)
+            for owner_id, ticket_data in list(tickets.items()):
+                if ticket_data.get("channel_id") == channel_id:
+                    return tickets.pop(owner_id)
+            return None
 
-        try:
-            with open("data/whitelist_panel.json", "r") as f:
-                data = json.load(f)
-                self.whitelist_panel_message_id = data.get("message_id")
-        except (FileNotFoundError, json.JSONDecodeError):
-            self.whitelist_panel_message_id = None
-
-    def save_whitelist_data(self):
-        """Save whitelist data to files"""
-        os.makedirs("data", exist_ok=True)
-        with open("data/whitelist_tickets.json", "w") as f:
-            json.dump(self.active_whitelist_tickets, f, indent=2)
-        with open("data/whitelist_panel.json", "w") as f:
-            json.dump({"message_id": self.whitelist_panel_message_id}, f, indent=2)
+        return await self.tickets_doc.update(apply)
+
+    async def save_panel_message(self, message_id: Optional[int]):
+        """Save the whitelist panel message ID"""
+        await self.panel_doc.update(lambda data: data.__setitem__("message_id", message_id))
 
     async def cog_load(self):
         """Add persistent views when cog loads"""
@@ -61,10 +77,15 @@ class WhitelistCog(commands.Cog):
         self.bot.add_view(WhitelistCloseRequestView())
         self.bot.add_view(StaffWhitelistView())
 
-        await self.ensure_whitelist_panel()
+        SUPERVISOR.spawn(self.ensure_whitelist_panel_when_ready(), name="whitelist-panel", owner="WhitelistCog")
 
         print("Whitelist cog loaded and persistent views added")
 
+    async def ensure_whitelist_panel_when_ready(self):
+        """Wait for the channel cache before checking the whitelist panel"""
+        await self.bot.wait_until_ready()
+        await self.ensure_whitelist_panel()
+
     @commands.Cog.listener()
     async def on_ready(self):
         """Bot ready event"""
@@ -92,8 +113,7 @@ class WhitelistCog(commands.Cog):
                         panel_exists = False
             except discord.NotFound:
                 print("Stored whitelist panel message not found, will recreate")
-                self.whitelist_panel_message_id = None
-                self.save_whitelist_data()
+                await self.save_panel_message(None)
             except Exception as e:
                 print(f"Error checking whitelist panel: {e}")
 
@@ -140,8 +160,7 @@ class WhitelistCog(commands.Cog):
         view = WhitelistView()
         message = await whitelist_channel.send(embed=embed, view=view)
 
-        self.whitelist_panel_message_id = message.id
-        self.save_whitelist_data()
+        await self.save_panel_message(message.id)
         print("✔ Whitelist panel created and saved!")
 
     async def create_whitelist_ticket(self, interaction: discord.Interaction, application_data: dict):
@@ -152,9 +171,9 @@ class WhitelistCog(commands.Cog):
         if not guild:
             return
 
-        if user.id in self.active_whitelist_tickets:
-            ticket_data = self.active_whitelist_tickets[user.id]
-            existing_channel_id = ticket_data.get("channel_id") if isinstance(ticket_data, dict) else ticket_data
+        ticket_data = self.active_whitelist_tickets.get(str(user.id))
+        if ticket_data:
+            existing_channel_id = ticket_data.get("channel_id")
             if existing_channel_id:
                 existing_channel = guild.get_channel(existing_channel_id)
                 if existing_channel:
@@ -163,8 +182,7 @@ class WhitelistCog(commands.Cog):
                         ephemeral=True
                     )
                     return
-            del self.active_whitelist_tickets[user.id]
-            self.save_whitelist_data()
+            await self.forget_ticket(user.id)
 
         category = guild.get_channel(1387287352426106922)
         staff_role = guild.get_role(1376432927444963420)
@@ -188,11 +206,7 @@ class WhitelistCog(commands.Cog):
                 reason=f"Whitelist application by {user}"
             )
 
-            self.active_whitelist_tickets[user.id] = {
-                "channel_id": channel.id,
-                "owner_id": user.id
-            }
-            self.save_whitelist_data()
+            await self.save_ticket(user.id, channel.id)
 
             embed = discord.Embed(
                 title="📝 Minecraft Whitelist Application",
@@ -274,8 +288,7 @@ class WhitelistCog(commands.Cog):
                 return
 
             def check(message):
-                return (message.channel.id == 1374421938381783061 and
-                       message.author.id == 1381671096776003715 and
+                return (message.author.id == 1381671096776003715 and
                        (username_or_uuid.lower() in message.content.lower() or
                         "added" in message.content.lower() or
                         "whitelist" in message.content.lower() or
@@ -283,7 +296,7 @@ class WhitelistCog(commands.Cog):
                         "error" in message.content.lower()))
 
             try:
-                response = await self.bot.wait_for('message', timeout=30.0, check=check)
+                response = await ROUTER.wait_for(channel_id=1374421938381783061, check=check, timeout=30.0)
 
                 if ("added" in response.content.lower() and "whitelist" in response.content.lower()) or "successfully" in response.content.lower():
                     await self.handle_whitelist_success(user, platform, ticket_channel, username_or_uuid)
@@ -405,16 +418,7 @@ class WhitelistCog(commands.Cog):
         try:
             ticket_owner = await self.find_whitelist_ticket_owner(channel)
 
-            user_to_remove = None
-            for user_id, ticket_data in self.active_whitelist_tickets.items():
-                current_channel_id = ticket_data.get("channel_id") if isinstance(ticket_data, dict) else ticket_data
-                if current_channel_id == channel.id:
-                    user_to_remove = user_id
-                    break
-
-            if user_to_remove:
-                del self.active_whitelist_tickets[user_to_remove]
-                self.save_whitelist_data()
+            await self.forget_ticket(channel_id=channel.id)
 
             await bot_log(f"[Whitelist] Ticket closed for {ticket_owner} in {channel} by {reason}")
 
@@ -435,6 +439,10 @@ class WhitelistView(ui.View):
     @ui.button(label='Apply', style=discord.ButtonStyle.success, custom_id='whitelist_apply')
     async def apply_button(self, interaction: discord.Interaction, button: ui.Button):
         """Open whitelist application form"""
+        whitelist_cog = interaction.client.get_cog('WhitelistCog')
+        if whitelist_cog and whitelist_cog.intake_paused:
+            await interaction.response.send_message(f"⏸️ Whitelist applications are temporarily paused ({whitelist_cog.intake_paused}). Please try again later.", ephemeral=True)
+            return
         modal = WhitelistApplicationModal()
         await interaction.response.send_modal(modal)
 
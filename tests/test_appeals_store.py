@@ -0,0 +1,32 @@
+import asyncio
+
+from appeals_store import STATUS_APPROVED, AppealsStore
+from docstore import DocumentStore
+
+def make_store(tmp_path):
+    return AppealsStore(DocumentStore(str(tmp_path / "appeals.json"),
+                                      default=lambda: {"appeals": [], "next_appeal_number": 1}))
+
+def test_simultaneous_submits_for_one_case_create_a_single_appeal(tmp_path):
+    async def scenario():
+        store = make_store(tmp_path)
+        results = await asyncio.gather(*(store.create(case_number=7, user_id=42, appeal_reason=f"try {i}") for i in range(5)))
+        other_user = await store.create(case_number=7, user_id=43)
+        return store, results, other_user
+
+    store, results, other_user = asyncio.run(scenario())
+    assert sum(created for _, created in results) == 1
+    assert {appeal["appeal_number"] for appeal, _ in results} == {1}
+    assert other_user[1] and other_user[0]["appeal_number"] == 2
+    assert len(store.pending()) == 2
+
+def test_decided_appeal_does_not_block_a_new_one(tmp_path):
+    async def scenario():
+        store = make_store(tmp_path)
+        first, _ = await store.create(case_number=7, user_id=42)
+        await store.transition(first["appeal_number"], STATUS_APPROVED)
+        return await store.create(case_number=7, user_id=42)
+
+    appeal, created = asyncio.run(scenario())
+    assert created
+    assert appeal["appeal_number"] == 2
@@ -0,0 +1,50 @@
+import pytest
+
+from case_index import CaseIndex, CaseQuery
+
+def make_case(number, day, target_id=100, reason="griefing"):
+    return {
+        "case_number": number,
+        "moderator_id": 1,
+        "moderator_name": "alice",
+        "target_id": target_id,
+        "target_name": f"player{target_id}",
+        "type": "Warn",
+        "reason": reason,
+        "timestamp": f"{day}T12:00:00",
+    }
+
+@pytest.fixture
+def index():
+    return CaseIndex([
+        make_case(1, "2026-01-01"),
+        make_case(2, "2026-01-02"),
+        make_case(3, "2026-01-02"),
+        make_case(4, "2026-01-03"),
+    ])
+
+def numbers(cases):
+    return [case["case_number"] for case in cases]
+
+def test_before_is_exclusive_and_after_inclusive(index):
+    assert numbers(index.search("before:2026-01-02")) == [1]
+    assert numbers(index.search("after:2026-01-02")) == [4, 3, 2]
+    assert numbers(index.search("after:2026-01-01 before:2026-01-03")) == [3, 2, 1]
+
+def test_on_matches_exactly_one_day(index):
+    assert numbers(index.search("on:2026-01-02")) == [3, 2]
+    assert numbers(index.search("on:2026-01-04")) == []
+
+def test_case_number_must_be_numeric():
+    assert CaseQuery.parse("case:#12 id:7").numbers == [12, 7]
+    with pytest.raises(ValueError, match="not a case number"):
+        CaseQuery.parse("case:abc")
+
+def test_purge_cases_are_found_by_every_author_they_removed(index):
+    purge = make_case(5, "2026-01-03", target_id=None, reason="Purged 40 message(s)")
+    purge["target_ids"] = [200, 300]
+    index.add(purge)
+    assert numbers(index.search("200")) == [5]
+    assert numbers(index.search("300")) == [5]
+    index.remove(5)
+    assert index.search("200") == []
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+import checkpoint
+import docstore
+from checkpoint import Checkpointer
+from docstore import DocumentRegistry
+
+def restart(monkeypatch):
+    """Simulate a fresh process: nothing survives but what is on disk"""
+    monkeypatch.setattr(checkpoint, "DOCUMENTS", DocumentRegistry())
+
+def test_crash_during_write_recovers_last_flushed_state(tmp_path, monkeypatch):
+    path = str(tmp_path / "vote_state.json")
+    restart(monkeypatch)
+
+    async def before_crash():
+        cursor = Checkpointer(path, flush_every=2)
+        cursor.update("mc:25575", last_seq=10)
+        await cursor.flush()
+        cursor.update("mc:25575", last_seq=20)
+
+        def crash(src, dst):
+            raise OSError("power lost before rename")
+
+        with monkeypatch.context() as patched:
+            patched.setattr(docstore.os, "replace", crash)
+            with pytest.raises(OSError):
+                await cursor.flush()
+
+    asyncio.run(before_crash())
+    assert os.path.exists(f"{path}.tmp")
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"mc:25575": {"last_seq": 10}}
+
+    restart(monkeypatch)
+    recovered = Checkpointer(path)
+    assert recovered.get("mc:25575", "last_seq") == 10
+    assert not recovered.dirty
+
+def test_torn_leftover_temp_file_is_ignored_and_replaced(tmp_path, monkeypatch):
+    path = str(tmp_path / "vote_state.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"mc:25575": {"last_seq": 5}}, f)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        f.write('{"mc:25575": {"last_se')
+    restart(monkeypatch)
+
+    async def resume():
+        cursor = Checkpointer(path)
+        assert cursor.get("mc:25575", "last_seq") == 5
+        cursor.update("mc:25575", last_seq=6)
+        await cursor.flush()
+
+    asyncio.run(resume())
+    assert not os.path.exists(f"{path}.tmp")
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"mc:25575": {"last_seq": 6}}
+
+@pytest.mark.parametrize("flush_every, processed", [(100, 120), (50, 120), (50, 249), (10, 10)])
+def test_crash_without_shutdown_flush_reprocesses_at_most_flush_every(tmp_path, monkeypatch, flush_every, processed):
+    path = str(tmp_path / "vote_state.json")
+    restart(monkeypatch)
+
+    async def process_then_crash():
+        cursor = Checkpointer(path, flush_interval=3600, flush_every=flush_every)
+        for seq in range(1, processed + 1):
+            cursor.update("mc:25575", last_seq=seq)
+            await cursor.maybe_flush()
+        # the process dies here: no shutdown flush
+
+    asyncio.run(process_then_crash())
+    restart(monkeypatch)
+    recovered = Checkpointer(path).get("mc:25575", "last_seq", 0)
+    assert recovered <= processed
+    assert processed - recovered <= flush_every
+    assert processed - recovered == processed % flush_every
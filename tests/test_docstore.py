@@ -0,0 +1,152 @@
+import asyncio
+import json
+
+import pytest
+
+from docstore import DocumentRegistry, DocumentStore
+from perf import TRACKER
+
+def read_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def test_parallel_updates_coalesce_into_few_writes(tmp_path):
+    path = tmp_path / "counter.json"
+
+    async def scenario():
+        document = DocumentStore(str(path), default=lambda: {"count": 0})
+
+        def increment(data):
+            data["count"] += 1
+            return data["count"]
+
+        results = await asyncio.gather(*(document.update(increment) for _ in range(1000)))
+        return document, results
+
+    document, results = asyncio.run(scenario())
+    assert sorted(results) == list(range(1, 1001))
+    assert read_json(path) == {"count": 1000}
+    assert document.writes <= 3
+
+def test_failing_change_is_rolled_back_and_others_still_land(tmp_path):
+    path = tmp_path / "cases.json"
+
+    async def scenario():
+        document = DocumentStore(str(path), default=lambda: {"cases": []})
+        await document.update(lambda data: data["cases"].append(1))
+
+        def half_applied(data):
+            data["cases"].append("partial")
+            raise RuntimeError("boom")
+
+        outcomes = await asyncio.gather(
+            document.update(lambda data: data["cases"].append(2)),
+            document.update(half_applied),
+            document.update(lambda data: data["cases"].append(3)),
+            return_exceptions=True,
+        )
+        return document, outcomes
+
+    document, outcomes = asyncio.run(scenario())
+    assert outcomes[0] is None and outcomes[2] is None
+    assert isinstance(outcomes[1], RuntimeError)
+    assert document.data == {"cases": [1, 2, 3]}
+    assert read_json(path) == {"cases": [1, 2, 3]}
+    assert document.rollbacks == 1
+
+def test_failed_write_fails_callers_and_is_not_kept(tmp_path, monkeypatch):
+    path = tmp_path / "appeals.json"
+
+    async def scenario():
+        document = DocumentStore(str(path), default=lambda: {"appeals": []})
+        await document.update(lambda data: data["appeals"].append("saved"))
+        generation = document.generation
+
+        def broken_write(data):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(document, "_write_atomic", broken_write)
+        with pytest.raises(OSError):
+            await document.update(lambda data: data["appeals"].append("lost"))
+        assert document.data == {"appeals": ["saved"]}
+        assert document.generation > generation
+
+        monkeypatch.undo()
+        await document.update(lambda data: data["appeals"].append("next"))
+        return document
+
+    document = asyncio.run(scenario())
+    assert read_json(path) == {"appeals": ["saved", "next"]}
+
+def test_flush_all_writes_queued_replacements(tmp_path):
+    registry = DocumentRegistry()
+
+    async def scenario():
+        for index in range(5):
+            registry.open(str(tmp_path / f"doc{index}.json")).replace_nowait({"index": index})
+        await registry.flush_all()
+
+    asyncio.run(scenario())
+    assert [read_json(tmp_path / f"doc{index}.json") for index in range(5)] == [{"index": index} for index in range(5)]
+
+def test_refresh_picks_up_outside_edits(tmp_path):
+    path = tmp_path / "terms.json"
+    path.write_text(json.dumps({"terms": {}}))
+
+    async def scenario():
+        document = DocumentStore(str(path))
+        await document.load()
+        generation = document.generation
+        assert not await document.refresh_if_changed(0)
+        path.write_text(json.dumps({"terms": {"spam": "delete"}}))
+        assert await document.refresh_if_changed(0)
+        return document, generation
+
+    document, generation = asyncio.run(scenario())
+    assert document.data == {"terms": {"spam": "delete"}}
+    assert document.generation == generation + 1
+
+def test_disk_time_is_charged_to_the_callers_span_not_the_actor(tmp_path):
+    async def scenario():
+        store = DocumentStore(str(tmp_path / "spans.json"), default=dict)
+        await store.load()
+        with TRACKER.span("first"):
+            first = TRACKER.current()
+            await store.update(lambda data: data.__setitem__("a", 1))
+            first_disk = first.spent["disk"]
+        with TRACKER.span("second"):
+            second = TRACKER.current()
+            await store.update(lambda data: data.__setitem__("b", 2))
+        return first, first_disk, second
+
+    first, first_disk, second = asyncio.run(scenario())
+    assert first_disk > 0
+    assert second.spent["disk"] > 0
+    assert first.spent["disk"] == first_disk
+
+def test_same_basename_in_different_folders_gets_separate_writers(tmp_path):
+    first = tmp_path / "a" / "settings.json"
+    second = tmp_path / "b" / "settings.json"
+
+    async def scenario():
+        registry = DocumentRegistry()
+        await registry.open(str(first)).update(lambda data: data.__setitem__("folder", "a"))
+        await registry.open(str(second)).update(lambda data: data.__setitem__("folder", "b"))
+        await registry.open(str(first)).update(lambda data: data.__setitem__("again", True))
+
+    asyncio.run(scenario())
+    assert read_json(first) == {"folder": "a", "again": True}
+    assert read_json(second) == {"folder": "b"}
+
+def test_writer_crash_fails_the_batch_instead_of_leaving_callers_waiting(tmp_path):
+    async def scenario():
+        document = DocumentStore(str(tmp_path / "crash.json"), default=dict)
+
+        async def broken_load():
+            raise RuntimeError("disk vanished")
+
+        document.load = broken_load
+        with pytest.raises(RuntimeError, match="disk vanished"):
+            await asyncio.wait_for(document.update(lambda data: data.__setitem__("a", 1)), timeout=2)
+
+    asyncio.run(scenario())
@@ -0,0 +1,55 @@
+import asyncio
+
+from join_pipeline import JoinPipeline
+from supervisor import SUPERVISOR
+
+class RateLimited(Exception):
+    status = 429
+
+    def __init__(self, retry_after):
+        super().__init__("You are being rate limited.")
+        self.retry_after = retry_after
+
+def run_roles(grant_role, members, **options):
+    async def scenario():
+        async def welcome(_):
+            pass
+
+        pipeline = JoinPipeline("test-joins", welcome, welcome, grant_role, owner="test", role_concurrency=1, **options)
+        pipeline.start()
+        for member in members:
+            pipeline.submit(member)
+        while pipeline.role_queue.qsize() or pipeline.stats["roles_granted"] + pipeline.stats["role_failures"] < len(members):
+            await asyncio.sleep(0.01)
+        SUPERVISOR.cancel_owner("test")
+        return pipeline
+
+    return asyncio.run(scenario())
+
+def test_rate_limited_member_is_retried_in_place_after_the_pause():
+    granted = []
+    limited = {"bob"}
+
+    async def grant_role(member):
+        if member in limited:
+            limited.discard(member)
+            raise RateLimited(0.05)
+        granted.append(member)
+
+    pipeline = run_roles(grant_role, ["alice", "bob", "carol", "dave"])
+    assert granted == ["alice", "bob", "carol", "dave"]
+    assert pipeline.stats["rate_limited"] == 1
+    assert pipeline.stats["role_failures"] == 0
+
+def test_member_that_stays_rate_limited_gives_up_after_role_attempts():
+    attempts = []
+
+    async def grant_role(member):
+        attempts.append(member)
+        if member == "bob":
+            raise RateLimited(0.01)
+
+    pipeline = run_roles(grant_role, ["bob", "carol"], role_attempts=3)
+    assert attempts == ["bob", "bob", "bob", "carol"]
+    assert pipeline.stats["role_failures"] == 1
+    assert pipeline.stats["roles_granted"] == 1
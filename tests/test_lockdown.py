@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+import pytest
+
+discord = pytest.importorskip("discord")
+
+from lockdown import LOCKED_PERMISSIONS, already_locked, locked_overwrite, run_bounded, snapshot_overwrite, stored_overwrite
+
+class FakeChannel:
+    def __init__(self, overwrites=None):
+        self.overwrites = dict(overwrites or {})
+
+EVERYONE = object()
+
+def round_trip(channel):
+    """Snapshot through JSON the way the lockdown state file stores it"""
+    return json.loads(json.dumps(snapshot_overwrite(channel, EVERYONE)))
+
+def test_channel_without_an_overwrite_is_locked_then_restored_to_none():
+    entry = round_trip(FakeChannel())
+    assert entry == {"existed": False, "allow": 0, "deny": 0}
+    assert not already_locked(entry)
+
+    locked = locked_overwrite(entry)
+    assert all(getattr(locked, name) is False for name in LOCKED_PERMISSIONS)
+    assert locked.view_channel is None
+    assert stored_overwrite(entry) is None
+
+def test_existing_allow_deny_pair_survives_the_lock_and_is_restored_exactly():
+    original = discord.PermissionOverwrite(view_channel=True, send_messages=True, attach_files=False)
+    entry = round_trip(FakeChannel({EVERYONE: original}))
+    assert entry["existed"]
+    assert not already_locked(entry)
+
+    locked = locked_overwrite(entry)
+    assert all(getattr(locked, name) is False for name in LOCKED_PERMISSIONS)
+    assert locked.view_channel is True
+    assert locked.attach_files is False
+
+    restored = stored_overwrite(entry)
+    assert restored.pair() == original.pair()
+
+def test_already_locked_channel_is_detected_and_left_as_it_was():
+    original = discord.PermissionOverwrite(view_channel=True, **{name: False for name in LOCKED_PERMISSIONS})
+    entry = round_trip(FakeChannel({EVERYONE: original}))
+    assert already_locked(entry)
+    assert locked_overwrite(entry).pair() == original.pair()
+    assert stored_overwrite(entry).pair() == original.pair()
+
+def test_run_bounded_caps_concurrency_and_collects_failures():
+    in_flight = 0
+    peak = 0
+
+    async def edit(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await asyncio.sleep(0.005)
+            if item % 7 == 0:
+                raise RuntimeError(f"channel {item} missing")
+        finally:
+            in_flight -= 1
+
+    results = asyncio.run(run_bounded(range(20), edit, concurrency=3))
+    assert peak == 3
+    assert sorted(results["done"]) == [item for item in range(20) if item % 7]
+    assert [item for item, _ in sorted(results["failed"], key=lambda failure: failure[0])] == [0, 7, 14]
+    assert all(isinstance(error, RuntimeError) for _, error in results["failed"])
+
+def test_run_bounded_throttles_progress_and_always_reports_the_end():
+    async def edit(item):
+        await asyncio.sleep(0)
+        if item == 3:
+            raise RuntimeError("forbidden")
+
+    def collect(interval):
+        reports = []
+
+        async def progress(done, failed, total):
+            reports.append((done, failed, total))
+
+        asyncio.run(run_bounded(range(10), edit, concurrency=2, progress=progress, progress_interval=interval))
+        return reports
+
+    assert collect(3600) == [(9, 1, 10)]
+    every_item = collect(0)
+    assert len(every_item) == 11
+    assert every_item[-1] == (9, 1, 10)
@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("discord")
+
+from member_cache import MODE_FULL, MODE_LAZY, MODE_STAFF, benchmark
+
+def test_full_mode_serves_every_lookup_from_the_chunked_cache():
+    result = benchmark(MODE_FULL, member_count=50000, lookups=5000)
+    assert result["cached"] == 50000
+    assert result["gateway_requests"] == 0
+    assert result["rest_requests"] == 0
+
+def test_staff_mode_keeps_the_cache_bounded_over_a_50k_member_gateway():
+    result = benchmark(MODE_STAFF, member_count=50000, lookups=20000, active=2000, max_pinned=1000)
+    assert result["pinned"] == 1000
+    assert result["cached"] <= 1000 + 50
+    assert result["rest_requests"] == 0
+
+def test_lazy_mode_only_requests_each_member_once():
+    result = benchmark(MODE_LAZY, member_count=50000, lookups=20000)
+    assert result["gateway_requests"] == result["cached"] - 50 + 1
+
+def test_staff_and_lazy_startup_stay_below_full_chunking():
+    full = benchmark(MODE_FULL, member_count=50000, lookups=100)
+    assert full["chunk_requests"] == 50
+    for mode in (MODE_STAFF, MODE_LAZY):
+        result = benchmark(mode, member_count=50000, lookups=100)
+        assert result["chunk_requests"] == 0
+        assert result["startup_kib"] < full["startup_kib"] / 10
+        assert result["startup_ms"] < full["startup_ms"]
@@ -0,0 +1,38 @@
+import asyncio
+
+from memory_stats import deep_sizeof, deep_sizeof_sliced, object_state_sizes, object_state_sizes_sliced
+
+class Holder:
+    def __init__(self):
+        self.cases = {i: {"reason": f"reason {i}", "tags": [i, i + 1]} for i in range(20000)}
+        self.small = [1, 2, 3]
+
+def test_sliced_walk_matches_blocking_walk_and_yields_to_the_loop():
+    holder = Holder()
+
+    async def scenario():
+        ticks = 0
+        stop = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not stop.is_set():
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        sized = await deep_sizeof_sliced(holder.cases, slice_seconds=0.001)
+        stop.set()
+        await task
+        return sized, ticks
+
+    sized, ticks = asyncio.run(scenario())
+    assert sized == deep_sizeof(holder.cases)
+    assert ticks > 1
+
+def test_walks_stop_at_the_object_cap():
+    holder = Holder()
+    total, truncated = asyncio.run(deep_sizeof_sliced(holder.cases, max_objects=1000))
+    assert truncated
+    assert total < deep_sizeof(holder.cases)[0]
+    assert asyncio.run(object_state_sizes_sliced(holder))["small"] == object_state_sizes(holder)["small"]
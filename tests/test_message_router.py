@@ -0,0 +1,121 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from message_router import ANY_WEBHOOK, MessageRouter
+
+def make_message(channel_id=1, webhook_id=None, bot=False, title=None):
+    embeds = [SimpleNamespace(title=title)] if title is not None else []
+    return SimpleNamespace(channel=SimpleNamespace(id=channel_id), webhook_id=webhook_id,
+                           author=SimpleNamespace(bot=bot), embeds=embeds)
+
+def recorder(router, name, **keys):
+    received = []
+
+    async def handler(message):
+        received.append(message)
+
+    router.route(name, handler, **keys)
+    return received
+
+def test_unrouted_message_returns_before_any_route_runs():
+    router = MessageRouter()
+    received = recorder(router, "support", channel_id=10)
+    assert asyncio.run(router.dispatch(make_message(channel_id=99, webhook_id=5))) == 0
+    assert (router.seen, router.unrouted) == (1, 1)
+    assert received == []
+
+def test_channel_webhook_and_any_webhook_routes():
+    router = MessageRouter()
+    by_channel = recorder(router, "channel", channel_id=10)
+    by_webhook = recorder(router, "webhook", webhook=77)
+    any_webhook = recorder(router, "any", webhook=ANY_WEBHOOK)
+
+    async def scenario():
+        assert await router.dispatch(make_message(channel_id=10)) == 1
+        assert await router.dispatch(make_message(channel_id=20, webhook_id=77)) == 2
+        assert await router.dispatch(make_message(channel_id=20, webhook_id=88)) == 1
+        assert await router.dispatch(make_message(channel_id=10, webhook_id=88)) == 2
+
+    asyncio.run(scenario())
+    assert len(by_channel) == 2
+    assert len(by_webhook) == 1
+    assert len(any_webhook) == 3
+    assert router.unrouted == 0
+
+def test_webhook_keyed_channel_route_ignores_plain_messages():
+    router = MessageRouter()
+    received = recorder(router, "votes", channel_id=10, webhook=ANY_WEBHOOK)
+    asyncio.run(router.dispatch(make_message(channel_id=10)))
+    asyncio.run(router.dispatch(make_message(channel_id=10, webhook_id=3)))
+    assert len(received) == 1
+
+def test_titles_match_as_substrings_of_the_first_embed():
+    router = MessageRouter()
+    received = recorder(router, "link", webhook=ANY_WEBHOOK, titles=("Link Request",))
+
+    async def scenario():
+        await router.dispatch(make_message(webhook_id=1, title="📥 New Link Request"))
+        await router.dispatch(make_message(webhook_id=1, title="Vote received"))
+        await router.dispatch(make_message(webhook_id=1, title=None))
+        await router.dispatch(make_message(webhook_id=1, title=""))
+
+    asyncio.run(scenario())
+    assert [message.embeds[0].title for message in received] == ["📥 New Link Request"]
+
+def test_bots_filter():
+    router = MessageRouter()
+    bots_only = recorder(router, "bots", channel_id=10, bots=True)
+    humans_only = recorder(router, "humans", channel_id=10, bots=False)
+    either = recorder(router, "either", channel_id=10)
+
+    async def scenario():
+        await router.dispatch(make_message(channel_id=10, bot=True))
+        await router.dispatch(make_message(channel_id=10, bot=False))
+
+    asyncio.run(scenario())
+    assert [message.author.bot for message in bots_only] == [True]
+    assert [message.author.bot for message in humans_only] == [False]
+    assert len(either) == 2
+
+def test_failing_handler_only_counts_an_error():
+    router = MessageRouter()
+
+    async def broken(message):
+        raise RuntimeError("boom")
+
+    failing = router.route("broken", broken, channel_id=10)
+    received = recorder(router, "healthy", channel_id=10)
+    assert asyncio.run(router.dispatch(make_message(channel_id=10))) == 2
+    assert (failing.delivered, failing.errors) == (1, 1)
+    assert len(received) == 1
+    assert router.routes["healthy"].errors == 0
+
+def test_wait_for_resolves_with_the_matching_message_and_unregisters():
+    router = MessageRouter()
+
+    async def scenario():
+        waiter = asyncio.create_task(router.wait_for(channel_id=10, check=lambda message: message.author.bot, timeout=1))
+        await asyncio.sleep(0)
+        assert router.by_channel[10]
+        await router.dispatch(make_message(channel_id=10, bot=False))
+        assert not waiter.done()
+        wanted = make_message(channel_id=10, bot=True)
+        await router.dispatch(wanted)
+        assert await waiter is wanted
+
+    asyncio.run(scenario())
+    assert router.by_channel == {}
+    assert router.routes == {}
+
+def test_wait_for_times_out_and_unregisters():
+    router = MessageRouter()
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await router.wait_for(webhook=ANY_WEBHOOK, timeout=0.01)
+
+    asyncio.run(scenario())
+    assert router.by_webhook == {}
+    assert asyncio.run(router.dispatch(make_message(webhook_id=1))) == 0
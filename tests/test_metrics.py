@@ -0,0 +1,55 @@
+from metrics import MetricsRegistry, scrape_allowed
+
+def test_labels_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("newlife_test_total", "Test counter", ("route",)).inc('say "hi"\\\nbye')
+    assert 'newlife_test_total{route="say \\"hi\\"\\\\\\nbye"} 1' in registry.render().splitlines()
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("newlife_test_seconds", "Test histogram", ("command",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "ping")
+    histogram.labels("ping").observe(0.5)
+    histogram.observe(3, "ping")
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP newlife_test_seconds Test histogram", "# TYPE newlife_test_seconds histogram"]
+    assert lines[2:] == [
+        'newlife_test_seconds_bucket{command="ping",le="0.1"} 1',
+        'newlife_test_seconds_bucket{command="ping",le="1"} 2',
+        'newlife_test_seconds_bucket{command="ping",le="+Inf"} 3',
+        'newlife_test_seconds_sum{command="ping"} 3.55',
+        'newlife_test_seconds_count{command="ping"} 3',
+    ]
+
+def test_callback_gauges_skip_none_and_errors():
+    registry = MetricsRegistry()
+    value = None
+    registry.gauge("newlife_test_open", "Test gauge", fn=lambda: value)
+
+    def broken():
+        raise RuntimeError("cog unloaded")
+
+    registry.gauge("newlife_test_broken", "Broken gauge", fn=broken)
+    lines = registry.render().splitlines()
+    assert not any(line.startswith(("newlife_test_open ", "newlife_test_broken ")) for line in lines)
+    assert "# TYPE newlife_test_open gauge" in lines
+
+    value = 4
+    assert "newlife_test_open 4" in registry.render().splitlines()
+
+def test_unlabelled_counter_renders_zero_before_first_increment():
+    registry = MetricsRegistry()
+    registry.counter("newlife_test_events_total", "Test events")
+    assert registry.render().splitlines()[-1] == "newlife_test_events_total 0"
+
+def test_scrapes_need_an_allowed_address_and_the_token_when_one_is_set():
+    assert scrape_allowed("127.0.0.1", None)
+    assert not scrape_allowed("203.0.113.9", None)
+    assert scrape_allowed("203.0.113.9", None, allowed_ips=("*",))
+
+    assert scrape_allowed("127.0.0.1", "Bearer s3cret", "s3cret")
+    assert scrape_allowed("::1", "bearer s3cret", "s3cret")
+    assert not scrape_allowed("127.0.0.1", None, "s3cret")
+    assert not scrape_allowed("127.0.0.1", "Bearer wrong", "s3cret")
+    assert not scrape_allowed("127.0.0.1", "s3cret", "s3cret")
+    assert not scrape_allowed("203.0.113.9", "Bearer s3cret", "s3cret")
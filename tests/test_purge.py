@@ -0,0 +1,131 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("discord")
+
+import purge
+from purge import PurgeFilter, purge_messages
+
+class FakeAuthor:
+    def __init__(self, author_id):
+        self.id = author_id
+        self.bot = False
+
+class FakeMessage:
+    def __init__(self, message_id, author_id, age):
+        self.id = message_id
+        self.author = FakeAuthor(author_id)
+        self.created_at = datetime.now(timezone.utc) - age
+        self.content = "spam"
+        self.attachments = []
+        self.pinned = False
+        self.channel = None
+
+    async def delete(self):
+        self.channel.single.append(self.id)
+
+class FakeChannel:
+    def __init__(self, messages):
+        self.messages = messages
+        self.scanned = 0
+        self.bulk = []
+        self.single = []
+        for message in messages:
+            message.channel = self
+
+    async def history(self, limit, before=None, after=None, oldest_first=False):
+        for message in self.messages[:limit]:
+            self.scanned += 1
+            yield message
+
+    async def delete_messages(self, messages):
+        assert 2 <= len(messages) <= purge.BULK_DELETE_MAX
+        self.bulk.append([message.id for message in messages])
+
+YOUNG = timedelta(days=1)
+OLD = timedelta(days=30)
+
+def run(channel, purge_filter, **kwargs):
+    return asyncio.run(purge_messages(channel, purge_filter, **kwargs))
+
+@pytest.fixture(autouse=True)
+def no_single_delete_wait(monkeypatch):
+    monkeypatch.setattr(purge, "SINGLE_DELETE_INTERVAL", 0)
+
+def test_progress_is_throttled_and_authors_are_listed():
+    messages = [FakeMessage(1000 - i, 200 + i % 3, OLD) for i in range(50)]
+    calls = []
+
+    async def progress(deleted, scanned):
+        calls.append(deleted)
+
+    manifest = asyncio.run(purge_messages(FakeChannel(messages), PurgeFilter(limit=50), progress=progress))
+    assert manifest["single"] == 50
+    assert calls == []
+    assert manifest["author_ids"] == [200, 201, 202]
+
+    calls.clear()
+    asyncio.run(purge_messages(FakeChannel(messages), PurgeFilter(limit=50), progress=progress, progress_interval=0))
+    assert len(calls) == 50
+
+def test_young_messages_are_bulk_deleted_in_batches_of_at_most_100():
+    channel = FakeChannel([FakeMessage(1000 - i, 200, YOUNG) for i in range(250)])
+    manifest = run(channel, PurgeFilter(limit=250))
+    assert [len(batch) for batch in channel.bulk] == [100, 100, 50]
+    assert channel.single == []
+    assert manifest["bulk"] == manifest["deleted"] == 250
+    assert (manifest["first_id"], manifest["last_id"]) == (751, 1000)
+
+def test_a_single_young_message_is_deleted_directly():
+    channel = FakeChannel([FakeMessage(1000, 200, YOUNG)])
+    manifest = run(channel, PurgeFilter(limit=5))
+    assert channel.bulk == []
+    assert channel.single == [1000]
+    assert manifest["deleted"] == 1
+
+def test_young_messages_go_in_bulk_and_old_ones_one_at_a_time():
+    ages = [YOUNG, OLD, YOUNG, YOUNG, OLD]
+    channel = FakeChannel([FakeMessage(1000 - i, 200, age) for i, age in enumerate(ages)])
+    manifest = run(channel, PurgeFilter(limit=10))
+    assert channel.bulk == [[1000, 998, 997]]
+    assert channel.single == [999, 996]
+    assert (manifest["bulk"], manifest["single"], manifest["deleted"]) == (3, 2, 5)
+
+def test_scan_stops_once_the_limit_is_matched():
+    messages = [FakeMessage(1000 - i, 200 if i % 2 else 300, YOUNG) for i in range(100)]
+    channel = FakeChannel(messages)
+    manifest = run(channel, PurgeFilter(limit=10, user_ids=[200]))
+    assert manifest["deleted"] == 10
+    assert manifest["scanned"] == channel.scanned == 20
+    assert manifest["author_ids"] == [200]
+
+def test_scan_limit_bounds_history_even_without_enough_matches():
+    channel = FakeChannel([FakeMessage(1000 - i, 300, YOUNG) for i in range(100)])
+    manifest = run(channel, PurgeFilter(limit=10, user_ids=[200]), scan_limit=40)
+    assert channel.scanned == 40
+    assert manifest["deleted"] == 0
+
+def test_pinned_messages_are_skipped():
+    messages = [FakeMessage(1000 - i, 200, YOUNG) for i in range(5)]
+    messages[1].pinned = messages[3].pinned = True
+    channel = FakeChannel(messages)
+    manifest = run(channel, PurgeFilter(limit=5))
+    assert channel.bulk == [[1000, 998, 996]]
+    assert manifest["deleted"] == 3
+
+def test_filter_parses_every_option():
+    purge_filter = PurgeFilter.parse('25 user:<@123456789012345678> contains:"free nitro" regex:^gg bots attachments after:42')
+    assert purge_filter.limit == 25
+    assert purge_filter.user_ids == [123456789012345678]
+    assert purge_filter.contains == "free nitro"
+    assert purge_filter.pattern.search("GG ez")
+    assert purge_filter.bots and purge_filter.attachments
+    assert purge_filter.after == 42
+    assert PurgeFilter.parse("").limit == 100
+
+@pytest.mark.parametrize("text", ["regex:(unclosed", "user:", "user:someone", "0", "1001", "sideways", "after:soon"])
+def test_filter_rejects_bad_options(text):
+    with pytest.raises(ValueError):
+        PurgeFilter.parse(text)
@@ -0,0 +1,59 @@
+from raid_detector import DAY, WEEK, RaidDetector, synthetic_joins
+
+OLD = 2 * 365 * DAY
+
+def replay(detector, joins):
+    """Feed joins in order and return (time, reasons) for each one that tripped a threshold"""
+    return [(now, reasons) for now, age, avatar in joins
+            for reasons in [detector.record(now, age, avatar)] if reasons]
+
+def test_normal_traffic_never_triggers():
+    detector = RaidDetector()
+    assert replay(detector, synthetic_joins(per_minute=5, duration=6 * 3600, seed=3)) == []
+    assert detector.last_trigger is None
+
+def test_synthetic_raid_triggers_within_seconds():
+    detector = RaidDetector()
+    joins = synthetic_joins(per_minute=500, duration=120, young_fraction=0.9, no_avatar_fraction=0.9, start=1000.0, seed=7)
+    triggers = replay(detector, joins)
+    assert triggers[0][0] - 1000.0 < 3.0
+    assert any("joins in 10s" in reason for _, found in triggers for reason in found)
+    assert any("younger than 7 days" in reason for _, found in triggers for reason in found)
+    assert any("without an avatar" in reason for _, found in triggers for reason in found)
+
+def test_ten_second_threshold_is_exact():
+    detector = RaidDetector(joins_10s=10, joins_60s=1000)
+    joins = [(100.0 + i * 0.5, OLD, True) for i in range(10)]
+    for now, age, avatar in joins[:9]:
+        assert detector.record(now, age, avatar) == []
+    assert detector.record(*joins[9]) == ["10 joins in 10s"]
+
+def test_sixty_second_threshold_catches_a_slower_steady_raid():
+    detector = RaidDetector(joins_10s=10, joins_60s=30)
+    triggers = replay(detector, [(i * 1.6, OLD, True) for i in range(40)])
+    assert triggers
+    _, reasons = triggers[0]
+    assert reasons == ["30 joins in 60s"]
+    assert all("10s" not in reason for _, found in triggers for reason in found)
+
+def test_young_and_avatarless_ratios_need_a_minimum_sample():
+    detector = RaidDetector(min_sample=8)
+    young = [(i * 5.0, 3600.0 * 2, False) for i in range(8)]
+    for now, age, avatar in young[:7]:
+        assert detector.record(now, age, avatar) == []
+    assert detector.record(*young[7]) == ["8/8 accounts younger than 7 days", "8/8 accounts without an avatar"]
+
+def test_windows_drain_and_calm_down_after_the_raid():
+    detector = RaidDetector()
+    raid = replay(detector, [(i * 0.2, WEEK / 2, False) for i in range(50)])
+    assert raid
+    last_trigger = detector.last_trigger
+    assert last_trigger == raid[-1][0]
+
+    assert detector.snapshot(last_trigger + 11)["10s"]["joins"] == 0
+    assert detector.snapshot(last_trigger + 61)["60s"]["joins"] == 0
+
+    quiet = replay(detector, synthetic_joins(per_minute=3, duration=900, start=last_trigger + 61, seed=11))
+    assert quiet == []
+    assert not detector.is_calm(last_trigger + 300, 600)
+    assert detector.is_calm(last_trigger + 600, 600)
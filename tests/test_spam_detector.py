@@ -0,0 +1,49 @@
+from spam_detector import SpamDetector, fingerprint
+
+def replay(detector, messages, user_id=1, channel_id=10):
+    return [detector.check(user_id, channel_id, content, 0, 0, at) for at, content in messages]
+
+def test_short_replies_are_not_duplicates():
+    reasons = replay(SpamDetector(), [(0, "yes"), (10, "no"), (20, "yes"), (30, "ok"), (40, "yes")])
+    assert reasons == [None] * 5
+
+def test_emoji_and_punctuation_are_not_fingerprinted():
+    reasons = replay(SpamDetector(), [(0, "😂"), (15, "nice"), (30, "❤️"), (45, "hi"), (60, "!!")])
+    assert reasons == [None] * 5
+
+def test_short_message_needs_the_higher_threshold():
+    detector = SpamDetector()
+    reasons = replay(detector, [(at * 5, "yes") for at in range(6)])
+    assert reasons[:5] == [None] * 5
+    assert reasons[5].startswith("Repeated the same message 6 times")
+
+def test_repeated_message_across_channels_triggers():
+    detector = SpamDetector()
+    reasons = [detector.check(1, channel, content, 0, 0, at) for at, channel, content in [
+        (0, 1, "join my server at example"), (5, 2, "JOIN my server at example!!"), (10, 3, "join  my serveeer at example")]]
+    assert reasons[:2] == [None, None]
+    assert reasons[2] == "Repeated the same message 3 times across 3 channels"
+
+def test_repeats_outside_the_window_are_forgotten():
+    detector = SpamDetector()
+    reasons = replay(detector, [(0, "anyone want to trade"), (70, "anyone want to trade"), (140, "anyone want to trade")])
+    assert reasons == [None] * 3
+
+def test_fingerprint_ignores_case_numbers_and_stretching():
+    assert fingerprint("FREE NITRO!!! at site 123") == fingerprint("free nitrooooo at site 99")
+    assert fingerprint("hello") != fingerprint("goodbye")
+
+def test_burst_triggers_rate_limit():
+    detector = SpamDetector()
+    words = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel"]
+    reasons = [detector.check(2, 10, f"{word} is my message", 0, 0, i * 0.2) for i, word in enumerate(words)]
+    assert reasons[:6] == [None] * 6
+    assert reasons[6].startswith("Sending messages too quickly")
+
+def test_idle_users_are_evicted_and_memory_is_capped():
+    detector = SpamDetector(max_users=100, idle_seconds=300)
+    for user_id in range(1000):
+        detector.check(user_id, 1, "hello there friends", 0, 0, user_id * 0.01)
+    assert len(detector.users) == 100
+    detector.check(5000, 1, "hello there friends", 0, 0, 10_000)
+    assert list(detector.users) == [5000]
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+import throttled_updater
+from throttled_updater import ThrottledUpdater
+
+real_sleep = asyncio.sleep
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+
+    async def sleep_on_clock(delay):
+        """The updater's sleeps end when the replayed raid has moved the fake clock far enough"""
+        target = clock.now + delay
+        while clock.now < target:
+            await real_sleep(0)
+
+    monkeypatch.setattr(throttled_updater.asyncio, "sleep", sleep_on_clock)
+    return clock
+
+def test_raid_of_500_joins_per_minute_is_throttled_to_two_edits_per_window(clock):
+    applied = []
+
+    async def rename(count):
+        applied.append((clock(), count))
+
+    async def scenario():
+        updater = ThrottledUpdater("member-count", rename, max_calls=2, window=600.0, clock=clock)
+        count = 1000
+        for _ in range(500 * 15):
+            clock.now += 60 / 500
+            count += 1
+            updater.submit(count)
+            await real_sleep(0)
+        while updater._pending:
+            clock.now += 1
+            await real_sleep(0)
+        await updater._task
+        return updater, count
+
+    updater, final = asyncio.run(scenario())
+    assert updater.submitted == 7500
+    assert applied[-1][1] == final
+    for i, (at, _) in enumerate(applied):
+        assert sum(1 for other, _ in applied[i:] if other - at < 600.0) <= 2
+    assert len(applied) <= 2 * (15 * 60 // 600 + 1) + 1
+    assert updater.failures == 0
+
+def test_unchanged_value_does_not_use_a_slot(clock):
+    applied = []
+
+    async def rename(count):
+        applied.append(count)
+
+    async def scenario():
+        updater = ThrottledUpdater("member-count", rename, max_calls=2, window=600.0, clock=clock)
+        updater.submit(5)
+        await updater._task
+        updater.submit(5)
+        await updater._task
+        return updater
+
+    updater = asyncio.run(scenario())
+    assert applied == [5]
+    assert updater.next_slot_in() == 0.0
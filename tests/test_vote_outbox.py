@@ -0,0 +1,33 @@
+import sqlite3
+
+from vote_outbox import MAX_DELIVERY_ATTEMPTS, VoteOutbox
+
+def test_event_is_dead_lettered_after_max_attempts(tmp_path):
+    outbox = VoteOutbox(str(tmp_path / "votes.db"))
+    event_id = outbox.enqueue("Steve", "PlanetMinecraft", "http")
+    results = [outbox.mark_failed(event_id, "Missing Access") for _ in range(MAX_DELIVERY_ATTEMPTS)]
+    assert results == [False] * (MAX_DELIVERY_ATTEMPTS - 1) + [True]
+    assert outbox.pending() == []
+    assert outbox.pending_count() == 0
+    assert outbox.dead_count() == 1
+    dead = outbox.dead_letters()
+    assert [event["id"] for event in dead] == [event_id]
+    assert dead[0]["last_error"] == "Missing Access"
+    outbox.close()
+
+def test_exhausted_rows_from_older_databases_are_dead_lettered_on_open(tmp_path):
+    path = str(tmp_path / "votes.db")
+    outbox = VoteOutbox(path)
+    exhausted = outbox.enqueue("Alex", "minecraft-mp.com", "http")
+    waiting = outbox.enqueue("Steve", "minecraft-mp.com", "http")
+    outbox.close()
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("UPDATE vote_outbox SET attempts = ? WHERE id = ?", (MAX_DELIVERY_ATTEMPTS, exhausted))
+        conn.execute("ALTER TABLE vote_outbox DROP COLUMN dead_at")
+    conn.close()
+
+    outbox = VoteOutbox(path)
+    assert [event["id"] for event in outbox.pending()] == [waiting]
+    assert [event["id"] for event in outbox.dead_letters()] == [exhausted]
+    outbox.close()
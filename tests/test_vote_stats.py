@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from vote_stats import VoteStatsStore
+
+def at(day, hour=12):
+    return datetime.fromisoformat(f"{day}T{hour:02d}:00:00").replace(tzinfo=timezone.utc)
+
+@pytest.fixture
+def stats(tmp_path):
+    store = VoteStatsStore(str(tmp_path / "votes.db"))
+    yield store
+    store.close()
+
+def test_rollups_count_daily_monthly_and_alltime(stats):
+    stats.record_vote("Alice", "pmc", voted_at=at("2026-03-30"))
+    stats.record_vote("Alice", "pmc", voted_at=at("2026-03-31", 9))
+    stats.record_vote("alice", "minecraft-mp", voted_at=at("2026-03-31", 18))
+    stats.record_vote("Alice", "pmc", voted_at=at("2026-04-01"))
+
+    march = stats.player_stats("ALICE", when=at("2026-03-31", 20))
+    assert (march["daily"], march["monthly"], march["alltime"]) == (2, 3, 4)
+    april = stats.player_stats("Alice", when=at("2026-04-01", 20))
+    assert (april["daily"], april["monthly"], april["alltime"]) == (1, 1, 4)
+
+def test_streak_continues_on_consecutive_days_and_resets_after_a_gap(stats):
+    for day in ("2026-05-01", "2026-05-02", "2026-05-02", "2026-05-03"):
+        stats.record_vote("Steve", "pmc", voted_at=at(day))
+    running = stats.player_stats("Steve", when=at("2026-05-03", 20))
+    assert (running["current_streak"], running["best_streak"]) == (3, 3)
+
+    stats.record_vote("Steve", "pmc", voted_at=at("2026-05-06"))
+    reset = stats.player_stats("Steve", when=at("2026-05-06", 20))
+    assert (reset["current_streak"], reset["best_streak"]) == (1, 3)
+
+    lapsed = stats.player_stats("Steve", when=at("2026-05-09"))
+    assert lapsed["current_streak"] == 0
+
+def test_out_of_order_vote_is_counted_but_leaves_the_streak_alone(stats):
+    stats.record_vote("Alex", "pmc", voted_at=at("2026-06-10"))
+    stats.record_vote("Alex", "pmc", voted_at=at("2026-06-11"))
+    stats.record_vote("Alex", "pmc", voted_at=at("2026-06-08"))
+
+    result = stats.player_stats("Alex", when=at("2026-06-11", 20))
+    assert result["alltime"] == 3
+    assert (result["current_streak"], result["best_streak"]) == (2, 2)
+    assert result["last_vote_at"] == at("2026-06-11").isoformat()
+
+def test_top_orders_by_count_then_name_and_player_stats_handles_unknowns(stats):
+    for player, votes in (("Zed", 2), ("Alice", 3), ("bob", 2)):
+        for _ in range(votes):
+            stats.record_vote(player, "pmc", voted_at=at("2026-07-04"))
+
+    assert stats.top("alltime", when=at("2026-07-04")) == [("Alice", 3), ("bob", 2), ("Zed", 2)]
+    assert stats.top("today", limit=1, when=at("2026-07-04")) == [("Alice", 3)]
+    assert stats.top("monthly", when=at("2026-08-01")) == []
+    assert stats.player_stats("nobody") is None
@@ -0,0 +1,56 @@
+import pytest
+
+from word_filter import AhoCorasick, ChatFilter, Term, benchmark, normalize
+
+def spans(found):
+    return sorted((match.term.text, match.start, match.end) for match in found)
+
+def test_overlapping_terms_are_reported_through_failure_links():
+    terms = [Term.parse(raw, "delete") for raw in ("*he*", "*she*", "*his*", "*hers*")]
+    automaton = AhoCorasick(terms)
+    assert spans(automaton.matches("ushers")) == [("he", 2, 4), ("hers", 2, 6), ("she", 1, 4)]
+    assert spans(automaton.matches("ahishers")) == [("he", 4, 6), ("hers", 4, 8), ("his", 1, 4), ("she", 3, 6)]
+
+def test_whole_word_terms_need_boundaries_and_stars_relax_them():
+    chat_filter = ChatFilter({"ass": "delete", "*grief": "warn", "hack*": "case"})
+    assert chat_filter.scan("you ass")[0] == "delete"
+    assert chat_filter.scan("ass.")[0] == "delete"
+    assert chat_filter.scan("class assignment passes") == (None, [])
+    assert chat_filter.scan("stop base-griefing")[0] is None
+    assert chat_filter.scan("stop basegrief now")[0] == "warn"
+    assert chat_filter.scan("hackers everywhere")[0] == "case"
+    assert chat_filter.scan("lifehack")[0] is None
+
+def test_leetspeak_is_undone_before_matching():
+    chat_filter = ChatFilter({"noob": "warn"})
+    for text in ("n00b", "N0OB", "what a n00b!"):
+        assert chat_filter.scan(text)[0] == "warn", text
+    assert normalize("$p@wn 4 l1f3") == "spawn a life"
+
+def test_zero_width_characters_and_accents_are_stripped():
+    chat_filter = ChatFilter({"grief": "delete"})
+    assert chat_filter.scan("g\u200br\u200ci\u200de\ufefff")[0] == "delete"
+    assert chat_filter.scan("GRÍÉF")[0] == "delete"
+    assert chat_filter.scan("gr\u00adief")[0] == "delete"
+    assert normalize("Ünïcödé") == "unicode"
+
+def test_strongest_action_wins_when_several_terms_match():
+    chat_filter = ChatFilter({"spam": "delete", "scam": "case", "noob": "warn"})
+    action, found = chat_filter.scan("noob spam scam spam")
+    assert action == "case"
+    assert [match.term.text for match in found] == ["noob", "spam", "scam", "spam"]
+    assert chat_filter.scan("noob spam")[0] == "warn"
+
+def test_bad_terms_are_skipped_and_rejected_on_parse():
+    chat_filter = ChatFilter({"**": "delete", "ok": "ban", "fine": "warn"})
+    assert [term.text for term in chat_filter.terms] == ["fine"]
+    with pytest.raises(ValueError):
+        Term.parse("word", "ban")
+    with pytest.raises(ValueError):
+        Term.parse(" * ", "delete")
+
+def test_five_thousand_terms_stay_above_throughput_floor():
+    result = benchmark(term_count=5000, message_count=5000)
+    assert result["terms"] == 5000
+    assert result["hits"] > 0
+    assert result["messages_per_second"] > 5000
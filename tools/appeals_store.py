@@ -0,0 +1,140 @@
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from docstore import DOCUMENTS, DocumentStore
+
+STATUS_PENDING = "pending"
+STATUS_APPROVED = "approved"
+STATUS_DENIED = "denied"
+
+class AppealsStore:
+    """Appeals keyed by number and indexed by user and status
+
+    Every change runs as a transaction on the appeals document actor, so concurrent
+    decisions are applied one at a time and cannot overwrite each other; the actor
+    persists them off the loop, coalescing bursts into one write.
+    """
+
+    def __init__(self, document: DocumentStore):
+        self.document = document
+        self.appeals: Dict[int, dict] = {}
+        self.by_user: Dict[int, Set[int]] = {}
+        self.by_status: Dict[str, Set[int]] = {}
+        self._generation = None
+
+    async def ready(self):
+        """Load the document off the event loop and index it"""
+        await self.document.load()
+        await self.document.refresh_if_changed()
+        self._ensure_indexed()
+
+    def _ensure_indexed(self):
+        if self._generation == self.document.generation:
+            return
+        self.appeals.clear()
+        self.by_user.clear()
+        self.by_status.clear()
+        for appeal in self.document.data.setdefault("appeals", []):
+            self._index(appeal)
+        self._generation = self.document.generation
+
+    def _index(self, appeal: dict):
+        number = appeal.get("appeal_number")
+        self.appeals[number] = appeal
+        self.by_user.setdefault(appeal.get("user_id"), set()).add(number)
+        self.by_status.setdefault(appeal.get("status", STATUS_PENDING), set()).add(number)
+
+    def _sorted(self, numbers: Iterable[int]) -> List[dict]:
+        return [self.appeals[number] for number in sorted(numbers)]
+
+    def get(self, appeal_number: int) -> Optional[dict]:
+        self._ensure_indexed()
+        return self.appeals.get(appeal_number)
+
+    def for_user(self, user_id: int) -> List[dict]:
+        self._ensure_indexed()
+        return self._sorted(self.by_user.get(user_id, ()))
+
+    def with_status(self, status: str) -> List[dict]:
+        self._ensure_indexed()
+        return self._sorted(self.by_status.get(status, ()))
+
+    def pending(self) -> List[dict]:
+        """Appeals still awaiting a decision, oldest first"""
+        return self.with_status(STATUS_PENDING)
+
+    def pending_for_case(self, case_number: int, user_id: Optional[int] = None) -> Optional[dict]:
+        return next((appeal for appeal in self.pending() if appeal.get("case_number") == case_number
+                     and (user_id is None or appeal.get("user_id") == user_id)), None)
+
+    async def _transaction(self, fn):
+        await self.ready()
+
+        def apply(data):
+            self._ensure_indexed()
+            return fn(data)
+
+        return await self.document.update(apply)
+
+    async def create(self, **fields) -> Tuple[dict, bool]:
+        """Assign the next appeal number and store a pending appeal
+
+        Returns (appeal, created). If the same user already has a pending appeal for
+        the case, that appeal is returned with created=False; the check runs in the
+        same transaction as the insert, so two quick submits cannot both get through.
+        """
+        def insert(data):
+            existing = self.pending_for_case(fields.get("case_number"), fields.get("user_id"))
+            if existing is not None:
+                return existing, False
+            highest = max(self.appeals, default=0)
+            number = max(data.get("next_appeal_number", 1), highest + 1)
+            appeal = {"appeal_number": number}
+            appeal.update(fields)
+            appeal.setdefault("status", STATUS_PENDING)
+            data["next_appeal_number"] = number + 1
+            data["appeals"].append(appeal)
+            self._index(appeal)
+            return appeal, True
+
+        return await self._transaction(insert)
+
+    async def update(self, appeal_number: int, **fields) -> Optional[dict]:
+        """Set fields on an appeal without changing its status"""
+        fields.pop("status", None)
+
+        def apply(data):
+            appeal = self.appeals.get(appeal_number)
+            if appeal is not None:
+                appeal.update(fields)
+            return appeal
+
+        return await self._transaction(apply)
+
+    async def transition(self, appeal_number: int, status: str, expected: Iterable[str] = (STATUS_PENDING,), **fields):
+        """Move an appeal to a new status if it is still in an expected one
+
+        Returns (appeal, changed). When another reviewer got there first the appeal is
+        returned unchanged with changed=False.
+        """
+        def apply(data):
+            appeal = self.appeals.get(appeal_number)
+            if appeal is None:
+                return None, False
+            current = appeal.get("status", STATUS_PENDING)
+            if current not in expected:
+                return appeal, False
+            self.by_status.get(current, set()).discard(appeal_number)
+            appeal.update(fields)
+            appeal["status"] = status
+            self.by_status.setdefault(status, set()).add(appeal_number)
+            return appeal, True
+
+        return await self._transaction(apply)
+
+    async def flush(self):
+        """Wait until every change made so far is on disk"""
+        await self.document.flush()
+
+APPEALS = AppealsStore(DOCUMENTS.open(os.path.join("data", "appeals.json"),
+                                      default=lambda: {"appeals": [], "next_appeal_number": 1}))
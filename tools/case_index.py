@@ -0,0 +1,197 @@
+import re
+import shlex
+from bisect import bisect_left, insort
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+
+FIELDS = {
+    "target": "target_name",
+    "user": "target_name",
+    "mod": "moderator_name",
+    "moderator": "moderator_name",
+    "type": "type",
+    "reason": "reason",
+}
+
+def tokenize(text) -> List[str]:
+    return _TOKEN.findall(str(text or "").casefold())
+
+def case_date(case: dict) -> Optional[date]:
+    try:
+        return datetime.fromisoformat(case["timestamp"]).date()
+    except (KeyError, TypeError, ValueError):
+        pass
+    try:
+        return datetime.strptime(case["date"], "%m/%d/%Y").date()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def parse_date(value: str) -> date:
+    for fmt in ("%Y-%m-%d", "%m/%d/%Y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date '{value}', use YYYY-MM-DD")
+
+def parse_case_number(value: str) -> int:
+    digits = value.lstrip("#")
+    if not digits.isdigit():
+        raise ValueError(f"'{value}' is not a case number, use case:123")
+    return int(digits)
+
+class CaseQuery:
+    """Parsed form of `mod:alice type:ban before:2026-01-01 griefing`
+
+    `after:` is inclusive and `before:` exclusive, so `on:d` is the range [d, d+1).
+    """
+
+    def __init__(self):
+        self.terms: List[str] = []
+        self.fields: Dict[str, List[str]] = {}
+        self.numbers: List[int] = []
+        self.before: Optional[date] = None
+        self.after: Optional[date] = None
+
+    @classmethod
+    def parse(cls, text: str) -> "CaseQuery":
+        query = cls()
+        try:
+            parts = shlex.split(text)
+        except ValueError:
+            parts = text.split()
+        for part in parts:
+            key, sep, value = part.partition(":")
+            key = key.lower()
+            if sep and value and key in FIELDS:
+                query.fields.setdefault(FIELDS[key], []).extend(tokenize(value))
+            elif sep and value and key in ("case", "id"):
+                query.numbers.append(parse_case_number(value))
+            elif sep and value and key == "before":
+                query.before = parse_date(value)
+            elif sep and value and key == "after":
+                query.after = parse_date(value)
+            elif sep and value and key == "on":
+                query.after = parse_date(value)
+                query.before = query.after + timedelta(days=1)
+            elif part.lstrip("#").isdigit():
+                query.numbers.append(int(part.lstrip("#")))
+            else:
+                query.terms.extend(tokenize(part))
+        return query
+
+def case_users(case: dict) -> Set[int]:
+    """Everyone a case is about or by; purges also list every author whose messages went"""
+    users = {case.get("target_id"), case.get("moderator_id"), *case.get("target_ids", ())} - {None}
+    return {int(user_id) for user_id in users}
+
+class CaseIndex:
+    """Token/prefix postings and numeric indexes over moderation cases
+
+    Postings are kept sorted by case number so results come back in case order and
+    intersections never need to touch cases that cannot match.
+    """
+
+    def __init__(self, cases: Iterable[dict] = ()):
+        self.cases: Dict[int, dict] = {}
+        self.postings: Dict[str, Dict[str, List[int]]] = {field: {} for field in set(FIELDS.values())}
+        self.vocabulary: Dict[str, List[str]] = {field: [] for field in self.postings}
+        self.by_user: Dict[int, List[int]] = {}
+        self.by_date: List[tuple] = []
+        for case in cases:
+            self.add(case)
+
+    def __len__(self) -> int:
+        return len(self.cases)
+
+    def add(self, case: dict):
+        number = case["case_number"]
+        if number in self.cases:
+            self.remove(number)
+        self.cases[number] = case
+        for field, postings in self.postings.items():
+            for token in set(tokenize(case.get(field))):
+                posting = postings.get(token)
+                if posting is None:
+                    postings[token] = posting = []
+                    insort(self.vocabulary[field], token)
+                insort(posting, number)
+        for user_id in case_users(case):
+            insort(self.by_user.setdefault(user_id, []), number)
+        day = case_date(case)
+        if day is not None:
+            insort(self.by_date, (day.toordinal(), number))
+
+    def remove(self, number: int):
+        case = self.cases.pop(number, None)
+        if case is None:
+            return
+        for field, postings in self.postings.items():
+            for token in set(tokenize(case.get(field))):
+                posting = postings.get(token, [])
+                if number in posting:
+                    posting.remove(number)
+                if not posting and token in postings:
+                    del postings[token]
+                    vocabulary = self.vocabulary[field]
+                    del vocabulary[bisect_left(vocabulary, token)]
+        for user_id in case_users(case):
+            numbers = self.by_user.get(user_id, [])
+            if number in numbers:
+                numbers.remove(number)
+        day = case_date(case)
+        if day is not None and (day.toordinal(), number) in self.by_date:
+            self.by_date.remove((day.toordinal(), number))
+
+    def _prefix(self, field: str, prefix: str) -> Set[int]:
+        vocabulary = self.vocabulary[field]
+        postings = self.postings[field]
+        matched: Set[int] = set()
+        position = bisect_left(vocabulary, prefix)
+        while position < len(vocabulary) and vocabulary[position].startswith(prefix):
+            matched.update(postings[vocabulary[position]])
+            position += 1
+        return matched
+
+    def _any_field(self, prefix: str) -> Set[int]:
+        matched: Set[int] = set()
+        for field in self.postings:
+            matched |= self._prefix(field, prefix)
+        return matched
+
+    def _date_range(self, after: Optional[date], before: Optional[date]) -> Set[int]:
+        low = bisect_left(self.by_date, (after.toordinal(), -1)) if after else 0
+        high = bisect_left(self.by_date, (before.toordinal(), -1)) if before else len(self.by_date)
+        return {number for _, number in self.by_date[low:high]}
+
+    def search(self, query, limit: Optional[int] = None) -> List[dict]:
+        """Cases matching every clause of the query, newest case first
+
+        Bare numbers match a case number or the ID of anyone in case_users(); bare words
+        match a word prefix in any field; `field:word` restricts it to one field.
+        """
+        if isinstance(query, str):
+            query = CaseQuery.parse(query)
+        candidates: List[Set[int]] = []
+        if query.numbers:
+            numbers: Set[int] = set()
+            for value in query.numbers:
+                if value in self.cases:
+                    numbers.add(value)
+                numbers.update(self.by_user.get(value, ()))
+            candidates.append(numbers)
+        for field, tokens in query.fields.items():
+            candidates.extend(self._prefix(field, token) for token in tokens)
+        candidates.extend(self._any_field(token) for token in query.terms)
+        if query.after or query.before:
+            candidates.append(self._date_range(query.after, query.before))
+        if not candidates:
+            return []
+        candidates.sort(key=len)
+        matched = candidates[0].intersection(*candidates[1:])
+        ordered = sorted(matched, reverse=True)
+        if limit is not None:
+            ordered = ordered[:limit]
+        return [self.cases[number] for number in ordered]
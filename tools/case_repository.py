@@ -0,0 +1,104 @@
+import asyncio
+import os
+from typing import Dict, List, Optional
+
+from case_index import CaseIndex
+from docstore import DOCUMENTS, DocumentStore
+from supervisor import SUPERVISOR
+
+class CaseRepository:
+    """Per-target and full-text indexes over the shared moderation cases document
+
+    Readers are served from memory and never touch disk. The maps and the search
+    index are built on a worker thread from a snapshot of the document and swapped
+    in whole once ready; a background task rebuilds them whenever the document's
+    generation moves (an outside edit noticed by its watcher, or a rollback).
+    In-process writers go through the document actor and report new cases with
+    record().
+    """
+
+    def __init__(self, document: DocumentStore, check_interval: float = 5.0):
+        self.document = document
+        self.check_interval = check_interval
+        self._cases: Dict[int, dict] = {}
+        self._by_target: Dict[int, List[dict]] = {}
+        self._index = CaseIndex()
+        self._generation = None
+        self._started = False
+        self.reloads = 0
+
+    @staticmethod
+    def _build(cases: List[dict]):
+        by_number: Dict[int, dict] = {}
+        for case in cases:
+            by_number[case.get("case_number")] = case
+        by_target: Dict[int, List[dict]] = {}
+        for number in sorted(by_number, key=lambda n: n or 0):
+            case = by_number[number]
+            by_target.setdefault(case.get("target_id"), []).append(case)
+        return by_number, by_target, CaseIndex(by_number.values())
+
+    async def rebuild(self) -> bool:
+        """Index a snapshot of the document off the loop and swap it in if nothing moved meanwhile"""
+        generation = self.document.generation
+        cases = list((self.document.data or {}).get("cases", []))
+        built = await asyncio.to_thread(self._build, cases)
+        if self.document.generation != generation:
+            return False
+        self._cases, self._by_target, self._index = built
+        self._generation = generation
+        for case in self.document.data.get("cases", [])[len(cases):]:
+            self._insert(case)
+        self.reloads += 1
+        return True
+
+    def _insert(self, case: dict):
+        number = case.get("case_number")
+        previous = self._cases.get(number)
+        if previous is not None:
+            target_cases = self._by_target.get(previous.get("target_id"), [])
+            if previous in target_cases:
+                target_cases.remove(previous)
+        self._cases[number] = case
+        target_cases = self._by_target.setdefault(case.get("target_id"), [])
+        target_cases.append(case)
+        if len(target_cases) > 1 and target_cases[-2].get("case_number", 0) > case.get("case_number", 0):
+            target_cases.sort(key=lambda c: c.get("case_number", 0))
+        self._index.add(case)
+
+    async def preload(self):
+        """Load and index the document now, then keep the index fresh in the background"""
+        await self.document.load()
+        if self._generation != self.document.generation:
+            await self.rebuild()
+        if not self._started:
+            self._started = True
+            self.document.watch(self.check_interval)
+            SUPERVISOR.supervise("case-repository", self._keep_fresh, owner="CaseRepository")
+
+    async def _keep_fresh(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            if self._generation != self.document.generation:
+                await self.rebuild()
+            SUPERVISOR.heartbeat()
+
+    def cases_for(self, target_id: int) -> List[dict]:
+        """Cases against one user, newest first"""
+        return list(reversed(self._by_target.get(target_id, [])))
+
+    def get(self, case_number: int) -> Optional[dict]:
+        return self._cases.get(case_number)
+
+    @property
+    def index(self) -> CaseIndex:
+        """Full-text index over every case"""
+        return self._index
+
+    def record(self, case: dict):
+        """Index a case that was just appended through the document actor"""
+        if self._generation == self.document.generation:
+            self._insert(case)
+
+CASES = CaseRepository(DOCUMENTS.open(os.path.join("data", "moderation_cases.json"),
+                                      default=lambda: {"cases": [], "next_case_number": 1}))
@@ -0,0 +1,66 @@
+import asyncio
+import json
+import time
+
+from docstore import DOCUMENTS
+
+class Checkpointer:
+    """In-memory cursor state that is flushed to disk in batches with atomic writes"""
+
+    def __init__(self, path: str, flush_interval: float = 5.0, flush_every: int = 50):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self.state = {}
+        self.document = DOCUMENTS.open(path)
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.load()
+
+    def load(self) -> dict:
+        """Load the last flushed state from disk"""
+        try:
+            self.state = json.loads(json.dumps(self.document.load_sync()))
+        except Exception as e:
+            print(f"⚠️ Failed to load checkpoint {self.path}: {e}")
+            self.state = {}
+        return self.state
+
+    def get(self, key: str, field: str, default=None):
+        return self.state.get(key, {}).get(field, default)
+
+    def update(self, key: str, entries: int = 1, **fields):
+        """Record progress in memory; nothing touches disk until the next flush"""
+        entry = dict(self.state.get(key, {}))
+        entry.update(fields)
+        self.state[key] = entry
+        self._pending += entries
+
+    @property
+    def dirty(self) -> bool:
+        return self._pending > 0
+
+    def due(self) -> bool:
+        if not self._pending:
+            return False
+        if self._pending >= self.flush_every:
+            return True
+        return time.monotonic() - self._last_flush >= self.flush_interval
+
+    async def maybe_flush(self) -> bool:
+        """Flush when the entry or time threshold has been reached"""
+        if not self.due():
+            return False
+        await self.flush()
+        return True
+
+    async def flush(self, force: bool = False):
+        """Hand the current state to the document actor and wait for the write"""
+        async with self._lock:
+            if not self._pending and not force:
+                return
+            pending = self._pending
+            await self.document.replace(self.state)
+            self._pending = max(0, self._pending - pending)
+            self._last_flush = time.monotonic()
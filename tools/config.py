@@ -40,6 +40,35 @@ RCON_MSG_CHANNEL_ID = 1422029919092867193
 RCON_VOTE_CHANNEL_ID = 1417983368057978961
 RCON_RESPONSE_CHANNEL_ID = 1374421938381783061
 
+MEMBER_CACHE_MODE = os.getenv("MEMBER_CACHE_MODE", "full").lower()
+STAFF_ROLE_IDS = [1374421915938324583, WHITELIST_STAFF_ROLE_ID]
+TICKET_CHANNEL_PREFIXES = ("gen-", "rep-", "whitelist-")
+
+RAID_THRESHOLDS = {
+    "joins_10s": int(os.getenv("RAID_JOINS_10S", "10")),
+    "joins_60s": int(os.getenv("RAID_JOINS_60S", "30")),
+    "young_ratio": float(os.getenv("RAID_YOUNG_RATIO", "0.6")),
+    "no_avatar_ratio": float(os.getenv("RAID_NO_AVATAR_RATIO", "0.8")),
+    "min_sample": int(os.getenv("RAID_MIN_SAMPLE", "8")),
+}
+RAID_RESPONSES = tuple(os.getenv("RAID_RESPONSES", "lock_whitelist,pause_tickets,alert_staff").split(","))
+RAID_CALM_SECONDS = int(os.getenv("RAID_CALM_SECONDS", "600"))
+LOCKDOWN_CONCURRENCY = int(os.getenv("LOCKDOWN_CONCURRENCY", "5"))
+
+SPAM_THRESHOLDS = {
+    "rate": float(os.getenv("SPAM_RATE", "0.5")),
+    "burst": float(os.getenv("SPAM_BURST", "6")),
+    "mention_burst": float(os.getenv("SPAM_MENTION_BURST", "8")),
+    "link_burst": float(os.getenv("SPAM_LINK_BURST", "4")),
+    "duplicates": int(os.getenv("SPAM_DUPLICATES", "3")),
+    "duplicate_window": float(os.getenv("SPAM_DUPLICATE_WINDOW", "60")),
+    "short_duplicates": int(os.getenv("SPAM_SHORT_DUPLICATES", "6")),
+}
+SPAM_TIMEOUT = os.getenv("SPAM_TIMEOUT", "10m")
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+METRICS_ALLOWED_IPS = tuple(ip.strip() for ip in os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",") if ip.strip())
+
 REQUIRED_IDS = [
     GUILD_ID, OWNER_ID, LOG_CHANNEL_ID, STAFF_LOG_CHANNEL_ID,
     WHITELIST_PANEL_CHANNEL_ID, WHITELIST_CATEGORY_ID, WHITELIST_STAFF_ROLE_ID,
@@ -0,0 +1,270 @@
+import asyncio
+import copy
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+from perf import TRACKER
+from supervisor import SUPERVISOR
+
+class DocumentStore:
+    """One JSON file owned by a single actor task
+
+    Every change goes through the actor queue and is applied in order, so writers
+    can no longer interleave a read-modify-write across an await. Changes that are
+    queued together are written once, atomically (temp file, fsync, rename), on a
+    worker thread. The serialized text of the last state known to be on disk is
+    kept as the undo record: if a change raises partway through, or the write
+    itself fails, the document is rebuilt from it and generation is bumped, so a
+    caller's future only succeeds once its change has actually reached disk. The
+    write's disk time is charged to the perf span of every caller in the batch. Read
+    the in-memory document freely, but only mutate it inside update().
+    """
+
+    def __init__(self, path: str, default: Callable[[], Any] = dict, indent: int = 2):
+        self.path = path
+        self.default = default
+        self.indent = indent
+        self.data: Any = None
+        self.loaded = False
+        self.generation = 0
+        self.version = 0
+        self.writes = 0
+        self.rollbacks = 0
+        self.last_error: Optional[str] = None
+        self._stamp = None
+        self._committed: Optional[str] = None
+        self._busy = False
+        self._checked_at = 0.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def key(self) -> str:
+        """Full path, so files that share a basename in different folders get separate jobs"""
+        return os.path.abspath(self.path)
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read(self):
+        stamp = self._file_stamp()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                text = f.read()
+            return json.loads(text), stamp, text
+        except FileNotFoundError:
+            return self.default(), stamp, None
+        except json.JSONDecodeError as e:
+            print(f"⚠️ {self.path} is not valid JSON ({e}); starting from defaults")
+            return self.default(), stamp, None
+
+    def _adopt(self, data, stamp, text):
+        self.data = data
+        self._stamp = stamp
+        self._committed = text
+        self.loaded = True
+        self.generation += 1
+
+    def load_sync(self):
+        """Blocking first load for constructors that run before the bot is serving events"""
+        if not self.loaded:
+            self._adopt(*self._read())
+        return self.data
+
+    async def load(self):
+        """Load the document once, off the event loop"""
+        if not self.loaded:
+            async with self._load_lock:
+                if not self.loaded:
+                    self._adopt(*await asyncio.to_thread(self._read))
+        return self.data
+
+    read = load
+
+    def _idle(self) -> bool:
+        return not self._busy and (self._queue is None or self._queue.empty())
+
+    async def refresh_if_changed(self, interval: float = 5.0) -> bool:
+        """Re-read the file if something outside this process rewrote it; checked at most once per interval"""
+        now = time.monotonic()
+        if not self.loaded or now - self._checked_at < interval or not self._idle():
+            return False
+        self._checked_at = now
+        if await asyncio.to_thread(self._file_stamp) == self._stamp:
+            return False
+        version = self.version
+        loaded = await asyncio.to_thread(self._read)
+        if version != self.version or not self._idle():
+            return False
+        self._adopt(*loaded)
+        return True
+
+    def watch(self, interval: float = 5.0, owner: str = "DocumentStore"):
+        """Keep checking for outside edits from a background task instead of on the read path"""
+        async def poll():
+            while True:
+                await asyncio.sleep(interval)
+                await self.refresh_if_changed(0)
+                SUPERVISOR.heartbeat()
+
+        SUPERVISOR.supervise(f"docstore-watch:{self.key}", poll, owner=owner)
+
+    def _enqueue(self, fn: Optional[Callable]) -> asyncio.Future:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            SUPERVISOR.supervise(f"docstore:{self.key}", self._run, owner="DocumentStore")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((fn, future, TRACKER.current()))
+        return future
+
+    async def update(self, fn: Callable[[Any], Any]):
+        """Apply fn(document) on the actor and return its result once the change is on disk"""
+        return await self._enqueue(fn)
+
+    async def replace(self, data):
+        """Swap in a whole new document"""
+        snapshot = copy.deepcopy(data)
+        return await self._enqueue(lambda _: self._swap(snapshot))
+
+    def replace_nowait(self, data):
+        """Queue a whole-document replacement from synchronous code; errors are logged"""
+        snapshot = copy.deepcopy(data)
+        future = self._enqueue(lambda _: self._swap(snapshot))
+        future.add_done_callback(self._log_failure)
+
+    def update_nowait(self, fn: Callable[[Any], Any]):
+        future = self._enqueue(fn)
+        future.add_done_callback(self._log_failure)
+
+    def _swap(self, snapshot):
+        self.data = snapshot
+        self.generation += 1
+
+    def _log_failure(self, future: asyncio.Future):
+        if not future.cancelled() and future.exception() is not None:
+            error = future.exception()
+            print(f"❌ Update to {self.path} failed: {type(error).__name__}: {error}")
+
+    async def flush(self):
+        """Wait until everything queued so far is on disk"""
+        if self._queue is not None:
+            await self._enqueue(None)
+
+    async def _rollback(self):
+        """Throw away uncommitted changes by rebuilding the document from the last text on disk"""
+        if self._committed is None:
+            self.data = self.default()
+        else:
+            self.data = await asyncio.to_thread(json.loads, self._committed)
+        self.generation += 1
+        self.rollbacks += 1
+
+    async def _apply(self, changes):
+        """Apply each change in order; a change that raises is failed, rolled back, and the rest replayed"""
+        while True:
+            results = []
+            for fn, future, _ in changes:
+                try:
+                    results.append((future, fn(self.data)))
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                    await self._rollback()
+                    changes = [change for change in changes if change[1] is not future]
+                    break
+            else:
+                return results
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._busy = True
+            crash = None
+            try:
+                await self.load()
+                changes = [item for item in batch if item[0] is not None]
+                waiters = [future for fn, future, _ in batch if fn is None]
+                spans = [span for _, _, span in batch]
+                results = await self._apply(changes) if changes else []
+                write_error = None
+                if results:
+                    try:
+                        started = time.perf_counter()
+                        try:
+                            text, stamp = await asyncio.to_thread(self._write_atomic, self.data)
+                        finally:
+                            TRACKER.charge(spans, "disk", time.perf_counter() - started)
+                        self._committed, self._stamp = text, stamp
+                        self.version += len(results)
+                        self.writes += 1
+                        self.last_error = None
+                    except Exception as e:
+                        write_error = e
+                        self.last_error = f"{type(e).__name__}: {e}"
+                        print(f"❌ Failed to write {self.path}; rolled back {len(results)} change(s): {self.last_error}")
+                        await self._rollback()
+                for future, result in results:
+                    if not future.done():
+                        if write_error is not None:
+                            future.set_exception(write_error)
+                        else:
+                            future.set_result(result)
+                for future in waiters:
+                    if not future.done():
+                        if write_error is not None:
+                            future.set_exception(write_error)
+                        else:
+                            future.set_result(None)
+            except BaseException as e:
+                crash = e
+                raise
+            finally:
+                self._busy = False
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(crash if isinstance(crash, Exception) else RuntimeError(f"Writer for {self.path} stopped"))
+            SUPERVISOR.heartbeat()
+
+    def _write_atomic(self, data):
+        text = json.dumps(data, indent=self.indent)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        return text, self._file_stamp()
+
+class DocumentRegistry:
+    """Hands out one DocumentStore per file so every cog shares the same actor"""
+
+    def __init__(self):
+        self.stores: Dict[str, DocumentStore] = {}
+
+    def open(self, path: str, default: Callable[[], Any] = dict, indent: int = 2) -> DocumentStore:
+        key = os.path.abspath(path)
+        store = self.stores.get(key)
+        if store is None:
+            store = self.stores[key] = DocumentStore(path, default, indent)
+        return store
+
+    async def flush_all(self):
+        """Wait for every document's queued writes; called on shutdown"""
+        await asyncio.gather(*(store.flush() for store in self.stores.values()), return_exceptions=True)
+
+DOCUMENTS = DocumentRegistry()
@@ -0,0 +1,130 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, List, Optional
+
+from supervisor import SUPERVISOR
+
+class JoinPipeline:
+    """Queues new members so join handlers return immediately
+
+    Welcomes are sent one per member while joins are slow; once batch_threshold
+    joins land inside rate_window the dispatcher switches to one message for up to
+    batch_size members. Role grants run on a small fixed pool of workers and pause
+    together when Discord reports a rate limit; the rate-limited member is retried
+    in place after the pause, up to role_attempts times, so grants keep join order.
+    """
+
+    def __init__(self, name: str, welcome_one: Callable[[object], Awaitable], welcome_batch: Callable[[List[object]], Awaitable],
+                 grant_role: Callable[[object], Awaitable], owner: Optional[str] = None, batch_threshold: int = 5,
+                 rate_window: float = 60.0, batch_size: int = 20, batch_interval: float = 10.0, role_concurrency: int = 2,
+                 role_attempts: int = 5, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.welcome_one = welcome_one
+        self.welcome_batch = welcome_batch
+        self.grant_role = grant_role
+        self.owner = owner
+        self.batch_threshold = batch_threshold
+        self.rate_window = rate_window
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.role_concurrency = role_concurrency
+        self.role_attempts = role_attempts
+        self.clock = clock
+        self.welcome_queue: asyncio.Queue = asyncio.Queue()
+        self.role_queue: asyncio.Queue = asyncio.Queue()
+        self.joins: deque = deque()
+        self.role_paused_until = 0.0
+        self.stats = {"joined": 0, "welcomed": 0, "batches": 0, "roles_granted": 0, "role_failures": 0,
+                      "rate_limited": 0, "welcome_lag": 0.0, "role_lag": 0.0}
+
+    def start(self):
+        SUPERVISOR.supervise(f"{self.name}-welcome", self._welcome_loop, owner=self.owner)
+        for index in range(self.role_concurrency):
+            SUPERVISOR.supervise(f"{self.name}-roles-{index}", self._role_loop, owner=self.owner)
+
+    def stop(self):
+        SUPERVISOR.cancel(f"{self.name}-welcome")
+        for index in range(self.role_concurrency):
+            SUPERVISOR.cancel(f"{self.name}-roles-{index}")
+
+    def submit(self, member):
+        """Queue a member for welcome and role grant; never waits"""
+        now = self.clock()
+        self.joins.append(now)
+        self.stats["joined"] += 1
+        self.welcome_queue.put_nowait((member, now))
+        self.role_queue.put_nowait((member, now))
+
+    def join_rate(self) -> int:
+        """Joins seen in the last rate_window seconds"""
+        cutoff = self.clock() - self.rate_window
+        while self.joins and self.joins[0] < cutoff:
+            self.joins.popleft()
+        return len(self.joins)
+
+    @property
+    def batching(self) -> bool:
+        return self.join_rate() >= self.batch_threshold
+
+    def backlog(self) -> dict:
+        """How far behind the pipeline is right now"""
+        return {
+            "mode": "batched" if self.batching else "individual",
+            "join_rate": self.join_rate(),
+            "welcome_queue": self.welcome_queue.qsize(),
+            "role_queue": self.role_queue.qsize(),
+            **self.stats,
+        }
+
+    async def _welcome_loop(self):
+        while True:
+            batch = [await self.welcome_queue.get()]
+            if self.batching:
+                deadline = self.clock() + self.batch_interval
+                while len(batch) < self.batch_size:
+                    if not self.welcome_queue.empty():
+                        batch.append(self.welcome_queue.get_nowait())
+                        continue
+                    timeout = deadline - self.clock()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.welcome_queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            members = [member for member, _ in batch]
+            self.stats["welcome_lag"] = self.clock() - batch[0][1]
+            try:
+                if len(members) == 1:
+                    await self.welcome_one(members[0])
+                else:
+                    await self.welcome_batch(members)
+                    self.stats["batches"] += 1
+                self.stats["welcomed"] += len(members)
+            except Exception as e:
+                print(f"❌ Welcome for {len(members)} member(s) failed: {type(e).__name__}: {e}")
+            SUPERVISOR.heartbeat()
+
+    async def _role_loop(self):
+        while True:
+            member, queued_at = await self.role_queue.get()
+            for attempt in range(1, self.role_attempts + 1):
+                pause = self.role_paused_until - self.clock()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                self.stats["role_lag"] = self.clock() - queued_at
+                try:
+                    await self.grant_role(member)
+                except Exception as e:
+                    retry_after = getattr(e, "retry_after", None)
+                    if (getattr(e, "status", None) == 429 or retry_after is not None) and attempt < self.role_attempts:
+                        self.stats["rate_limited"] += 1
+                        self.role_paused_until = max(self.role_paused_until, self.clock() + float(retry_after or 5.0))
+                        continue
+                    self.stats["role_failures"] += 1
+                    print(f"❌ Role grant for {member} failed: {type(e).__name__}: {e}")
+                else:
+                    self.stats["roles_granted"] += 1
+                break
+            SUPERVISOR.heartbeat()
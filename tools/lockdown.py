@@ -0,0 +1,71 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+import discord
+
+LOCKED_PERMISSIONS = ("send_messages", "send_messages_in_threads", "create_public_threads", "add_reactions")
+
+def snapshot_overwrite(channel, role) -> dict:
+    """Record exactly how a role's overwrite looks on a channel, including whether it exists at all"""
+    overwrite = channel.overwrites.get(role)
+    if overwrite is None:
+        return {"existed": False, "allow": 0, "deny": 0}
+    allow, deny = overwrite.pair()
+    return {"existed": True, "allow": allow.value, "deny": deny.value}
+
+def stored_overwrite(entry: dict) -> Optional[discord.PermissionOverwrite]:
+    """The overwrite a snapshot entry describes, or None when there was no overwrite"""
+    if not entry.get("existed"):
+        return None
+    return discord.PermissionOverwrite.from_pair(discord.Permissions(entry["allow"]), discord.Permissions(entry["deny"]))
+
+def locked_overwrite(entry: dict) -> discord.PermissionOverwrite:
+    """The snapshot's overwrite with everything in LOCKED_PERMISSIONS denied"""
+    overwrite = stored_overwrite(entry) or discord.PermissionOverwrite()
+    overwrite.update(**{name: False for name in LOCKED_PERMISSIONS})
+    return overwrite
+
+def already_locked(entry: dict) -> bool:
+    deny = discord.Permissions(entry.get("deny", 0))
+    return all(getattr(deny, name) for name in LOCKED_PERMISSIONS)
+
+async def run_bounded(items: Iterable, action: Callable[[object], Awaitable], concurrency: int = 5,
+                      progress: Optional[Callable[[int, int, int], Awaitable]] = None,
+                      progress_interval: float = 2.0) -> Dict[str, List]:
+    """Run action over items with at most `concurrency` in flight
+
+    Channel overwrite edits are rate limited per channel plus the global limit,
+    so a small pool keeps every bucket busy without tripping 429s. progress is
+    awaited with (done, failed, total) at most once per progress_interval and
+    once at the end.
+    """
+    items = list(items)
+    semaphore = asyncio.Semaphore(concurrency)
+    results = {"done": [], "failed": []}
+    last_report = time.monotonic()
+
+    async def report(force: bool = False):
+        nonlocal last_report
+        if progress is None:
+            return
+        now = time.monotonic()
+        if force or now - last_report >= progress_interval:
+            last_report = now
+            try:
+                await progress(len(results["done"]), len(results["failed"]), len(items))
+            except discord.HTTPException:
+                pass
+
+    async def run(item):
+        async with semaphore:
+            try:
+                await action(item)
+                results["done"].append(item)
+            except Exception as e:
+                results["failed"].append((item, e))
+        await report()
+
+    await asyncio.gather(*(run(item) for item in items))
+    await report(force=True)
+    return results
@@ -0,0 +1,152 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, List, Optional
+
+from metrics import REGISTRY
+
+LOOP_LAG = REGISTRY.histogram(
+    "newlife_event_loop_lag_seconds",
+    "Delay between a scheduled watchdog tick and when it actually ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+LOOP_STALLS = REGISTRY.counter(
+    "newlife_event_loop_stalls_total",
+    "Event loop stalls longer than the watchdog threshold",
+    ("owner",),
+)
+
+LIBRARY_PREFIXES = tuple({os.path.abspath(sys.prefix), os.path.abspath(sys.base_prefix)})
+
+class Stall:
+    """A blocking callback captured while the loop was stuck"""
+
+    __slots__ = ("signature", "owner", "location", "stack", "count", "total", "worst", "last_seen")
+
+    def __init__(self, signature, owner, location, stack):
+        self.signature = signature
+        self.owner = owner
+        self.location = location
+        self.stack = stack
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.last_seen = 0.0
+
+class LoopWatchdog:
+    """Measures event-loop lag and captures the stack of whatever is blocking it"""
+
+    def __init__(self, threshold: float = 0.25, interval: float = 0.05, top_n: int = 10, on_stall=None, resolve_owner=None):
+        self.threshold = threshold
+        self.resolve_owner = resolve_owner
+        self.interval = interval
+        self.top_n = top_n
+        self.on_stall = on_stall
+        self.stalls: Dict[tuple, Stall] = {}
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._captured: Optional[tuple] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the heartbeat task and the sampler thread on the running loop"""
+        if self._task and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat(), name="loop-watchdog")
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._last_beat = now
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG.observe(lag)
+            captured, self._captured = self._captured, None
+            if captured and lag >= self.threshold:
+                self._finish_stall(captured, lag)
+
+    def _watch(self):
+        while not self._stop.wait(self.interval / 2):
+            stalled_for = time.monotonic() - self._last_beat
+            if stalled_for < self.threshold or self._captured is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            del frame
+            self._captured = self._summarize(stack)
+
+    @staticmethod
+    def _summarize(stack: traceback.StackSummary) -> tuple:
+        owner = "unknown"
+        location = None
+        for entry in reversed(stack):
+            path = os.path.abspath(entry.filename)
+            if "site-packages" in path or "dist-packages" in path or path.startswith(LIBRARY_PREFIXES) or path == os.path.abspath(__file__):
+                continue
+            owner = os.path.splitext(os.path.basename(path))[0]
+            location = f"{os.path.basename(path)}:{entry.lineno} in {entry.name}"
+            break
+        if location is None and stack:
+            last = stack[-1]
+            location = f"{os.path.basename(last.filename)}:{last.lineno} in {last.name}"
+        frames = "".join(traceback.format_list(stack[-12:]))
+        return owner, location or "unknown", frames
+
+    def _finish_stall(self, captured: tuple, duration: float):
+        owner, location, frames = captured
+        if self.resolve_owner:
+            owner = self.resolve_owner(owner) or owner
+        key = (owner, location)
+        stall = self.stalls.get(key)
+        if stall is None:
+            stall = Stall(key, owner, location, frames)
+            self.stalls[key] = stall
+        stall.count += 1
+        stall.total += duration
+        stall.worst = max(stall.worst, duration)
+        stall.last_seen = time.time()
+        stall.stack = frames
+        LOOP_STALLS.inc(owner)
+        if len(self.stalls) > self.top_n * 5:
+            keep = sorted(self.stalls.values(), key=lambda s: s.total, reverse=True)[:self.top_n * 2]
+            self.stalls = {s.signature: s for s in keep}
+        if self.on_stall:
+            try:
+                result = self.on_stall(stall, duration)
+                if asyncio.iscoroutine(result):
+                    asyncio.create_task(result, name="loop-watchdog-report")
+            except Exception as e:
+                print(f"⚠️ Loop watchdog callback failed: {e}")
+
+    def top(self, limit: Optional[int] = None) -> List[Stall]:
+        """Return the stall sites that blocked the loop the longest in total"""
+        limit = limit or self.top_n
+        return sorted(self.stalls.values(), key=lambda s: s.total, reverse=True)[:limit]
+
+    def reset(self):
+        self.stalls.clear()
+        self.max_lag = 0.0
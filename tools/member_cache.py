@@ -0,0 +1,306 @@
+import asyncio
+import random
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Iterable, List, Optional
+
+import discord
+
+MODE_FULL = "full"
+MODE_LAZY = "lazy"
+MODE_STAFF = "staff"
+MODES = (MODE_FULL, MODE_LAZY, MODE_STAFF)
+
+def cache_options(mode: str, intents: discord.Intents) -> dict:
+    """Client keyword arguments for a member cache mode"""
+    if mode == MODE_LAZY:
+        return {
+            "chunk_guilds_at_startup": False,
+            "member_cache_flags": discord.MemberCacheFlags.from_intents(intents),
+        }
+    if mode == MODE_STAFF:
+        return {
+            "chunk_guilds_at_startup": False,
+            "member_cache_flags": discord.MemberCacheFlags.none(),
+        }
+    return {
+        "chunk_guilds_at_startup": True,
+        "member_cache_flags": discord.MemberCacheFlags.all(),
+    }
+
+class GuildCache:
+    """The one place that reaches into discord.py's private member cache
+
+    discord.py has no public way to insert or drop a cached member, so pinning
+    relies on Guild._add_member, Guild._remove_member and ConnectionState._get_guild.
+    They are checked once at startup; if an upgrade removes any of them, pinning
+    is switched off instead of raising on every lookup.
+    """
+
+    def __init__(self):
+        state = getattr(getattr(discord, "state", None), "ConnectionState", None)
+        hooks = ((discord.Guild, "_add_member"), (discord.Guild, "_remove_member"), (state, "_get_guild"))
+        self.missing = [name for owner, name in hooks if owner is None or not hasattr(owner, name)]
+        self.supported = not self.missing
+
+    def cacheable(self, member) -> bool:
+        return self.supported and isinstance(member, discord.Member)
+
+    def add(self, member):
+        member.guild._add_member(member)
+
+    def remove(self, guild, guild_id: int, member_id: int):
+        """Drop a member from the cache of guild_id, looked up through guild's connection state"""
+        target = guild if guild.id == guild_id else guild._state._get_guild(guild_id)
+        if target:
+            target._remove_member(discord.Object(id=member_id))
+
+class MemberCachePolicy:
+    """Resolves members according to the configured cache mode
+
+    full  - every member is chunked at startup and served from the gateway cache
+    lazy  - nothing is chunked; members are requested over the gateway per query and kept
+    staff - only staff and ticket participants are pinned; everyone else is fetched and dropped
+    """
+
+    def __init__(self, mode: str, staff_role_ids: Iterable[int] = (), max_pinned: int = 5000,
+                 cache: Optional[GuildCache] = None):
+        self.mode = mode if mode in MODES else MODE_FULL
+        self.staff_role_ids = set(staff_role_ids)
+        self.max_pinned = max_pinned
+        self.pinned: "OrderedDict[int, int]" = OrderedDict()
+        self.cache = cache or GuildCache()
+        if self.mode == MODE_STAFF and not self.cache.supported:
+            print(f"⚠️ Staff member cache mode cannot pin members; discord.py is missing {', '.join(self.cache.missing)}")
+
+    def is_staff(self, member) -> bool:
+        return any(role.id in self.staff_role_ids for role in getattr(member, "roles", ()))
+
+    def pin(self, member, permanent: bool = False):
+        """Keep a member in the guild cache (staff mode only; other modes already cache)"""
+        if self.mode != MODE_STAFF or not self.cache.cacheable(member):
+            return
+        guild = member.guild
+        self.cache.add(member)
+        if permanent or self.is_staff(member):
+            self.pinned.pop(member.id, None)
+            return
+        self.pinned[member.id] = guild.id
+        self.pinned.move_to_end(member.id)
+        while len(self.pinned) > self.max_pinned:
+            member_id, guild_id = self.pinned.popitem(last=False)
+            self.cache.remove(guild, guild_id, member_id)
+
+    async def get_member(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        """Return a member from cache, the gateway, or REST, in that order"""
+        member = guild.get_member(user_id)
+        if member is not None:
+            return member
+        if self.mode != MODE_FULL or not guild.chunked:
+            try:
+                found = await guild.query_members(user_ids=[user_id], limit=1, cache=self.mode == MODE_LAZY)
+                if found:
+                    self.pin(found[0])
+                    return found[0]
+            except (asyncio.TimeoutError, discord.ClientException):
+                pass
+        try:
+            member = await guild.fetch_member(user_id)
+        except (discord.NotFound, discord.HTTPException):
+            return None
+        self.pin(member)
+        return member
+
+    async def get_members(self, guild: discord.Guild, user_ids: Iterable[int], permanent: bool = False) -> List[discord.Member]:
+        """Resolve many members, batching gateway requests 100 at a time"""
+        user_ids = [int(user_id) for user_id in user_ids]
+        members = [guild.get_member(user_id) for user_id in user_ids]
+        resolved = [member for member in members if member is not None]
+        missing = [user_id for user_id, member in zip(user_ids, members) if member is None]
+        for start in range(0, len(missing), 100):
+            batch = missing[start:start + 100]
+            try:
+                found = await guild.query_members(user_ids=batch, limit=len(batch), cache=self.mode == MODE_LAZY)
+            except (asyncio.TimeoutError, discord.ClientException):
+                continue
+            for member in found:
+                self.pin(member, permanent=permanent)
+            resolved.extend(found)
+        return resolved
+
+    async def search(self, guild: discord.Guild, query: str, limit: int = 25) -> List[discord.Member]:
+        """Members whose name or nickname starts with the query"""
+        if self.mode == MODE_FULL and guild.chunked:
+            query = query.lower()
+            return [member for member in guild.members
+                    if member.name.lower().startswith(query) or member.display_name.lower().startswith(query)][:limit]
+        try:
+            members = await guild.query_members(query, limit=max(5, min(limit, 100)), cache=self.mode == MODE_LAZY)
+        except (asyncio.TimeoutError, discord.ClientException):
+            return []
+        return members[:limit]
+
+    async def all_members(self, guild: discord.Guild) -> List[discord.Member]:
+        """Every member of the guild, without growing the cache outside full mode"""
+        if self.mode == MODE_FULL:
+            if not guild.chunked:
+                await guild.chunk()
+            return list(guild.members)
+        return [member async for member in guild.fetch_members(limit=None)]
+
+class FakeRole:
+    __slots__ = ("id",)
+
+    def __init__(self, role_id: int):
+        self.id = role_id
+
+class FakeMember:
+    __slots__ = ("id", "guild", "name", "display_name", "roles")
+
+    def __init__(self, member_id: int, guild: "FakeGuild", roles=()):
+        self.id = member_id
+        self.guild = guild
+        self.name = self.display_name = f"member{member_id}"
+        self.roles = list(roles)
+
+class FakeGuild:
+    """Just enough of discord.Guild to replay lookups against an in-memory gateway
+
+    Members are built from their payload on every gateway or REST response, the way discord.py
+    deserializes them, so only what ends up in ``cached`` stays allocated.
+    """
+
+    CHUNK_SIZE = 1000
+
+    def __init__(self, guild_id: int, member_count: int, staff_role_id: int, staff_count: int = 50, cache_all: bool = False):
+        self.id = guild_id
+        self.member_count = member_count
+        self.staff_role_id = staff_role_id
+        self.staff_count = staff_count
+        self.cached = {}
+        self.chunked = False
+        self.gateway_requests = 0
+        self.chunk_requests = 0
+        self.rest_requests = 0
+        if cache_all:
+            self.cached = {member_id: self._member(member_id) for member_id in range(member_count)}
+            self.chunked = True
+
+    def _member(self, member_id: int) -> FakeMember:
+        roles = [FakeRole(self.staff_role_id)] if member_id < self.staff_count else ()
+        return FakeMember(member_id, self, roles)
+
+    @property
+    def members(self):
+        return list(self.cached.values())
+
+    def get_member(self, user_id: int):
+        return self.cached.get(user_id)
+
+    async def chunk(self, *, cache=True):
+        """Request every member in CHUNK_SIZE packets, as chunk_guilds_at_startup does"""
+        members = []
+        for start in range(0, self.member_count, self.CHUNK_SIZE):
+            self.chunk_requests += 1
+            await asyncio.sleep(0)
+            batch = [self._member(member_id) for member_id in range(start, min(start + self.CHUNK_SIZE, self.member_count))]
+            if cache:
+                self.cached.update((member.id, member) for member in batch)
+            members.extend(batch)
+        self.chunked = True
+        return members
+
+    async def query_members(self, query=None, *, limit=5, user_ids=None, cache=True):
+        self.gateway_requests += 1
+        await asyncio.sleep(0)
+        if user_ids is not None:
+            found = [self._member(user_id) for user_id in user_ids if 0 <= user_id < self.member_count][:limit]
+        else:
+            found = [self._member(member_id) for member_id in range(self.member_count)
+                     if f"member{member_id}".startswith(query)][:limit]
+        if cache:
+            self.cached.update((member.id, member) for member in found)
+        return found
+
+    async def fetch_member(self, user_id: int):
+        self.rest_requests += 1
+        if not 0 <= user_id < self.member_count:
+            raise KeyError(user_id)
+        return self._member(user_id)
+
+class FakeGuildCache(GuildCache):
+    def __init__(self):
+        self.missing = []
+        self.supported = True
+
+    def cacheable(self, member) -> bool:
+        return isinstance(member, FakeMember)
+
+    def add(self, member):
+        member.guild.cached[member.id] = member
+
+    def remove(self, guild, guild_id: int, member_id: int):
+        guild.cached.pop(member_id, None)
+
+def benchmark(mode: str, member_count: int = 50000, lookups: int = 50000, active: int = 2000, max_pinned: int = 5000,
+              ticket_owners: int = 50, seed: int = 1) -> dict:
+    """Start a fake guild in a cache mode, then replay member lookups where most traffic comes from a small active set
+
+    Startup is timed and its retained allocations measured with tracemalloc: full mode chunks every
+    member, while lazy and staff only pin the open ticket owners like the members cog does.
+    """
+    rng = random.Random(seed)
+    staff_role_id = 1
+    guild = FakeGuild(1, member_count, staff_role_id)
+    policy = MemberCachePolicy(mode, [staff_role_id], max_pinned=max_pinned, cache=FakeGuildCache())
+    hot = rng.sample(range(member_count), active)
+    ids = [rng.choice(hot) if rng.random() < 0.9 else rng.randrange(member_count) for _ in range(lookups)]
+
+    async def start():
+        if mode == MODE_FULL:
+            await guild.chunk()
+        else:
+            await policy.get_members(guild, range(ticket_owners), permanent=True)
+
+    async def replay():
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        await start()
+        startup = time.perf_counter() - started
+        retained = tracemalloc.get_traced_memory()[0] - before
+        if not tracing:
+            tracemalloc.stop()
+        started = time.perf_counter()
+        for user_id in ids:
+            await policy.get_member(guild, user_id)
+        return startup, retained, time.perf_counter() - started
+
+    startup, startup_bytes, elapsed = asyncio.run(replay())
+    return {
+        "mode": mode,
+        "members": member_count,
+        "lookups": lookups,
+        "startup_ms": startup * 1000,
+        "startup_kib": startup_bytes / 1024,
+        "chunk_requests": guild.chunk_requests,
+        "cached": len(guild.cached),
+        "pinned": len(policy.pinned),
+        "gateway_requests": guild.gateway_requests,
+        "rest_requests": guild.rest_requests,
+        "per_lookup_us": elapsed / lookups * 1e6,
+    }
+
+def main():
+    for mode in MODES:
+        result = benchmark(mode)
+        print(f"{result['mode']:>5} | {result['members']:,} members | startup {result['startup_ms']:7.1f} ms, "
+              f"{result['startup_kib']:8,.0f} KiB ({result['chunk_requests']:,} chunks) | cached {result['cached']:>6,} "
+              f"(pinned {result['pinned']:,}) | {result['gateway_requests']:>6,} gateway / {result['rest_requests']:,} REST "
+              f"requests for {result['lookups']:,} lookups | {result['per_lookup_us']:6.1f} us/lookup")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import re
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Set, Tuple
+
+_SPLIT = re.compile(r"[^0-9a-z]+")
+
+def normalize(text: str) -> str:
+    return (text or "").casefold().strip()
+
+def name_keys(*names: str) -> Set[str]:
+    """Full lowercased names plus each word inside them, so 'smith' finds 'john_smith'"""
+    keys = set()
+    for name in names:
+        name = normalize(name)
+        if not name:
+            continue
+        keys.add(name)
+        keys.update(part for part in _SPLIT.split(name) if part)
+    return keys
+
+class MemberNameIndex:
+    """Sorted-prefix index over member names, nicknames and display names"""
+
+    def __init__(self):
+        self._entries: List[Tuple[str, int]] = []
+        self._keys: Dict[int, Set[str]] = {}
+        self._names: Dict[int, Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, member_id: int) -> bool:
+        return member_id in self._keys
+
+    @staticmethod
+    def _member_names(member) -> Tuple[str, ...]:
+        names = [member.name, getattr(member, "global_name", None), getattr(member, "nick", None)]
+        return tuple(normalize(name) for name in names if name)
+
+    def build(self, members: Iterable):
+        """Replace the index contents in one sort"""
+        self._keys.clear()
+        self._names.clear()
+        entries = []
+        for member in members:
+            names = self._member_names(member)
+            keys = name_keys(*names)
+            self._keys[member.id] = keys
+            self._names[member.id] = names
+            entries.extend((key, member.id) for key in keys)
+        entries.sort()
+        self._entries = entries
+
+    def add(self, member):
+        """Insert or refresh one member; a no-op when its names are unchanged"""
+        names = self._member_names(member)
+        if self._names.get(member.id) == names:
+            return
+        self.remove(member.id)
+        keys = name_keys(*names)
+        self._keys[member.id] = keys
+        self._names[member.id] = names
+        for key in keys:
+            insort(self._entries, (key, member.id))
+
+    def remove(self, member_id: int):
+        for key in self._keys.pop(member_id, ()):
+            position = bisect_left(self._entries, (key, member_id))
+            if position < len(self._entries) and self._entries[position] == (key, member_id):
+                del self._entries[position]
+        self._names.pop(member_id, None)
+
+    def search(self, query: str, limit: int = 25) -> List[int]:
+        """Member ids whose names start with the query, best match first
+
+        Exact name matches rank first, then prefixes of a full name, then prefixes of a
+        word inside a name; ties go to the shortest name and then the lowest id.
+        """
+        query = normalize(query)
+        if not query:
+            return []
+        best: Dict[int, Tuple[int, int]] = {}
+        position = bisect_left(self._entries, (query, -1))
+        while position < len(self._entries):
+            key, member_id = self._entries[position]
+            if not key.startswith(query):
+                break
+            names = self._names.get(member_id, ())
+            if key in names:
+                rank = (0 if key == query else 1, len(key))
+            else:
+                rank = (2, len(key))
+            if member_id not in best or rank < best[member_id]:
+                best[member_id] = rank
+            position += 1
+        ordered = sorted(best.items(), key=lambda item: (item[1], item[0]))
+        return [member_id for member_id, _ in ordered[:limit]]
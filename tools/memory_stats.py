@@ -0,0 +1,198 @@
+import asyncio
+import gc
+import os
+import sys
+import time
+import tracemalloc
+import types
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+SKIP_TYPES = (
+    type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+    types.MethodType, types.CodeType, types.FrameType, asyncio.Task, asyncio.Future,
+    asyncio.AbstractEventLoop,
+)
+
+def _is_discord_object(obj) -> bool:
+    return type(obj).__module__.split(".", 1)[0] in ("discord", "aiohttp", "sqlite3")
+
+class SizeWalk:
+    """Resumable walk behind deep_sizeof, so a large graph can be measured a slice at a time"""
+
+    __slots__ = ("stack", "seen", "total", "visited", "max_objects", "truncated")
+
+    def __init__(self, obj, max_objects: int = 200000, seen: Optional[set] = None):
+        self.stack = [obj]
+        self.seen = set() if seen is None else seen
+        self.total = 0
+        self.visited = 0
+        self.max_objects = max_objects
+        self.truncated = False
+
+    @property
+    def done(self) -> bool:
+        return self.truncated or not self.stack
+
+    def step(self, deadline: Optional[float] = None) -> bool:
+        """Walk until finished, out of objects, or past deadline (perf_counter); returns done"""
+        stack = self.stack
+        seen = self.seen
+        while stack:
+            if deadline is not None and not self.visited % 256 and time.perf_counter() > deadline:
+                return False
+            current = stack.pop()
+            marker = id(current)
+            if marker in seen or isinstance(current, SKIP_TYPES) or _is_discord_object(current):
+                continue
+            seen.add(marker)
+            self.visited += 1
+            if self.visited > self.max_objects:
+                self.truncated = True
+                return True
+            try:
+                self.total += sys.getsizeof(current)
+            except TypeError:
+                continue
+            try:
+                if isinstance(current, dict):
+                    for key, value in list(current.items()):
+                        stack.append(key)
+                        stack.append(value)
+                    continue
+                if isinstance(current, (list, tuple, set, frozenset, deque)):
+                    stack.extend(list(current))
+                    continue
+            except RuntimeError:
+                continue
+            if isinstance(current, (str, bytes, bytearray, int, float, bool)) or current is None:
+                continue
+            slots = getattr(type(current), "__slots__", ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            for slot in slots:
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+            if hasattr(current, "__dict__"):
+                stack.append(current.__dict__)
+        return True
+
+def deep_sizeof(obj, max_objects: int = 200000, seen: Optional[set] = None) -> Tuple[int, bool]:
+    """Approximate the retained size of a container graph; returns (bytes, truncated)"""
+    walk = SizeWalk(obj, max_objects, seen)
+    walk.step()
+    return walk.total, walk.truncated
+
+async def deep_sizeof_sliced(obj, max_objects: int = 200000, slice_seconds: float = 0.005) -> Tuple[int, bool]:
+    """deep_sizeof that yields to the event loop every slice_seconds instead of blocking it for the whole walk"""
+    walk = SizeWalk(obj, max_objects)
+    while not walk.step(time.perf_counter() + slice_seconds):
+        await asyncio.sleep(0)
+    return walk.total, walk.truncated
+
+def _state_items(obj, exclude: tuple):
+    for name, value in vars(obj).items():
+        if isinstance(value, exclude) or isinstance(value, SKIP_TYPES) or _is_discord_object(value):
+            continue
+        yield name, value
+
+def object_state_sizes(obj, exclude: tuple = ()) -> Dict[str, int]:
+    """Deep size of each attribute on an object, skipping shared handles like the bot"""
+    return {name: deep_sizeof(value)[0] for name, value in _state_items(obj, exclude)}
+
+async def object_state_sizes_sliced(obj, exclude: tuple = (), max_objects: int = 50000) -> Dict[str, int]:
+    """object_state_sizes for use on the event loop: each attribute is walked in short slices"""
+    sizes = {}
+    for name, value in list(_state_items(obj, exclude)):
+        sizes[name], _ = await deep_sizeof_sliced(value, max_objects)
+    return sizes
+
+def process_rss() -> Optional[int]:
+    """Resident set size in bytes where the platform exposes it"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        pass
+    try:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == "darwin" else usage * 1024
+    except Exception:
+        return None
+
+def format_bytes(size: Optional[float]) -> str:
+    if size is None:
+        return "n/a"
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.1f}{unit}" if unit != "B" else f"{int(size)}B"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+class TracemallocSession:
+    """Start/stop tracemalloc and diff snapshots by allocation site"""
+
+    def __init__(self, frames: int = 10):
+        self.frames = frames
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+        self.started_here = False
+
+    @property
+    def active(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_here = True
+        self.baseline = self._snapshot()
+
+    def stop(self):
+        if self.started_here and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.started_here = False
+        self.baseline = None
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        gc.collect()
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def diff(self, limit: int = 10, key_type: str = "lineno", rebase: bool = True) -> List[tracemalloc.StatisticDiff]:
+        """Top growing allocation sites since the baseline snapshot"""
+        if not tracemalloc.is_tracing() or self.baseline is None:
+            raise RuntimeError("tracemalloc is not running; start it first")
+        current = self._snapshot()
+        stats = current.compare_to(self.baseline, key_type)
+        if rebase:
+            self.baseline = current
+        return [stat for stat in stats if stat.size_diff > 0][:limit]
+
+class GrowthTracker:
+    """Keeps a short history of sizes and reports entries that keep growing"""
+
+    def __init__(self, history: int = 12):
+        self.samples: deque = deque(maxlen=history)
+
+    def add(self, sizes: Dict[str, int]):
+        self.samples.append((time.time(), dict(sizes)))
+
+    def trends(self, min_growth: int = 1024 * 1024) -> List[Tuple[str, int, int]]:
+        """Return (name, first, latest) for entries that grew monotonically by at least min_growth"""
+        if len(self.samples) < 3:
+            return []
+        names = self.samples[-1][1].keys()
+        growing = []
+        for name in names:
+            series = [sizes.get(name) for _, sizes in self.samples if name in sizes]
+            if len(series) < 3:
+                continue
+            if all(b >= a for a, b in zip(series, series[1:])) and series[-1] - series[0] >= min_growth:
+                growing.append((name, series[0], series[-1]))
+        return sorted(growing, key=lambda item: item[2] - item[1], reverse=True)
@@ -0,0 +1,158 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from metrics import REGISTRY
+
+ANY_WEBHOOK = "any"
+
+ROUTE_MESSAGES = REGISTRY.counter(
+    "newlife_message_routes_total",
+    "Messages delivered to each message router route",
+    ("route",),
+)
+ROUTE_ERRORS = REGISTRY.counter(
+    "newlife_message_route_errors_total",
+    "Message router handlers that raised",
+    ("route",),
+)
+
+class Route:
+    """One handler and the keys a message must carry to reach it"""
+
+    __slots__ = ("name", "handler", "channel_id", "webhook", "titles", "bots", "owner", "check", "future",
+                 "delivered", "errors", "total_time")
+
+    def __init__(self, name: str, handler: Optional[Callable[[object], Awaitable]], channel_id: Optional[int] = None,
+                 webhook=None, titles: Tuple[str, ...] = (), bots: Optional[bool] = None, owner: Optional[str] = None,
+                 check: Optional[Callable[[object], bool]] = None, future: Optional[asyncio.Future] = None):
+        self.name = name
+        self.handler = handler
+        self.channel_id = channel_id
+        self.webhook = webhook
+        self.titles = titles
+        self.bots = bots
+        self.owner = owner
+        self.check = check
+        self.future = future
+        self.delivered = 0
+        self.errors = 0
+        self.total_time = 0.0
+
+    def accepts(self, message, webhook_id, is_bot, title) -> bool:
+        if self.webhook is not None and (webhook_id is None or (self.webhook != ANY_WEBHOOK and self.webhook != webhook_id)):
+            return False
+        if self.bots is not None and self.bots != is_bot:
+            return False
+        if self.titles and not any(key in title for key in self.titles):
+            return False
+        return self.check is None or self.check(message)
+
+class MessageRouter:
+    """Classifies each message once and hands it only to routes keyed on its channel or webhook
+
+    Routes are indexed by channel id, by webhook id and under ANY_WEBHOOK;
+    every route needs at least one of those keys, so a message that hits no
+    index bucket is dropped after two dict lookups. Embed titles, bot flags and
+    custom checks only run for the few candidates that survive the lookup.
+    One-shot waiters use the same index in place of bot.wait_for('message').
+    """
+
+    def __init__(self):
+        self.routes: Dict[str, Route] = {}
+        self.by_channel: Dict[int, List[Route]] = {}
+        self.by_webhook: Dict[object, List[Route]] = {}
+        self.seen = 0
+        self.unrouted = 0
+
+    def _index(self, route: Route) -> List[Route]:
+        if route.channel_id is not None:
+            return self.by_channel.setdefault(route.channel_id, [])
+        if route.webhook is not None:
+            return self.by_webhook.setdefault(route.webhook, [])
+        raise ValueError(f"Route '{route.name}' needs a channel_id or webhook key")
+
+    def _add(self, route: Route):
+        self._index(route).append(route)
+
+    def _discard(self, route: Route):
+        bucket = self._index(route)
+        if route in bucket:
+            bucket.remove(route)
+        if not bucket:
+            if route.channel_id is not None:
+                self.by_channel.pop(route.channel_id, None)
+            else:
+                self.by_webhook.pop(route.webhook, None)
+
+    def route(self, name: str, handler: Callable[[object], Awaitable], *, channel_id: Optional[int] = None, webhook=None,
+              titles: Tuple[str, ...] = (), bots: Optional[bool] = None, owner: Optional[str] = None) -> Route:
+        """Register (or replace) a named handler; webhook is a webhook id or ANY_WEBHOOK"""
+        self.unroute(name)
+        route = Route(name, handler, channel_id, webhook, tuple(titles), bots, owner)
+        self._add(route)
+        self.routes[name] = route
+        return route
+
+    def unroute(self, name: str):
+        route = self.routes.pop(name, None)
+        if route is not None:
+            self._discard(route)
+
+    def unroute_owner(self, owner: str):
+        for name in [name for name, route in self.routes.items() if route.owner == owner]:
+            self.unroute(name)
+
+    async def wait_for(self, *, channel_id: Optional[int] = None, webhook=None, check: Optional[Callable[[object], bool]] = None,
+                       bots: Optional[bool] = None, timeout: Optional[float] = None):
+        """Resolve with the next message matching the keys and check; raises asyncio.TimeoutError"""
+        future = asyncio.get_running_loop().create_future()
+        route = Route(f"wait:{id(future)}", None, channel_id, webhook, (), bots, check=check, future=future)
+        self._add(route)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._discard(route)
+
+    def candidates(self, channel_id: int, webhook_id) -> List[Route]:
+        found = self.by_channel.get(channel_id, ())
+        if webhook_id is not None:
+            found = [*found, *self.by_webhook.get(webhook_id, ()), *self.by_webhook.get(ANY_WEBHOOK, ())]
+        return found
+
+    async def dispatch(self, message) -> int:
+        """Deliver a message to every interested route; returns how many accepted it"""
+        self.seen += 1
+        webhook_id = message.webhook_id
+        candidates = self.candidates(message.channel.id, webhook_id)
+        if not candidates:
+            self.unrouted += 1
+            return 0
+        is_bot = message.author.bot
+        title = (message.embeds[0].title or "") if message.embeds else ""
+        delivered = 0
+        for route in list(candidates):
+            try:
+                if not route.accepts(message, webhook_id, is_bot, title):
+                    continue
+            except Exception as e:
+                print(f"❌ Message route '{route.name}' check failed: {type(e).__name__}: {e}")
+                continue
+            delivered += 1
+            if route.future is not None:
+                if not route.future.done():
+                    route.future.set_result(message)
+                continue
+            route.delivered += 1
+            ROUTE_MESSAGES.inc(route.name)
+            started = time.perf_counter()
+            try:
+                await route.handler(message)
+            except Exception as e:
+                route.errors += 1
+                ROUTE_ERRORS.inc(route.name)
+                print(f"❌ Message route '{route.name}' failed: {type(e).__name__}: {e}")
+            route.total_time += time.perf_counter() - started
+        return delivered
+
+ROUTER = MessageRouter()
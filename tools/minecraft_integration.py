@@ -1,15 +1,49 @@
 import asyncio
+import functools
 import struct
 import socket
 import json
 import os
+import re
+from datetime import datetime, timezone
 from typing import Optional
 import discord
 from discord.ext import commands
 from aiohttp import web
 import threading
-from config import RCON_CONSOLE_CHANNEL_ID, RCON_MSG_CHANNEL_ID, RCON_VOTE_CHANNEL_ID, RCON_RESPONSE_CHANNEL_ID
+import time
+from config import RCON_CONSOLE_CHANNEL_ID, RCON_MSG_CHANNEL_ID, RCON_VOTE_CHANNEL_ID, RCON_RESPONSE_CHANNEL_ID, METRICS_ALLOWED_IPS, METRICS_TOKEN
 from bot import bot_log
+from vote_stats import VoteStatsStore
+from vote_outbox import MAX_DELIVERY_ATTEMPTS, VoteOutbox
+from checkpoint import Checkpointer
+from metrics import REGISTRY, scrape_allowed
+from perf import TRACKER
+from supervisor import SUPERVISOR, RESTART_ON_FAILURE
+from message_router import ANY_WEBHOOK, ROUTER
+
+RCON_ROUND_TRIP = REGISTRY.histogram(
+    "newlife_rcon_round_trip_seconds",
+    "RCON command round-trip time",
+    ("command",),
+)
+UNPARSED_VOTES = REGISTRY.counter(
+    "newlife_votes_unparsed_total",
+    "Vote notifications announced without a parsed player, and so left out of vote stats",
+)
+RCON_ERRORS = REGISTRY.counter(
+    "newlife_rcon_errors_total",
+    "RCON failures by stage",
+    ("stage",),
+)
+VOTE_POLL_LAG = REGISTRY.gauge(
+    "newlife_vote_poll_lag_seconds",
+    "Age of the newest divotelog entry when it was picked up",
+)
+VOTE_POLL_LAST_SUCCESS = REGISTRY.gauge(
+    "newlife_vote_poll_last_success_timestamp_seconds",
+    "Unix time of the last successful divotelog poll",
+)
 
 class MinecraftRCON:
     """RCON client for Minecraft server communication"""
@@ -44,6 +78,7 @@ class MinecraftRCON:
                 return True
 
             except (ConnectionRefusedError, socket.timeout, Exception) as e:
+                RCON_ERRORS.inc("connect")
                 if attempt < max_retries - 1:
                     print(f"❌ Connection attempt {attempt + 1} failed, retrying in 30s...")
                     await asyncio.sleep(30)
@@ -67,10 +102,15 @@ class MinecraftRCON:
 
         for attempt in (1, 2):
             try:
+                started = time.perf_counter()
                 response = await self._send_packet(2, command)
+                elapsed = time.perf_counter() - started
+                RCON_ROUND_TRIP.observe(elapsed, command.split(' ', 1)[0])
+                TRACKER.add("rcon", elapsed)
                 await bot_log(f"[RCON] Command sent: {command} | Response: {str(response)[:100]}")
                 return response
             except Exception as e:
+                RCON_ERRORS.inc("command")
                 await bot_log(f"[RCON] Error sending command '{command}': {e}", error=True, exc_info=e)
                 try:
                     await self.disconnect()
@@ -138,9 +178,8 @@ class MinecraftIntegration(commands.Cog):
         self.msg_channel = None
         self.status_channel = None
         self.vote_state_path = os.path.join("data", "vote_state.json")
-        self.vote_state = {}
+        self.vote_checkpoint = Checkpointer(self.vote_state_path, flush_interval=5.0, flush_every=50)
         self.rcon_key = None
-        self._vote_poll_initialized = False
 
         self.retry_task = None
         self.monitoring_task = None
@@ -149,6 +188,31 @@ class MinecraftIntegration(commands.Cog):
         self.rcon_poll_seq = 0
         self.debug_votes = False
 
+        self.vote_stats = None
+        try:
+            self.vote_stats = VoteStatsStore(os.path.join("data", "votes.db"))
+        except Exception as e:
+            print(f"⚠️ Failed to open vote stats database: {e}")
+
+        self.vote_outbox = None
+        self.outbox_task = None
+        self._outbox_wakeup = asyncio.Event()
+        self._vote_db_calls = set()
+        try:
+            self.vote_outbox = VoteOutbox(os.path.join("data", "votes.db"))
+        except Exception as e:
+            print(f"⚠️ Failed to open vote outbox: {e}")
+        REGISTRY.gauge(
+            "newlife_vote_outbox_pending",
+            "Vote announcements waiting for delivery",
+            fn=lambda: self.vote_outbox.pending_count() if self.vote_outbox else None,
+        )
+        REGISTRY.gauge(
+            "newlife_vote_outbox_dead",
+            "Vote announcements abandoned after too many failed deliveries",
+            fn=lambda: self.vote_outbox.dead_count() if self.vote_outbox else None,
+        )
+
         self.load_minecraft_config()
 
     def load_minecraft_config(self):
@@ -168,7 +232,6 @@ class MinecraftIntegration(commands.Cog):
                         password=config.get('MC_RCON_PASSWORD', '')
                     )
                     self.rcon_key = f"{self.rcon.host}:{self.rcon.port}"
-                    self._load_vote_state()
                     saved_seq = self._get_saved_last_seq()
                     if saved_seq:
                         self.rcon_poll_seq = saved_seq
@@ -190,7 +253,22 @@ class MinecraftIntegration(commands.Cog):
             await bot_log(f"[RCON] Failed to load config or initialize RCON: {error}", error=True, exc_info=error)
 
     async def cog_load(self):
-        """Initialize RCON connection and create channels when cog loads"""
+        """Start the vote server now and defer channel and RCON setup until the bot is ready"""
+        if self.vote_outbox:
+            self.outbox_task = SUPERVISOR.supervise(
+                "vote-outbox", self.deliver_vote_outbox, owner="MinecraftIntegration", base_delay=5
+            ).task
+        await self.start_vote_server()
+        SUPERVISOR.spawn(self.connect_when_ready(), name="rcon-startup", owner="MinecraftIntegration")
+        ROUTER.route("mc-server-started", self.on_server_started, webhook=ANY_WEBHOOK, titles=("Server Started",), owner="MinecraftIntegration")
+        ROUTER.route("mc-server-stopped", self.on_server_stopped, webhook=ANY_WEBHOOK, titles=("Server Stopped",), owner="MinecraftIntegration")
+        ROUTER.route("mc-private-message", self.relay_private_message, webhook=ANY_WEBHOOK,
+                     titles=("/msg Command", "Private Message"), owner="MinecraftIntegration")
+        ROUTER.route("mc-admin-command", self.relay_admin_command, webhook=ANY_WEBHOOK, titles=("Admin Command",), owner="MinecraftIntegration")
+
+    async def connect_when_ready(self):
+        """Resolve channels and open the RCON connection once the gateway cache is available"""
+        await self.bot.wait_until_ready()
         await self.setup_channels()
         try:
             if self.rcon:
@@ -202,53 +280,29 @@ class MinecraftIntegration(commands.Cog):
         if self.rcon:
             connected = await self.rcon.connect()
             if not connected:
-                self.retry_task = asyncio.create_task(self.retry_connection())
+                self.retry_task = SUPERVISOR.supervise(
+                    "rcon-retry", self.retry_connection, owner="MinecraftIntegration", restart=RESTART_ON_FAILURE
+                ).task
             else:
-                self.monitoring_task = asyncio.create_task(self.poll_vote_logs())
-        await self.start_vote_server()
-
-    def _load_vote_state(self):
-        try:
-            if os.path.exists(self.vote_state_path):
-                with open(self.vote_state_path, 'r') as f:
-                    self.vote_state = json.load(f)
-            else:
-                self.vote_state = {}
-        except Exception as e:
-            print(f"⚠️ Failed to load vote state: {e}")
-            self.vote_state = {}
-
-    def _save_vote_state(self):
-        try:
-            os.makedirs(os.path.dirname(self.vote_state_path), exist_ok=True)
-            with open(self.vote_state_path, 'w') as f:
-                json.dump(self.vote_state, f, indent=2)
-        except Exception as e:
-            print(f"⚠️ Failed to save vote state: {e}")
+                self.start_vote_polling()
 
     def _get_saved_last_seq(self) -> int:
         try:
-            if self.rcon_key and self.vote_state.get(self.rcon_key):
-                return int(self.vote_state[self.rcon_key].get('last_seq', 0))
+            if self.rcon_key:
+                return int(self.vote_checkpoint.get(self.rcon_key, 'last_seq', 0) or 0)
         except Exception:
             pass
         return 0
 
-    def _update_last_seq(self, seq: int):
+    def _update_last_seq(self, seq: int, entries: int = 1):
         if not self.rcon_key:
             return
-        try:
-            entry = self.vote_state.get(self.rcon_key, {})
-            if 'last_seq' not in entry or int(entry['last_seq']) < seq:
-                self.vote_state[self.rcon_key] = {
-                    'last_seq': int(seq),
-                    'updated_at': discord.utils.utcnow().isoformat()
-                }
-                self._save_vote_state()
-                if self.debug_votes:
-                    print(f"💾 [VOTE-DEBUG] Persisted last_seq={seq} for {self.rcon_key}")
-        except Exception as e:
-            print(f"⚠️ Failed to update last_seq persistence: {e}")
+        if int(self.vote_checkpoint.get(self.rcon_key, 'last_seq', 0) or 0) >= seq:
+            return
+        self.vote_checkpoint.update(
+            self.rcon_key, entries=entries,
+            last_seq=int(seq), updated_at=discord.utils.utcnow().isoformat()
+        )
 
     async def setup_channels(self):
         """Setup channels using specific channel IDs"""
@@ -292,6 +346,7 @@ class MinecraftIntegration(commands.Cog):
         try:
             app = web.Application()
             app.router.add_post('/vote-notification', self.handle_vote_notification)
+            app.router.add_get('/metrics', self.handle_metrics)
 
             runner = web.AppRunner(app)
             await runner.setup()
@@ -306,177 +361,223 @@ class MinecraftIntegration(commands.Cog):
             print(f"❌ Failed to start vote server: {e}")
             print("Vote notifications will not work until this is resolved")
 
+    async def handle_metrics(self, request):
+        """Expose bot metrics in Prometheus text format to allowlisted addresses holding METRICS_TOKEN"""
+        if not scrape_allowed(request.remote, request.headers.get("Authorization"), METRICS_TOKEN, METRICS_ALLOWED_IPS):
+            return web.Response(status=403, text="Forbidden\n")
+        return web.Response(text=REGISTRY.render(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Content-Type-Options": "nosniff"})
+
     async def handle_vote_notification(self, request):
         """Handle incoming vote notifications from Minecraft plugin"""
         try:
             data = await request.json()
-            channel_id = int(data.get('channel_id', self.vote_channel_id))
-            embed_data = data.get('embed', {})
+            description = data.get('embed', {}).get('description', '') or ''
 
-            vote_channel = self.bot.get_channel(channel_id)
-            if not vote_channel:
-                print(f"❌ Vote channel {channel_id} not found!")
-                return web.Response(text="Channel not found", status=404)
+            player_match = re.search(r"Player:\*\*\s*`([^`]+)`", description)
+            service_match = re.search(r"Vote Site:\*\*\s*([^\n]+)", description)
+            player_name = player_match.group(1) if player_match else "unknown"
+            service_name = service_match.group(1).strip() if service_match else "unknown"
+
+            event_id = await self.enqueue_vote(player_name, service_name, "http", payload=data, dedupe=bool(player_match))
+            if event_id is None:
+                return web.Response(text="Duplicate vote ignored", status=200)
+
+            return web.Response(text="Vote notification queued", status=200)
+
+        except Exception as e:
+            print(f"❌ Error handling vote notification: {e}")
+            return web.Response(text="Internal server error", status=500)
+
+    async def run_vote_db(self, fn, *args):
+        """Run a vote database call in a worker thread that cog_unload waits for before closing the connections"""
+        future = asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args))
+        self._vote_db_calls.add(future)
+        future.add_done_callback(self._vote_db_calls.discard)
+        return await asyncio.shield(future)
+
+    async def record_vote(self, player_name, service_name, source, voted_at=None):
+        """Add a parsed vote to the statistics ledger, dated when the vote happened if known"""
+        if not self.vote_stats:
+            return
+        try:
+            with TRACKER.timed("disk"):
+                await self.run_vote_db(self.vote_stats.record_vote, player_name, service_name, source, voted_at)
+        except Exception as e:
+            print(f"⚠️ Failed to record vote stats for {player_name}: {e}")
 
+    async def count_vote(self, player_name, service_name, source, voted_at, parsed):
+        if parsed:
+            await self.record_vote(player_name, service_name, source, voted_at)
+        else:
+            UNPARSED_VOTES.inc()
+
+    async def enqueue_vote(self, player_name, service_name, source, source_key=None, seq=None, event_at=None, payload=None, dedupe=True):
+        """Durably record a vote in the outbox and wake the sender; returns None for duplicates
+
+        dedupe=False marks a vote whose player could not be parsed: it is still announced,
+        but only counted in UNPARSED_VOTES so "unknown" never reaches the leaderboard.
+        """
+        if not self.vote_outbox:
+            await self.announce_vote({"player": player_name, "service": service_name, "payload": payload})
+            await self.count_vote(player_name, service_name, source, event_at, dedupe)
+            return 0
+
+        with TRACKER.timed("disk"):
+            event_id = await self.run_vote_db(
+                self.vote_outbox.enqueue, player_name, service_name, source,
+                source_key, seq, event_at, payload, dedupe
+            )
+        if event_id is None:
+            if self.debug_votes:
+                print(f"♻️ [VOTE-DEBUG] Duplicate vote suppressed: {player_name} from {service_name} via {source}")
+            return None
+
+        await self.count_vote(player_name, service_name, source, event_at, dedupe)
+        self._outbox_wakeup.set()
+        return event_id
+
+    def build_vote_embed(self, player_name, service_name):
+        """Build the announcement embed for a parsed vote"""
+        if "planetminecraft" in service_name.lower() or "pmc" in service_name.lower():
+            description = (f"**🗳️ Thank you {player_name} for voting for us on PMC!**\n\n"
+                         f"🌟 **Your vote helps our server grow!**\n"
+                         f"🎮 **Player:** `{player_name}`\n"
+                         f"📊 **Vote Site:** PlanetMinecraft.com\n\n"
+                         f"**[🔗 Vote for us on PMC!](https://www.planetminecraft.com/server/the-new-life/)**\n\n"
+                         f"💰 *Vote rewards have been automatically given!*")
+        else:
+            description = (f"**🗳️ Thank you {player_name} for voting!**\n\n"
+                         f"🎮 **Player:** `{player_name}`\n"
+                         f"📊 **Vote Site:** {service_name}\n\n"
+                         f"💰 *Vote rewards have been automatically given!*")
+
+        embed = discord.Embed(
+            title="🗳️ New Vote Received!",
+            description=description,
+            color=0x00D4AA,
+            timestamp=discord.utils.utcnow()
+        )
+        embed.set_footer(text="Vote System • Minecraft Server")
+        return embed
+
+    async def announce_vote(self, event):
+        """Send one vote event to the vote channel, raising if Discord does not accept it"""
+        payload = event.get("payload") or {}
+        channel_id = int(payload.get('channel_id', self.vote_channel_id))
+        vote_channel = self.bot.get_channel(channel_id)
+        if not vote_channel:
+            raise RuntimeError(f"Vote channel {channel_id} not found")
+
+        embed_data = payload.get('embed')
+        if embed_data:
             embed = discord.Embed(
                 title=embed_data.get('title', 'Vote Received'),
                 description=embed_data.get('description', 'Thank you for voting!'),
                 color=embed_data.get('color', 0x00D4AA)
             )
-
             if 'timestamp' in embed_data:
                 embed.timestamp = discord.utils.utcnow()
-
             if 'footer' in embed_data and embed_data['footer'].get('text'):
                 embed.set_footer(text=embed_data['footer']['text'])
+        else:
+            embed = self.build_vote_embed(event["player"], event["service"])
+
+        await vote_channel.send(embed=embed)
+        if self.debug_votes:
+            print(f"✅ [VOTE-DEBUG] Vote notification sent for {event['player']} to #{getattr(vote_channel, 'name', 'unknown')}")
+
+    async def deliver_vote_outbox(self):
+        """Send pending outbox events, marking each delivered only after Discord accepts it"""
+        await self.bot.wait_until_ready()
+        while True:
+            SUPERVISOR.heartbeat()
+            try:
+                self._outbox_wakeup.clear()
+                events = await self.run_vote_db(self.vote_outbox.pending, 20)
+                if not events:
+                    try:
+                        await asyncio.wait_for(self._outbox_wakeup.wait(), timeout=30)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                for event in events:
+                    try:
+                        await self.announce_vote(event)
+                    except Exception as e:
+                        dead = await self.run_vote_db(self.vote_outbox.mark_failed, event["id"], str(e))
+                        print(f"❌ Vote delivery failed for outbox event {event['id']}: {e}")
+                        if dead:
+                            print(f"☠️ Vote outbox event {event['id']} dead-lettered after {MAX_DELIVERY_ATTEMPTS} attempts")
+                            await bot_log(f"[Votes] Gave up announcing the vote by {event['player']} on {event['service']} "
+                                          f"(outbox event {event['id']}) after {MAX_DELIVERY_ATTEMPTS} attempts: {e}", error=True)
+                            continue
+                        await asyncio.sleep(5)
+                        break
+                    await self.run_vote_db(self.vote_outbox.mark_delivered, event["id"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Vote outbox delivery error: {e}")
+                await asyncio.sleep(5)
 
-            await vote_channel.send(embed=embed)
-            print(f"✅ Vote notification sent to #{getattr(vote_channel, 'name', 'unknown')} (ID: {getattr(vote_channel, 'id', 'n/a')})")
+    def parse_vote_line(self, console_message):
+        """Extract (player, service, source) from a Votifier or VotingPlugin console line"""
+        lower = console_message.lower()
+        if ("[votifier]" in lower) or ("protocol v1 vote record" in lower and "vote (from:" in lower):
+            vote_match = re.search(r"Vote \(from:([^\s]+) username:([^\s]+) address:", console_message, re.IGNORECASE)
+            if vote_match:
+                return vote_match.group(2), vote_match.group(1), "votifier"
+            if self.debug_votes:
+                print(f"⚠️ [VOTE-DEBUG] Could not parse Votifier message: {console_message}")
+            return None
 
-            return web.Response(text="Vote notification sent", status=200)
+        if "[votingplugin]" in lower or ("received a vote from service site" in lower and "by player" in lower):
+            match = re.search(r"service site '([^']+)' by player '([^']+)'", console_message, re.IGNORECASE)
+            if match:
+                return match.group(2), match.group(1), "votingplugin"
+            if self.debug_votes:
+                print(f"⚠️ [VOTE-DEBUG] Could not parse VotingPlugin message: {console_message}")
+            return None
 
-        except Exception as e:
-            print(f"❌ Error handling vote notification: {e}")
-            return web.Response(text="Internal server error", status=500)
+        if self.debug_votes:
+            print("ℹ️ [VOTE-DEBUG] Message did not match any known vote patterns.")
+        return None
 
-    async def process_vote_from_console(self, console_message):
+    async def process_vote_from_console(self, console_message, record=True):
         """Process vote notifications from console messages (fallback method)"""
         try:
             if self.debug_votes:
                 print(f"🔍 [VOTE-DEBUG] Processing console message: {console_message}")
-            lower = console_message.lower()
+            parsed = self.parse_vote_line(console_message)
+            if not parsed:
+                return
+            player_name, service_name, source = parsed
             if self.debug_votes:
-                print(f"🔎 [VOTE-DEBUG] Lowercase check: '{lower[:120]}...' ")
-
-            if ("[votifier]" in lower) or ("protocol v1 vote record" in lower and "vote (from:" in lower):
-                if self.debug_votes:
-                    print(f"🎯 [VOTE-DEBUG] Detected Votifier-style message (tagged: {'[votifier]' in lower})")
-                import re
-
-                pattern = r"Vote \(from:([^\s]+) username:([^\s]+) address:"
-                if self.debug_votes:
-                    print(f"🧩 [VOTE-DEBUG] Using regex: {pattern}")
-                vote_match = re.search(pattern, console_message, re.IGNORECASE)
-                if vote_match:
-                    service_name = vote_match.group(1)
-                    player_name = vote_match.group(2)
-                    if self.debug_votes:
-                        print(f"✅ [VOTE-DEBUG] Parsed Votifier vote - Service: '{service_name}', Player: '{player_name}'")
-
-                    vote_channel = self.bot.get_channel(self.vote_channel_id)
-                    if not vote_channel:
-                        if self.debug_votes:
-                            print(f"❌ [VOTE-DEBUG] Vote channel {self.vote_channel_id} not found!")
-                        return
+                print(f"✅ [VOTE-DEBUG] Parsed {source} vote - Service: '{service_name}', Player: '{player_name}'")
 
-                    if "planetminecraft" in service_name.lower() or "pmc" in service_name.lower():
-                        if self.debug_votes:
-                            print(f"🌟 [VOTE-DEBUG] Processing PMC vote for {player_name}")
-                        description = (f"**🗳️ Thank you {player_name} for voting for us on PMC!**\n\n"
-                                     f"🌟 **Your vote helps our server grow!**\n"
-                                     f"🎮 **Player:** `{player_name}`\n"
-                                     f"📊 **Vote Site:** PlanetMinecraft.com\n\n"
-                                     f"**[🔗 Vote for us on PMC!](https://www.planetminecraft.com/server/the-new-life/)**\n\n"
-                                     f"💰 *Vote rewards have been automatically given!*")
-
-                        embed = discord.Embed(
-                            title="🗳️ New Vote Received!",
-                            description=description,
-                            color=0x00D4AA,
-                            timestamp=discord.utils.utcnow()
-                        )
-                        embed.set_footer(text="Vote System • Minecraft Server")
-
-                        await vote_channel.send(embed=embed)
-                        if self.debug_votes:
-                            print(f"✅ [VOTE-DEBUG] PMC vote notification sent for {player_name}")
-                    else:
-                        if self.debug_votes:
-                            print(f"🎮 [VOTE-DEBUG] Processing generic vote for {player_name} from {service_name}")
-                        description = (f"**🗳️ Thank you {player_name} for voting!**\n\n"
-                                     f"🎮 **Player:** `{player_name}`\n"
-                                     f"📊 **Vote Site:** {service_name}\n\n"
-                                     f"💰 *Vote rewards have been automatically given!*")
-
-                        embed = discord.Embed(
-                            title="🗳️ New Vote Received!",
-                            description=description,
-                            color=0x00D4AA,
-                            timestamp=discord.utils.utcnow()
-                        )
-                        embed.set_footer(text="Vote System • Minecraft Server")
-
-                        await vote_channel.send(embed=embed)
-                        if self.debug_votes:
-                            print(f"✅ [VOTE-DEBUG] Generic vote notification sent for {player_name} from {service_name}")
-                else:
-                    if self.debug_votes:
-                        print(f"⚠️ [VOTE-DEBUG] Could not parse Votifier message format with pattern: {pattern}")
-                        print(f"   Raw message: {console_message}")
+            if record:
+                await self.enqueue_vote(player_name, service_name, source)
                 return
 
-            if "[votingplugin]" in lower or ("received a vote from service site" in lower and "by player" in lower):
-                if self.debug_votes:
-                    print(f"🎯 [VOTE-DEBUG] Detected VotingPlugin-style message")
-                import re
-                match = re.search(r"service site '([^']+)' by player '([^']+)'", console_message, re.IGNORECASE)
-                if match:
-                    service_name = match.group(1)
-                    player_name = match.group(2)
-
-                    vote_channel = self.bot.get_channel(self.vote_channel_id)
-                    if not vote_channel:
-                        if self.debug_votes:
-                            print(f"❌ Vote channel {self.vote_channel_id} not found!")
-                        return
-
-                    if "planetminecraft" in service_name.lower() or "pmc" in service_name.lower():
-                        description = f"**🗳️ Thank you {player_name} for voting for us on PMC!**\n\n" \
-                                    f"🌟 **Your vote helps our server grow!**\n" \
-                                    f"🎮 **Player:** `{player_name}`\n" \
-                                    f"📊 **Vote Site:** PlanetMinecraft.com\n\n" \
-                                    f"**[🔗 Vote for us on PMC!](https://www.planetminecraft.com/server/the-new-life/)**\n\n" \
-                                    f"💰 *Vote rewards have been automatically given!*"
-
-                        embed = discord.Embed(
-                            title="🗳️ New Vote Received!",
-                            description=description,
-                            color=0x00D4AA,
-                            timestamp=discord.utils.utcnow()
-                        )
-                        embed.set_footer(text="Vote System • Minecraft Server")
-
-                        await vote_channel.send(embed=embed)
-                        if self.debug_votes:
-                            print(f"✅ PMC vote notification sent for {player_name}")
-                    else:
-                        description = f"**🗳️ Thank you {player_name} for voting!**\n\n" \
-                                    f"🎮 **Player:** `{player_name}`\n" \
-                                    f"📊 **Vote Site:** {service_name}\n\n" \
-                                    f"💰 *Vote rewards have been automatically given!*"
-
-                        embed = discord.Embed(
-                            title="🗳️ New Vote Received!",
-                            description=description,
-                            color=0x00D4AA,
-                            timestamp=discord.utils.utcnow()
-                        )
-                        embed.set_footer(text="Vote System • Minecraft Server")
-
-                        await vote_channel.send(embed=embed)
-                        if self.debug_votes:
-                            print(f"✅ Vote notification sent for {player_name} from {service_name}")
-                else:
-                    if self.debug_votes:
-                        print("⚠️ [VOTE-DEBUG] Could not parse VotingPlugin message with expected pattern")
-                        print(f"   Raw message: {console_message}")
-            else:
+            vote_channel = self.bot.get_channel(self.vote_channel_id)
+            if not vote_channel:
                 if self.debug_votes:
-                    print("ℹ️ [VOTE-DEBUG] Message did not match any known vote patterns.")
+                    print(f"❌ [VOTE-DEBUG] Vote channel {self.vote_channel_id} not found!")
+                return
+            await vote_channel.send(embed=self.build_vote_embed(player_name, service_name))
 
         except Exception as e:
             print(f"❌ Error processing vote from console: {e}")
 
+    def start_vote_polling(self):
+        """Start the divotelog poller unless it is already running"""
+        if self.monitoring_task and not self.monitoring_task.done():
+            return
+        self.monitoring_task = SUPERVISOR.supervise(
+            "vote-poller", self.poll_vote_logs, owner="MinecraftIntegration", base_delay=5
+        ).task
+
     async def retry_connection(self):
         """Retry RCON connection every 5 minutes"""
         while True:
@@ -485,20 +586,30 @@ class MinecraftIntegration(commands.Cog):
                 print("🔄 Retrying RCON connection...")
                 if await self.rcon.connect():
                     print("✅ RCON reconnected successfully!")
-                    if not self.monitoring_task or self.monitoring_task.done():
-                        self.monitoring_task = asyncio.create_task(self.poll_vote_logs())
+                    self.start_vote_polling()
                     break
 
     async def cog_unload(self):
         """Cleanup RCON connection when cog unloads"""
-        if self.retry_task:
-            self.retry_task.cancel()
-        if self.monitoring_task:
-            self.monitoring_task.cancel()
+        SUPERVISOR.cancel_owner("MinecraftIntegration")
+        ROUTER.unroute_owner("MinecraftIntegration")
+        try:
+            await self.vote_checkpoint.flush()
+        except Exception as e:
+            print(f"⚠️ Failed to flush vote checkpoint: {e}")
         if self.rcon:
             await self.rcon.disconnect()
         if self.vote_server:
             await self.vote_server.cleanup()
+        waiting = [task for task in (self.outbox_task,) if task] + list(self._vote_db_calls)
+        if waiting:
+            _, still_running = await asyncio.wait(waiting, timeout=10)
+            if still_running:
+                print(f"⚠️ {len(still_running)} vote database call(s) still running at unload")
+        if self.vote_stats:
+            self.vote_stats.close()
+        if self.vote_outbox:
+            self.vote_outbox.close()
 
     @commands.command(name='testchannels')
     @commands.has_any_role(1376432927444963420, 1374421915938324583)
@@ -612,13 +723,25 @@ class MinecraftIntegration(commands.Cog):
 
     @commands.command(name='linkcheck')
     @commands.has_any_role(1376432927444963420, 1374421915938324583)
-    async def check_linked_accounts(self, ctx, user: discord.Member):
+    async def check_linked_accounts(self, ctx, *, target: str):
         """Show all linked Minecraft accounts for a user"""
         linking_cog = self.bot.get_cog("MinecraftLinking")
         if not linking_cog:
             await ctx.send("❌ Linking system not available!")
             return
 
+        directory = self.bot.get_cog("Members")
+        if directory and ctx.guild:
+            user = await directory.resolve(ctx.guild, target)
+        else:
+            try:
+                user = await commands.MemberConverter().convert(ctx, target)
+            except commands.BadArgument:
+                user = None
+        if user is None:
+            await ctx.send(f"❌ No member found matching `{target}`")
+            return
+
         mc_usernames = linking_cog.get_minecraft_usernames(str(user.id))
 
         if not mc_usernames:
@@ -651,7 +774,7 @@ class MinecraftIntegration(commands.Cog):
             await ctx.send("❌ Linking system not available!")
             return
 
-        success = linking_cog.remove_link(str(user.id), minecraft_name)
+        success = await linking_cog.remove_link(str(user.id), minecraft_name)
 
         if success:
             embed = discord.Embed(
@@ -681,7 +804,7 @@ class MinecraftIntegration(commands.Cog):
             await ctx.send("❌ Linking system not available!")
             return
 
-        linking_cog.add_link(str(user.id), minecraft_name)
+        await linking_cog.add_link(str(user.id), minecraft_name)
 
         embed = discord.Embed(
             title="🔗 Manual Link Created",
@@ -781,41 +904,35 @@ class MinecraftIntegration(commands.Cog):
         else:
             print(f"⚠️ Status channel not available for logging: {status} -> {message}")
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        """Listen for server status messages from webhooks (reduced noise)"""
-        if not getattr(message, 'webhook_id', None):
-            return
+    async def on_server_started(self, message):
+        """Routed: server start webhook"""
+        await self.log_server_status("start", "The Minecraft server has come online!")
 
-        if message.embeds:
-            embed = message.embeds[0]
-            title = embed.title or ""
-            description = embed.description or ""
-
-            if "Server Started" in title:
-                await self.log_server_status("start", "The Minecraft server has come online!")
-            elif "Server Stopped" in title:
-                await self.log_server_status("stop", "The Minecraft server has gone offline!")
-
-            elif "/msg Command" in title or "Private Message" in title:
-                if self.msg_channel:
-                    clean_embed = discord.Embed(
-                        title="💬 Private Message",
-                        description=description,
-                        color=discord.Color.blue(),
-                        timestamp=discord.utils.utcnow()
-                    )
-                    await self.msg_channel.send(embed=clean_embed)
-
-            elif "Admin Command" in title:
-                if self.console_channel:
-                    clean_embed = discord.Embed(
-                        title="⚡ Admin Command Executed",
-                        description=description,
-                        color=discord.Color.red(),
-                        timestamp=discord.utils.utcnow()
-                    )
-                    await self.console_channel.send(embed=clean_embed)
+    async def on_server_stopped(self, message):
+        """Routed: server stop webhook"""
+        await self.log_server_status("stop", "The Minecraft server has gone offline!")
+
+    async def relay_private_message(self, message):
+        """Routed: /msg webhook, reposted to the message channel"""
+        if self.msg_channel:
+            clean_embed = discord.Embed(
+                title="💬 Private Message",
+                description=message.embeds[0].description or "",
+                color=discord.Color.blue(),
+                timestamp=discord.utils.utcnow()
+            )
+            await self.msg_channel.send(embed=clean_embed)
+
+    async def relay_admin_command(self, message):
+        """Routed: admin command webhook, reposted to the console channel"""
+        if self.console_channel:
+            clean_embed = discord.Embed(
+                title="⚡ Admin Command Executed",
+                description=message.embeds[0].description or "",
+                color=discord.Color.red(),
+                timestamp=discord.utils.utcnow()
+            )
+            await self.console_channel.send(embed=clean_embed)
 
     async def poll_vote_logs(self):
         """Continuously poll Minecraft via RCON for recent vote-related console lines."""
@@ -823,6 +940,7 @@ class MinecraftIntegration(commands.Cog):
         if self.debug_votes:
             print("📡 Starting RCON vote log polling...")
         while True:
+            SUPERVISOR.heartbeat()
             try:
                 if not self.rcon:
                     await asyncio.sleep(10)
@@ -845,32 +963,41 @@ class MinecraftIntegration(commands.Cog):
                         print(f"⚠️ [POLL-DEBUG] Parsed JSON is not a list: {type(data)}")
                     await asyncio.sleep(2)
                     continue
-                if not self._vote_poll_initialized:
-                    self._vote_poll_initialized = True
-                    if self.rcon_poll_seq == 0 and data:
-                        max_seq = max((entry.get('seq', 0) or 0) for entry in data)
-                        if max_seq:
-                            if self.debug_votes:
-                                print(f"⏭️  [POLL-DEBUG] Skipping initial backlog up to seq={max_seq}")
-                            self.rcon_poll_seq = max_seq
-                            self._update_last_seq(max_seq)
-                            await asyncio.sleep(2)
-                            continue
+                VOTE_POLL_LAST_SUCCESS.set(time.time())
                 if self.debug_votes:
                     print(f"📥 [POLL-DEBUG] Received {len(data)} vote log entr{'y' if len(data)==1 else 'ies'} (afterSeq={self.rcon_poll_seq})")
+                page_max = self.rcon_poll_seq
                 for entry in data:
-                    seq = entry.get('seq', 0)
+                    seq = entry.get('seq', 0) or 0
                     line = entry.get('line', '')
-                    if seq <= self.rcon_poll_seq:
+                    if seq <= page_max:
                         continue
-                    self.rcon_poll_seq = seq
-                    self._update_last_seq(self.rcon_poll_seq)
-                    if line:
+                    parsed = self.parse_vote_line(line) if line else None
+                    if parsed:
+                        player_name, service_name, source = parsed
+                        entry_time = entry.get('time')
+                        event_at = datetime.fromtimestamp(entry_time / 1000, timezone.utc) if entry_time else None
+                        if entry_time:
+                            VOTE_POLL_LAG.set(max(0.0, time.time() - entry_time / 1000))
                         if self.debug_votes:
-                            print(f"➡️  [POLL-DEBUG] Processing seq={seq}: {line}")
-                        await self.process_vote_from_console(line)
+                            print(f"➡️  [POLL-DEBUG] Queueing seq={seq}: {line}")
+                        await self.enqueue_vote(
+                            player_name, service_name, source,
+                            source_key=f"rcon:{self.rcon_key}:{seq}:{entry_time}",
+                            seq=seq, event_at=event_at
+                        )
+                    page_max = seq
+                if page_max > self.rcon_poll_seq:
+                    self._update_last_seq(page_max, entries=page_max - self.rcon_poll_seq)
+                    self.rcon_poll_seq = page_max
+                try:
+                    if await self.vote_checkpoint.maybe_flush() and self.debug_votes:
+                        print(f"💾 [VOTE-DEBUG] Persisted last_seq={self.rcon_poll_seq} for {self.rcon_key}")
+                except Exception as e:
+                    print(f"⚠️ Failed to flush vote checkpoint: {e}")
                 await asyncio.sleep(2)
             except Exception as e:
+                RCON_ERRORS.inc("poll")
                 print(f"❌ RCON vote log polling error: {e}")
                 await asyncio.sleep(5)
 
@@ -1090,7 +1217,7 @@ class MinecraftIntegration(commands.Cog):
             await ctx.send(f"🧪 Testing VotingPlugin format for **{player_name}**...")
 
         print(f"🧪 [TEST-DEBUG] Simulating vote message: {fake_console_message}")
-        await self.process_vote_from_console(fake_console_message)
+        await self.process_vote_from_console(fake_console_message, record=False)
         await ctx.send(f"✅ Test complete! Check console for debug output.")
 
     @commands.command(name='testrealvote')
@@ -1101,7 +1228,7 @@ class MinecraftIntegration(commands.Cog):
 
         await ctx.send("🧪 Testing with your exact console message...")
         print(f"🧪 [REAL-TEST-DEBUG] Processing real message: {real_message}")
-        await self.process_vote_from_console(real_message)
+        await self.process_vote_from_console(real_message, record=False)
         await ctx.send("✅ Real test complete! Check console for debug output.")
 
     @commands.command(name='votesetup')
@@ -1116,9 +1243,17 @@ class MinecraftIntegration(commands.Cog):
 
         vote_channel = self.bot.get_channel(self.vote_channel_id)
         vote_status = f"<#{vote_channel.id}>" if vote_channel else f"Not found (ID: {self.vote_channel_id})"
+        status = f"• **Vote Channel:** {vote_status}"
+        if self.vote_outbox:
+            pending = await self.run_vote_db(self.vote_outbox.pending_count)
+            dead = await self.run_vote_db(self.vote_outbox.dead_letters, 3)
+            dead_total = await self.run_vote_db(self.vote_outbox.dead_count)
+            status += f"\n• **Outbox:** {pending} pending, {dead_total} dead-lettered"
+            for event in dead:
+                status += f"\n  ☠️ `{event['player']}` on {event['service']}: {(event['last_error'] or 'unknown error')[:80]}"
         embed.add_field(
             name="📋 Current Status",
-            value=f"• **Vote Channel:** {vote_status}",
+            value=status[:1024],
             inline=False,
         )
 
@@ -1153,5 +1288,62 @@ class MinecraftIntegration(commands.Cog):
 
         await ctx.send(embed=embed)
 
+    @commands.command(name='votetop')
+    async def vote_top(self, ctx, period: str = "monthly"):
+        """Show the vote leaderboard - Usage: !votetop [daily|monthly|alltime]"""
+        if not self.vote_stats:
+            await ctx.send("❌ Vote statistics are not available!")
+            return
+
+        normalized = VoteStatsStore.normalize_period(period)
+        if not normalized:
+            await ctx.send("❌ Period must be `daily`, `monthly` or `alltime`")
+            return
+
+        with TRACKER.timed("disk"):
+            leaders = await self.run_vote_db(self.vote_stats.top, normalized, 10)
+        titles = {"daily": "Today", "monthly": "This Month", "alltime": "All Time"}
+        embed = discord.Embed(
+            title=f"🏆 Top Voters • {titles[normalized]}",
+            color=0x00D4AA,
+            timestamp=discord.utils.utcnow()
+        )
+        if leaders:
+            medals = ["🥇", "🥈", "🥉"]
+            embed.description = "\n".join(
+                f"{medals[i] if i < len(medals) else f'**{i + 1}.**'} `{player}` - **{count}** vote{'s' if count != 1 else ''}"
+                for i, (player, count) in enumerate(leaders)
+            )
+        else:
+            embed.description = "No votes recorded for this period yet."
+        embed.set_footer(text="Vote System • Minecraft Server")
+        await ctx.send(embed=embed)
+
+    @commands.command(name='votes')
+    async def player_votes(self, ctx, player: str):
+        """Show vote counts and streaks for a player - Usage: !votes PlayerName"""
+        if not self.vote_stats:
+            await ctx.send("❌ Vote statistics are not available!")
+            return
+
+        with TRACKER.timed("disk"):
+            stats = await self.run_vote_db(self.vote_stats.player_stats, player)
+        if not stats:
+            await ctx.send(f"❌ No votes recorded for **{player}**")
+            return
+
+        embed = discord.Embed(
+            title=f"🗳️ Votes for {stats['player']}",
+            color=0x00D4AA,
+            timestamp=discord.utils.utcnow()
+        )
+        embed.add_field(name="Today", value=str(stats["daily"]), inline=True)
+        embed.add_field(name="This Month", value=str(stats["monthly"]), inline=True)
+        embed.add_field(name="All Time", value=str(stats["alltime"]), inline=True)
+        embed.add_field(name="🔥 Current Streak", value=f"{stats['current_streak']} day(s)", inline=True)
+        embed.add_field(name="⭐ Best Streak", value=f"{stats['best_streak']} day(s)", inline=True)
+        embed.set_footer(text="Vote System • Minecraft Server")
+        await ctx.send(embed=embed)
+
 async def setup(bot):
     await bot.add_cog(MinecraftIntegration(bot))
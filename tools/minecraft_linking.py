@@ -7,6 +7,13 @@ from datetime import datetime, timedelta
 import asyncio
 from config import LINKED_ROLE_ID
 from bot import bot_log
+from supervisor import SUPERVISOR
+from docstore import DOCUMENTS
+from message_router import ANY_WEBHOOK, ROUTER
+
+LINK_MC_PATTERN = re.compile(r"(?i)Minecraft:\**\s*`([^`]+)`")
+LINK_DISCORD_PATTERN = re.compile(r"(?i)Discord:\**\s*`([^`]+)`")
+LINK_CODE_PATTERN = re.compile(r"(?i)Verification Code:\**\s*`(\d{6})`")
 
 class MinecraftLinking(commands.Cog):
     """Discord-Minecraft account linking system"""
@@ -14,35 +21,24 @@ class MinecraftLinking(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.pending_verifications = {}
-        self.linked_accounts = {}
+        self.links_doc = DOCUMENTS.open("data/minecraft_links.json")
         self.load_linked_accounts()
         self.link_requests_channel_id = None
         self.debug_link_webhook = False
         self.linked_role_id = LINKED_ROLE_ID
         self.success_message_delete_after = 5
 
+    @property
+    def linked_accounts(self) -> dict:
+        """Discord ID -> linked Minecraft usernames; the document is the only copy"""
+        return self.links_doc.data.get("linked_accounts", {})
+
     def load_linked_accounts(self):
         """Load linked accounts from file"""
-        try:
-            if os.path.exists("data/minecraft_links.json"):
-                with open("data/minecraft_links.json", "r") as f:
-                    data = json.load(f)
-                    self.linked_accounts = data.get("linked_accounts", {})
-                    for discord_id, mc_data in self.linked_accounts.items():
-                        if isinstance(mc_data, str):
-                            self.linked_accounts[discord_id] = [mc_data]
-        except (FileNotFoundError, json.JSONDecodeError):
-            self.linked_accounts = {}
-
-    def save_linked_accounts(self):
-        """Save linked accounts to file"""
-        os.makedirs("data", exist_ok=True)
-        data = {
-            "linked_accounts": self.linked_accounts,
-            "last_updated": datetime.now().isoformat()
-        }
-        with open("data/minecraft_links.json", "w") as f:
-            json.dump(data, f, indent=2)
+        accounts = self.links_doc.load_sync().setdefault("linked_accounts", {})
+        for discord_id, mc_data in list(accounts.items()):
+            if isinstance(mc_data, str):
+                accounts[discord_id] = [mc_data]
 
     async def _delete_message_after_delay(self, message, delay_seconds):
         try:
@@ -137,12 +133,8 @@ class MinecraftLinking(commands.Cog):
             await bot_log(f"[Linking] Invalid code for {ctx.author}: {code}", error=True)
             return
 
-        if str(ctx.author.id) not in self.linked_accounts:
-            self.linked_accounts[str(ctx.author.id)] = []
-
-        self.linked_accounts[str(ctx.author.id)].append(mc_username)
         del self.pending_verifications[code]
-        self.save_linked_accounts()
+        await self.add_link(ctx.author.id, mc_username)
 
         try:
             mc_cog = self.bot.get_cog("MinecraftIntegration")
@@ -216,7 +208,7 @@ class MinecraftLinking(commands.Cog):
             log_embed.add_field(name="Linked At", value=datetime.now().strftime('%B %d, %Y at %I:%M %p'), inline=True)
             try:
                 log_msg = await log_channel.send(embed=log_embed)
-                asyncio.create_task(self._delete_message_after_delay(log_msg, 10))
+                SUPERVISOR.spawn(self._delete_message_after_delay(log_msg, 10), name=f"delete-link-log:{log_msg.id}", owner="MinecraftLinking")
                 await bot_log(f"[Linking] Log sent for {ctx.author} -> {mc_username}")
             except Exception as e:
                 print(f"[LINK-DEBUG] Could not send/schedule deletion of log message: {e}")
@@ -271,12 +263,7 @@ class MinecraftLinking(commands.Cog):
             await ctx.send(embed=embed)
             return
 
-        mc_usernames.remove(minecraft_name)
-
-        if not mc_usernames:
-            del self.linked_accounts[str(ctx.author.id)]
-
-        self.save_linked_accounts()
+        await self.remove_link(ctx.author.id, minecraft_name)
 
         embed = discord.Embed(
             title="🔓 Account Unlinked",
@@ -400,36 +387,49 @@ class MinecraftLinking(commands.Cog):
         """Check if Discord user is linked"""
         return str(discord_id) in self.linked_accounts and len(self.linked_accounts[str(discord_id)]) > 0
 
-    def add_link(self, discord_id: str, mc_username: str) -> bool:
-        """Add a link between Discord and Minecraft account"""
+    async def add_link(self, discord_id: str, mc_username: str) -> bool:
+        """Add a link between Discord and Minecraft account in one document transaction"""
         discord_id = str(discord_id)
-        if discord_id not in self.linked_accounts:
-            self.linked_accounts[discord_id] = []
 
-        if mc_username not in self.linked_accounts[discord_id]:
-            self.linked_accounts[discord_id].append(mc_username)
-            self.save_linked_accounts()
+        def apply(data):
+            usernames = data.setdefault("linked_accounts", {}).setdefault(discord_id, [])
+            if mc_username in usernames:
+                return False
+            usernames.append(mc_username)
+            data["last_updated"] = datetime.now().isoformat()
             return True
-        return False
 
-    def remove_link(self, discord_id: str, mc_username: str) -> bool:
-        """Remove a specific link between Discord and Minecraft account"""
+        return await self.links_doc.update(apply)
+
+    async def remove_link(self, discord_id: str, mc_username: str) -> bool:
+        """Remove a specific link between Discord and Minecraft account in one document transaction"""
         discord_id = str(discord_id)
-        if discord_id in self.linked_accounts:
-            if mc_username in self.linked_accounts[discord_id]:
-                self.linked_accounts[discord_id].remove(mc_username)
-                if not self.linked_accounts[discord_id]:
-                    del self.linked_accounts[discord_id]
-                self.save_linked_accounts()
-                return True
-        return False
+
+        def apply(data):
+            accounts = data.setdefault("linked_accounts", {})
+            usernames = accounts.get(discord_id, [])
+            if mc_username not in usernames:
+                return False
+            usernames.remove(mc_username)
+            if not usernames:
+                del accounts[discord_id]
+            data["last_updated"] = datetime.now().isoformat()
+            return True
+
+        return await self.links_doc.update(apply)
 
     def get_all_links(self) -> dict:
         """Get all linked accounts"""
-        return self.linked_accounts.copy()
+        return {discord_id: list(usernames) for discord_id, usernames in self.linked_accounts.items()}
+
+    async def cog_load(self):
+        ROUTER.route("mc-link-request", self.capture_link_request, channel_id=self.link_requests_channel_id,
+                     webhook=ANY_WEBHOOK, titles=("New Link Request",), owner="MinecraftLinking")
+
+    async def cog_unload(self):
+        ROUTER.unroute_owner("MinecraftLinking")
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
+    async def capture_link_request(self, message: discord.Message):
         """Capture verification codes from the Minecraft plugin webhook embed.
 
         The plugin posts an embed with title "🔗 New Link Request" and a description like:
@@ -437,39 +437,16 @@ class MinecraftLinking(commands.Cog):
             💬 Discord: `JohnDoe
             🔢 Verification Code: `847291`
         We'll parse it and store a pending verification so !verify can find the code.
+        Routed only for webhook messages whose first embed title contains "New Link Request".
         """
         try:
-            if message.author.id == self.bot.user.id:
-                return
-
-            if self.link_requests_channel_id and message.channel.id != self.link_requests_channel_id:
-                if self.debug_link_webhook and getattr(message, "webhook_id", None):
-                    print(f"[LINK-DEBUG] Webhook msg in other channel ignored: msg_id={message.id} channel_id={message.channel.id} expected_channel_id={self.link_requests_channel_id}")
-                return
-
-            if not getattr(message, "webhook_id", None):
-                return
-
             if self.debug_link_webhook:
                 author = message.author
                 print("[LINK-DEBUG] Saw webhook message:")
                 print(f"  msg_id={message.id} channel_id={message.channel.id} channel_name=
                 print(f"  webhook_id={message.webhook_id} author={author} embeds={len(message.embeds)}")
 
-            if not message.embeds:
-                if self.debug_link_webhook:
-                    print("[LINK-DEBUG] Webhook message has no embeds; skipping")
-                return
-
             embed = message.embeds[0]
-            title = (embed.title or "").strip()
-            if self.debug_link_webhook:
-                print(f"[LINK-DEBUG] Embed title: {title!r}")
-            if "New Link Request" not in title:
-                if self.debug_link_webhook:
-                    print("[LINK-DEBUG] Title does not contain 'New Link Request'; skipping")
-                return
-
             description = (embed.description or "")
             if self.debug_link_webhook:
                 sample = description.replace('\n', '\\n')
@@ -477,9 +454,9 @@ class MinecraftLinking(commands.Cog):
                     sample = sample[:240] + "..."
                 print(f"[LINK-DEBUG] Embed description (truncated): {sample}")
 
-            mc_match = re.search(r"(?i)Minecraft:\**\s*`([^`]+)`", description)
-            dc_match = re.search(r"(?i)Discord:\**\s*`([^`]+)`", description)
-            code_match = re.search(r"(?i)Verification Code:\**\s*`(\d{6})`", description)
+            mc_match = LINK_MC_PATTERN.search(description)
+            dc_match = LINK_DISCORD_PATTERN.search(description)
+            code_match = LINK_CODE_PATTERN.search(description)
 
             if not (mc_match and dc_match and code_match):
                 if self.debug_link_webhook:
@@ -503,7 +480,7 @@ class MinecraftLinking(commands.Cog):
             print(f"📥 Captured link code from webhook: {mc_username} -> {discord_username} (Code: {code}) exp={expires_at.strftime('%H:%M:%S')}")
 
         except Exception as e:
-            print(f"[LINK-DEBUG] on_message parsing error for link webhook: {e}")
+            print(f"[LINK-DEBUG] Parsing error for link webhook: {e}")
             await bot_log(f"[MinecraftLinking] Error parsing link webhook: {e}", error=True, exc_info=e)
 
 async def setup(bot):
@@ -0,0 +1,226 @@
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+WINDOW_SECONDS = 3600
+SLOT_SECONDS = 300
+CATEGORIES = ("rest", "rcon", "disk")
+
+class QuantileSketch:
+    """Log-bucketed streaming sketch with bounded relative error (DDSketch style)"""
+
+    __slots__ = ("gamma", "_log_gamma", "buckets", "count", "total", "zeros")
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.zeros = 0
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if value <= 1e-9:
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: "QuantileSketch"):
+        self.count += other.count
+        self.total += other.total
+        self.zeros += other.zeros
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+class CommandStats:
+    """Rolling per-command sketches split into fixed time slots"""
+
+    __slots__ = ("slots", "breakdown")
+
+    def __init__(self):
+        self.slots: Dict[int, QuantileSketch] = {}
+        self.breakdown: Dict[int, Dict[str, float]] = {}
+
+    def record(self, slot: int, wall: float, spent: Dict[str, float]):
+        sketch = self.slots.get(slot)
+        if sketch is None:
+            sketch = self.slots[slot] = QuantileSketch()
+            self.breakdown[slot] = dict.fromkeys(CATEGORIES, 0.0)
+        sketch.add(wall)
+        totals = self.breakdown[slot]
+        for category, seconds in spent.items():
+            totals[category] = totals.get(category, 0.0) + seconds
+
+    def prune(self, oldest: int):
+        for slot in [s for s in self.slots if s < oldest]:
+            del self.slots[slot]
+            del self.breakdown[slot]
+
+class Span:
+    """Timing for one command, interaction or callback"""
+
+    __slots__ = ("name", "started", "spent", "_lock")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.spent = dict.fromkeys(CATEGORIES, 0.0)
+        self._lock = threading.Lock()
+
+    def add(self, category: str, seconds: float):
+        with self._lock:
+            self.spent[category] = self.spent.get(category, 0.0) + seconds
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("perf_span", default=None)
+
+class PerfTracker:
+    """Collects wall time and REST/RCON/disk time per command over the last hour"""
+
+    def __init__(self, window: int = WINDOW_SECONDS, slot_seconds: int = SLOT_SECONDS):
+        self.window = window
+        self.slot_seconds = slot_seconds
+        self.commands: Dict[str, CommandStats] = {}
+        self._lock = threading.Lock()
+
+    def start(self, name: str) -> contextvars.Token:
+        return _current_span.set(Span(name))
+
+    def finish(self, token: contextvars.Token):
+        span = _current_span.get()
+        _current_span.reset(token)
+        if span is None:
+            return
+        self.record(span.name, time.perf_counter() - span.started, span.spent)
+
+    @contextmanager
+    def span(self, name: str):
+        token = self.start(name)
+        try:
+            yield
+        finally:
+            self.finish(token)
+
+    def record(self, name: str, wall: float, spent: Dict[str, float]):
+        now = time.time()
+        slot = int(now // self.slot_seconds)
+        with self._lock:
+            stats = self.commands.get(name)
+            if stats is None:
+                stats = self.commands[name] = CommandStats()
+            stats.record(slot, wall, spent)
+            stats.prune(int((now - self.window) // self.slot_seconds))
+
+    @staticmethod
+    def current() -> Optional[Span]:
+        """The span of whatever command is currently running, for handing work to another task"""
+        return _current_span.get()
+
+    @staticmethod
+    def add(category: str, seconds: float):
+        """Charge time to the span of whatever command is currently running"""
+        span = _current_span.get()
+        if span is not None:
+            span.add(category, seconds)
+
+    @staticmethod
+    def charge(spans, category: str, seconds: float):
+        """Charge time to spans captured elsewhere, e.g. every caller waiting on one shared write"""
+        for span in set(spans):
+            if span is not None:
+                span.add(category, seconds)
+
+    @contextmanager
+    def timed(self, category: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(category, time.perf_counter() - started)
+
+    def report(self, limit: int = 10, sort_by: str = "p95") -> List[dict]:
+        """Summarize the last hour per command, slowest first"""
+        oldest = int((time.time() - self.window) // self.slot_seconds)
+        rows = []
+        with self._lock:
+            for name, stats in self.commands.items():
+                stats.prune(oldest)
+                if not stats.slots:
+                    continue
+                merged = QuantileSketch()
+                spent = dict.fromkeys(CATEGORIES, 0.0)
+                for slot, sketch in stats.slots.items():
+                    merged.merge(sketch)
+                    for category, seconds in stats.breakdown[slot].items():
+                        spent[category] = spent.get(category, 0.0) + seconds
+                rows.append({
+                    "name": name,
+                    "count": merged.count,
+                    "p50": merged.quantile(0.50),
+                    "p95": merged.quantile(0.95),
+                    "p99": merged.quantile(0.99),
+                    "avg": merged.total / merged.count,
+                    "spent": {category: seconds / merged.count for category, seconds in spent.items()},
+                })
+        rows.sort(key=lambda row: row[sort_by], reverse=True)
+        return rows[:limit]
+
+TRACKER = PerfTracker()
+
+def instrument_http(http_client):
+    """Charge discord.py REST calls to the current span"""
+    original = http_client.request
+    if getattr(original, "_perf_wrapped", False):
+        return
+
+    async def request(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await original(*args, **kwargs)
+        finally:
+            TRACKER.add("rest", time.perf_counter() - started)
+
+    request._perf_wrapped = True
+    http_client.request = request
+
+def instrument_ui():
+    """Time component callbacks and modal submits, which discord.py offers no hook for"""
+    from discord import ui
+
+    view_task = ui.View._scheduled_task
+    if not getattr(view_task, "_perf_wrapped", False):
+        async def scheduled_view_task(self, item, interaction):
+            callback = getattr(item.callback, "func", item.callback)
+            label = getattr(callback, "__name__", None) or getattr(item, "custom_id", None) or type(item).__name__
+            with TRACKER.span(f"view:{type(self).__name__}:{label}"):
+                return await view_task(self, item, interaction)
+
+        scheduled_view_task._perf_wrapped = True
+        ui.View._scheduled_task = scheduled_view_task
+
+    modal_task = ui.Modal._scheduled_task
+    if not getattr(modal_task, "_perf_wrapped", False):
+        async def scheduled_modal_task(self, interaction, components):
+            with TRACKER.span(f"modal:{type(self).__name__}"):
+                return await modal_task(self, interaction, components)
+
+        scheduled_modal_task._perf_wrapped = True
+        ui.Modal._scheduled_task = scheduled_modal_task
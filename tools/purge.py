@@ -0,0 +1,166 @@
+import asyncio
+import re
+import shlex
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List, Optional
+
+import discord
+
+BULK_DELETE_MAX = 100
+BULK_DELETE_AGE = timedelta(days=14) - timedelta(minutes=5)
+SINGLE_DELETE_INTERVAL = 1.2
+PROGRESS_INTERVAL = 2.0
+
+@dataclass
+class PurgeFilter:
+    """Which messages !purge removes, parsed from 'N user:@x contains:text regex:pat bots attachments after:id'"""
+
+    limit: int = 100
+    user_ids: List[int] = field(default_factory=list)
+    contains: Optional[str] = None
+    pattern: Optional[re.Pattern] = None
+    bots: bool = False
+    attachments: bool = False
+    after: Optional[int] = None
+
+    @classmethod
+    def parse(cls, text: str) -> "PurgeFilter":
+        purge_filter = cls()
+        for token in shlex.split(text or ""):
+            key, sep, value = token.partition(":")
+            key = key.lower()
+            if token.isdigit():
+                purge_filter.limit = int(token)
+            elif key in ("bots", "bot") and not sep:
+                purge_filter.bots = True
+            elif key in ("attachments", "files", "images") and not sep:
+                purge_filter.attachments = True
+            elif key in ("user", "from") and sep:
+                ids = re.findall(r"\d{15,20}", value)
+                if not ids:
+                    raise ValueError(f"Could not read a user ID from '{value}'")
+                purge_filter.user_ids.extend(int(user_id) for user_id in ids)
+            elif key == "contains" and sep:
+                purge_filter.contains = value.lower()
+            elif key == "regex" and sep:
+                try:
+                    purge_filter.pattern = re.compile(value, re.IGNORECASE)
+                except re.error as e:
+                    raise ValueError(f"Invalid regex: {e}")
+            elif key == "after" and sep and value.isdigit():
+                purge_filter.after = int(value)
+            else:
+                raise ValueError(f"Unknown purge option '{token}'")
+        if not 1 <= purge_filter.limit <= 1000:
+            raise ValueError("The message count must be between 1 and 1000")
+        return purge_filter
+
+    def matches(self, message) -> bool:
+        if self.user_ids and message.author.id not in self.user_ids:
+            return False
+        if self.bots and not message.author.bot:
+            return False
+        if self.attachments and not message.attachments:
+            return False
+        if self.contains and self.contains not in message.content.lower():
+            return False
+        if self.pattern and not self.pattern.search(message.content):
+            return False
+        return True
+
+    def describe(self) -> str:
+        parts = [f"last {self.limit}"]
+        if self.user_ids:
+            parts.append("from " + ", ".join(f"<@{user_id}>" for user_id in self.user_ids))
+        if self.bots:
+            parts.append("bots only")
+        if self.attachments:
+            parts.append("with attachments")
+        if self.contains:
+            parts.append(f"containing '{self.contains}'")
+        if self.pattern:
+            parts.append(f"matching /{self.pattern.pattern}/")
+        if self.after:
+            parts.append(f"after {self.after}")
+        return ", ".join(parts)
+
+async def purge_messages(channel, purge_filter: PurgeFilter, before=None, scan_limit: int = 2000,
+                         progress: Optional[Callable[[int, int], Awaitable]] = None,
+                         progress_interval: float = PROGRESS_INTERVAL) -> dict:
+    """Delete matching messages newest first and return a manifest of what went
+
+    History is read lazily and deleted as it goes: messages younger than 14 days
+    are flushed in bulk-delete calls of up to 100, older ones are collected and
+    deleted one at a time afterwards at SINGLE_DELETE_INTERVAL. progress is called
+    at most once per progress_interval, so status edits do not compete with the
+    deletes for the channel's rate limit.
+    """
+    cutoff = datetime.now(timezone.utc) - BULK_DELETE_AGE
+    after = discord.Object(id=purge_filter.after) if purge_filter.after else None
+    batch, old, authors = [], [], Counter()
+    manifest = {"scanned": 0, "bulk": 0, "single": 0, "failed": 0, "first_id": None, "last_id": None}
+    last_report = time.monotonic()
+
+    async def report():
+        nonlocal last_report
+        if progress is None or time.monotonic() - last_report < progress_interval:
+            return
+        last_report = time.monotonic()
+        await progress(manifest["bulk"] + manifest["single"], manifest["scanned"])
+
+    def note(message):
+        authors[str(message.author.id)] += 1
+        manifest["first_id"] = message.id if manifest["first_id"] is None else min(manifest["first_id"], message.id)
+        manifest["last_id"] = message.id if manifest["last_id"] is None else max(manifest["last_id"], message.id)
+
+    async def flush():
+        if not batch:
+            return
+        try:
+            if len(batch) == 1:
+                await batch[0].delete()
+            else:
+                await channel.delete_messages(batch)
+            manifest["bulk"] += len(batch)
+            for message in batch:
+                note(message)
+        except discord.HTTPException:
+            manifest["failed"] += len(batch)
+        batch.clear()
+        await report()
+
+    matched = 0
+    async for message in channel.history(limit=scan_limit, before=before, after=after, oldest_first=False):
+        manifest["scanned"] += 1
+        if message.pinned or not purge_filter.matches(message):
+            continue
+        matched += 1
+        if message.created_at < cutoff:
+            old.append(message)
+        else:
+            batch.append(message)
+            if len(batch) >= BULK_DELETE_MAX:
+                await flush()
+        if matched >= purge_filter.limit:
+            break
+    await flush()
+
+    for message in old:
+        try:
+            await message.delete()
+            manifest["single"] += 1
+            note(message)
+        except discord.NotFound:
+            pass
+        except discord.HTTPException:
+            manifest["failed"] += 1
+        await asyncio.sleep(SINGLE_DELETE_INTERVAL)
+        await report()
+
+    manifest["deleted"] = manifest["bulk"] + manifest["single"]
+    manifest["authors"] = dict(authors.most_common(10))
+    manifest["author_ids"] = sorted(int(author_id) for author_id in authors)
+    return manifest
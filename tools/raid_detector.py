@@ -0,0 +1,132 @@
+import random
+from typing import Dict, Iterator, List, Optional, Tuple
+
+HOUR = 3600
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+FIELDS = ("joins", "age_1h", "age_1d", "age_7d", "no_avatar")
+
+def age_bucket(account_age: float) -> Optional[str]:
+    if account_age < HOUR:
+        return "age_1h"
+    if account_age < DAY:
+        return "age_1d"
+    if account_age < WEEK:
+        return "age_7d"
+    return None
+
+class WindowCounter:
+    """Sliding-window totals kept in a fixed ring of buckets
+
+    Each event touches one bucket and the running totals, and expired buckets are
+    subtracted as the ring advances, so memory is constant in the event rate.
+    """
+
+    def __init__(self, window: float, slots: int = 20):
+        self.window = window
+        self.slots = slots
+        self.width = window / slots
+        self.buckets: List[List[int]] = [[0] * len(FIELDS) for _ in range(slots)]
+        self.totals: List[int] = [0] * len(FIELDS)
+        self.head: Optional[int] = None
+
+    def _advance(self, now: float):
+        index = int(now // self.width)
+        if self.head is None:
+            self.head = index
+            return
+        if index <= self.head:
+            return
+        for step in range(1, min(index - self.head, self.slots) + 1):
+            bucket = self.buckets[(self.head + step) % self.slots]
+            for field, count in enumerate(bucket):
+                if count:
+                    self.totals[field] -= count
+                    bucket[field] = 0
+        self.head = index
+
+    def add(self, now: float, fields: Tuple[str, ...]):
+        self._advance(now)
+        bucket = self.buckets[self.head % self.slots]
+        for name in fields:
+            position = FIELDS.index(name)
+            bucket[position] += 1
+            self.totals[position] += 1
+
+    def snapshot(self, now: float) -> Dict[str, int]:
+        self._advance(now)
+        return dict(zip(FIELDS, self.totals))
+
+class RaidDetector:
+    """Join-rate, account-age and avatar heuristics over 10s and 60s windows
+
+    last_trigger is the time a join last tripped a threshold; raid mode is lifted
+    once is_calm() has held for the calm period.
+    """
+
+    def __init__(self, joins_10s: int = 10, joins_60s: int = 30, young_ratio: float = 0.6,
+                 no_avatar_ratio: float = 0.8, min_sample: int = 8):
+        self.joins_10s = joins_10s
+        self.joins_60s = joins_60s
+        self.young_ratio = young_ratio
+        self.no_avatar_ratio = no_avatar_ratio
+        self.min_sample = min_sample
+        self.short = WindowCounter(10.0)
+        self.long = WindowCounter(60.0)
+        self.last_trigger: Optional[float] = None
+
+    def record(self, now: float, account_age: float, has_avatar: bool) -> List[str]:
+        """Count one join and return the reasons, if any, that it looks like a raid"""
+        fields = ["joins"]
+        bucket = age_bucket(account_age)
+        if bucket:
+            fields.append(bucket)
+        if not has_avatar:
+            fields.append("no_avatar")
+        fields = tuple(fields)
+        self.short.add(now, fields)
+        self.long.add(now, fields)
+        reasons = self.evaluate(now)
+        if reasons:
+            self.last_trigger = now
+        return reasons
+
+    def evaluate(self, now: float) -> List[str]:
+        short = self.short.snapshot(now)
+        long = self.long.snapshot(now)
+        reasons = []
+        if short["joins"] >= self.joins_10s:
+            reasons.append(f"{short['joins']} joins in 10s")
+        if long["joins"] >= self.joins_60s:
+            reasons.append(f"{long['joins']} joins in 60s")
+        if long["joins"] >= self.min_sample:
+            young = long["age_1h"] + long["age_1d"] + long["age_7d"]
+            if young / long["joins"] >= self.young_ratio:
+                reasons.append(f"{young}/{long['joins']} accounts younger than 7 days")
+            if long["no_avatar"] / long["joins"] >= self.no_avatar_ratio:
+                reasons.append(f"{long['no_avatar']}/{long['joins']} accounts without an avatar")
+        return reasons
+
+    def is_calm(self, now: float, calm_seconds: float) -> bool:
+        """True once no join has tripped a threshold for calm_seconds"""
+        return self.last_trigger is None or now - self.last_trigger >= calm_seconds
+
+    def snapshot(self, now: float) -> Dict[str, Dict[str, int]]:
+        return {"10s": self.short.snapshot(now), "60s": self.long.snapshot(now)}
+
+def synthetic_joins(per_minute: float, duration: float, young_fraction: float = 0.1,
+                    no_avatar_fraction: float = 0.2, start: float = 0.0, seed: Optional[int] = None) -> Iterator[Tuple[float, float, bool]]:
+    """Generate (timestamp, account_age, has_avatar) joins as a Poisson process, for replaying raids"""
+    rng = random.Random(seed)
+    now = start
+    rate = per_minute / 60.0
+    while True:
+        now += rng.expovariate(rate)
+        if now - start > duration:
+            return
+        if rng.random() < young_fraction:
+            account_age = rng.uniform(60, WEEK)
+        else:
+            account_age = rng.uniform(WEEK, 5 * 365 * DAY)
+        yield now, account_age, rng.random() >= no_avatar_fraction
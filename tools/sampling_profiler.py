@@ -0,0 +1,100 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+class StackSampler:
+    """Low-overhead wall-clock profiler that samples every thread's stack from a helper thread"""
+
+    def __init__(self, interval: float = 0.01, max_depth: int = 64, thread_ids: Optional[set] = None):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.thread_ids = thread_ids
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at = 0.0
+        self.elapsed = 0.0
+        self.sampling_time = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._code_names: Dict[object, str] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            raise RuntimeError("Profiler is already running")
+        self.stacks.clear()
+        self.samples = 0
+        self.sampling_time = 0.0
+        self._stop.clear()
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started_at
+
+    def _frame_name(self, code) -> str:
+        name = self._code_names.get(code)
+        if name is None:
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            name = f"{module}:{getattr(code, 'co_qualname', code.co_name)}:{code.co_firstlineno}"
+            self._code_names[code] = name
+        return name
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        while not self._stop.wait(self.interval):
+            tick = time.perf_counter()
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if self.thread_ids is not None and thread_id not in self.thread_ids:
+                    continue
+                codes = []
+                while frame is not None and len(codes) < self.max_depth:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                thread_name = names.get(thread_id)
+                if thread_name is None:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                    thread_name = names.get(thread_id, str(thread_id))
+                self.stacks[(thread_name, tuple(reversed(codes)))] += 1
+            del frame
+            self.samples += 1
+            self.sampling_time += time.perf_counter() - tick
+
+    def collapsed(self) -> str:
+        """Render stacks in the folded format flamegraph.pl and speedscope read"""
+        lines = []
+        for (thread_name, codes), count in self.stacks.most_common():
+            frames = ";".join([thread_name] + [self._frame_name(code) for code in codes])
+            lines.append(f"{frames} {count}")
+        return "\n".join(lines) + "\n"
+
+    def hot_frames(self, limit: int = 15) -> List[Tuple[str, int, int]]:
+        """Return (frame, self samples, inclusive samples) for the hottest frames"""
+        own: Counter = Counter()
+        inclusive: Counter = Counter()
+        for (_, codes), count in self.stacks.items():
+            if not codes:
+                continue
+            own[codes[-1]] += count
+            for code in set(codes):
+                inclusive[code] += count
+        ranked = sorted(inclusive, key=lambda code: (own[code], inclusive[code]), reverse=True)[:limit]
+        return [(self._frame_name(code), own[code], inclusive[code]) for code in ranked]
+
+    @property
+    def overhead(self) -> float:
+        """Fraction of wall time the sampler spent walking stacks"""
+        return self.sampling_time / self.elapsed if self.elapsed else 0.0
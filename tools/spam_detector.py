@@ -0,0 +1,121 @@
+import hashlib
+import re
+from collections import OrderedDict, deque
+from typing import Optional
+
+LINK_PATTERN = re.compile(r"https?://|discord\.gg/", re.IGNORECASE)
+NOISE = re.compile(r"[\W_]+")
+DIGITS = re.compile(r"\d+")
+REPEATS = re.compile(r"(.)\1+")
+
+def fingerprint_text(content: str) -> str:
+    """Text that is equal for messages differing only in case, punctuation, numbers or stretched letters"""
+    text = NOISE.sub(" ", content.casefold())
+    text = DIGITS.sub("0", text)
+    text = REPEATS.sub(r"\1", text)
+    return " ".join(text.split())
+
+def text_digest(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+
+def fingerprint(content: str) -> int:
+    return text_digest(fingerprint_text(content))
+
+def count_links(content: str) -> int:
+    return len(LINK_PATTERN.findall(content))
+
+class UserState:
+    """Token buckets and recent fingerprints for one member"""
+
+    __slots__ = ("messages", "mentions", "links", "updated", "recent")
+
+    def __init__(self, now: float, burst: float, mention_burst: float, link_burst: float, history: int):
+        self.messages = burst
+        self.mentions = mention_burst
+        self.links = link_burst
+        self.updated = now
+        self.recent: deque = deque(maxlen=history)
+
+class SpamDetector:
+    """Per-user message rate, duplicate and mention/link density checks in bounded memory
+
+    Each member holds three token buckets (messages, mentions, links) refilled
+    continuously, plus a short deque of (time, fingerprint, channel) for their
+    last messages. States live in an LRU map capped at max_users; anyone idle
+    for idle_seconds is dropped as the map is touched. Messages that normalize
+    to fewer than min_length characters (emoji, "ok", "!!") are never
+    fingerprinted, and ones shorter than short_length need short_duplicates
+    repeats, so ordinary one-word replies are not mistaken for a flood.
+    """
+
+    def __init__(self, rate: float = 0.5, burst: float = 6, mention_rate: float = 0.1, mention_burst: float = 8,
+                 link_rate: float = 0.05, link_burst: float = 4, duplicates: int = 3, duplicate_window: float = 60.0,
+                 min_length: int = 3, short_length: int = 12, short_duplicates: int = 6,
+                 history: int = 8, max_users: int = 5000, idle_seconds: float = 300.0):
+        self.rate = rate
+        self.burst = burst
+        self.mention_rate = mention_rate
+        self.mention_burst = mention_burst
+        self.link_rate = link_rate
+        self.link_burst = link_burst
+        self.duplicates = duplicates
+        self.duplicate_window = duplicate_window
+        self.min_length = min_length
+        self.short_length = short_length
+        self.short_duplicates = short_duplicates
+        self.history = history
+        self.max_users = max_users
+        self.idle_seconds = idle_seconds
+        self.users: "OrderedDict[int, UserState]" = OrderedDict()
+        self.evicted = 0
+
+    def _state(self, user_id: int, now: float) -> UserState:
+        users = self.users
+        state = users.get(user_id)
+        if state is None:
+            state = users[user_id] = UserState(now, self.burst, self.mention_burst, self.link_burst, self.history)
+        else:
+            users.move_to_end(user_id)
+        while users:
+            oldest_id, oldest = next(iter(users.items()))
+            if len(users) <= self.max_users and now - oldest.updated < self.idle_seconds:
+                break
+            if oldest is state:
+                break
+            del users[oldest_id]
+            self.evicted += 1
+        return state
+
+    def check(self, user_id: int, channel_id: int, content: str, mentions: int, links: int, now: float) -> Optional[str]:
+        """Account for one message and return why it is spam, or None"""
+        state = self._state(user_id, now)
+        elapsed = now - state.updated
+        state.updated = now
+        state.messages = min(self.burst, state.messages + elapsed * self.rate) - 1
+        state.mentions = min(self.mention_burst, state.mentions + elapsed * self.mention_rate) - mentions
+        state.links = min(self.link_burst, state.links + elapsed * self.link_rate) - links
+
+        reason = None
+        if state.messages < 0:
+            reason = f"Sending messages too quickly (over {self.burst:g} in a burst)"
+        elif state.mentions < 0:
+            reason = f"Too many mentions ({mentions} in the last message)"
+        elif state.links < 0:
+            reason = f"Too many links ({links} in the last message)"
+        elif content:
+            text = fingerprint_text(content)
+            if len(text) < self.min_length:
+                return None
+            digest = text_digest(text)
+            threshold = self.duplicates if len(text) >= self.short_length else self.short_duplicates
+            cutoff = now - self.duplicate_window
+            repeats = [channel for sent, seen, channel in state.recent if seen == digest and sent >= cutoff]
+            state.recent.append((now, digest, channel_id))
+            if len(repeats) + 1 >= threshold:
+                channels = len(set(repeats) | {channel_id})
+                reason = f"Repeated the same message {len(repeats) + 1} times" + (f" across {channels} channels" if channels > 1 else "")
+        return reason
+
+    def reset(self, user_id: int):
+        """Forget a member after action was taken so one flood only triggers once"""
+        self.users.pop(user_id, None)
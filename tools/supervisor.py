@@ -0,0 +1,187 @@
+import asyncio
+import contextvars
+import os
+import random
+import time
+import traceback
+from typing import Awaitable, Callable, Dict, List, Optional
+
+RESTART_ALWAYS = "always"
+RESTART_ON_FAILURE = "on-failure"
+RESTART_NEVER = "never"
+
+_current_job: contextvars.ContextVar[Optional["SupervisedTask"]] = contextvars.ContextVar("supervised_task", default=None)
+
+class SupervisedTask:
+    """Bookkeeping for one named long-running task"""
+
+    def __init__(self, name: str, factory: Callable[[], Awaitable], owner: Optional[str], restart: str,
+                 base_delay: float, max_delay: float):
+        self.name = name
+        self.factory = factory
+        self.owner = owner
+        self.restart = restart
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.created_at = time.time()
+        self.started_at = None
+        self.last_heartbeat = None
+        self.restarts = 0
+        self.failures = 0
+        self.last_error = None
+        self.state = "pending"
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self.task is None or self.task.done()
+
+class TaskSupervisor:
+    """Registry of named background tasks with restart policies and health tracking"""
+
+    def __init__(self):
+        self.jobs: Dict[str, SupervisedTask] = {}
+        self.spawned: Dict[asyncio.Task, dict] = {}
+
+    def supervise(self, name: str, factory: Callable[[], Awaitable], owner: Optional[str] = None,
+                  restart: str = RESTART_ALWAYS, base_delay: float = 1.0, max_delay: float = 300.0) -> SupervisedTask:
+        """Start (or replace) a named task that is restarted with jittered backoff when it stops"""
+        existing = self.jobs.get(name)
+        if existing and not existing.done:
+            if existing.owner != owner:
+                print(f"⚠️ Task '{name}' of {existing.owner} replaced by one from {owner}")
+            existing.task.cancel()
+        job = SupervisedTask(name, factory, owner, restart, base_delay, max_delay)
+        self.jobs[name] = job
+        job.task = asyncio.create_task(self._run(job), name=name, context=contextvars.Context())
+        return job
+
+    async def _run(self, job: SupervisedTask):
+        _current_job.set(job)
+        delay = job.base_delay
+        while True:
+            job.state = "running"
+            job.started_at = time.time()
+            job.last_heartbeat = job.started_at
+            try:
+                await job.factory()
+            except asyncio.CancelledError:
+                job.state = "cancelled"
+                raise
+            except Exception as e:
+                job.failures += 1
+                job.last_error = f"{type(e).__name__}: {e}"
+                print(f"❌ Task '{job.name}' crashed: {job.last_error}")
+                traceback.print_exception(type(e), e, e.__traceback__)
+                if job.restart == RESTART_NEVER:
+                    job.state = "failed"
+                    return
+            else:
+                if job.restart != RESTART_ALWAYS:
+                    job.state = "finished"
+                    return
+                delay = job.base_delay
+            if time.time() - job.started_at > job.max_delay:
+                delay = job.base_delay
+            sleep_for = random.uniform(delay / 2, delay)
+            job.state = f"backoff {sleep_for:.0f}s"
+            job.restarts += 1
+            await asyncio.sleep(sleep_for)
+            delay = min(delay * 2, job.max_delay)
+
+    def spawn(self, coro: Awaitable, name: str, owner: Optional[str] = None) -> asyncio.Task:
+        """Run a one-shot task that is named, tracked and has its exceptions reported
+
+        Like supervised jobs it starts from an empty context, so it never inherits the
+        perf span of the command that happened to create it.
+        """
+        task = asyncio.create_task(coro, name=name, context=contextvars.Context())
+        self.spawned[task] = {"owner": owner, "created_at": time.time()}
+        task.add_done_callback(self._spawned_done)
+        return task
+
+    def _spawned_done(self, task: asyncio.Task):
+        self.spawned.pop(task, None)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            print(f"❌ Task '{task.get_name()}' failed: {type(error).__name__}: {error}")
+
+    @staticmethod
+    def heartbeat():
+        """Mark the calling supervised task as alive"""
+        job = _current_job.get()
+        if job is not None:
+            job.last_heartbeat = time.time()
+
+    def cancel(self, name: str):
+        job = self.jobs.pop(name, None)
+        if job and job.task:
+            job.task.cancel()
+
+    def cancel_owner(self, owner: str):
+        """Cancel every supervised and spawned task belonging to one cog"""
+        for name, job in list(self.jobs.items()):
+            if job.owner == owner:
+                self.cancel(name)
+        for task, info in list(self.spawned.items()):
+            if info["owner"] == owner:
+                task.cancel()
+
+    @staticmethod
+    def await_point(task: asyncio.Task) -> str:
+        """Describe where a task is currently suspended"""
+        coro = task.get_coro()
+        location = None
+        innermost = None
+        depth = 0
+        while coro is not None and depth < 50:
+            frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+            if frame is not None:
+                innermost = frame.f_code.co_name
+                if f"{os.sep}asyncio{os.sep}" not in frame.f_code.co_filename:
+                    location = f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+                    innermost = None
+            coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+            depth += 1
+        if location and innermost:
+            return f"{location} (awaiting asyncio.{innermost})"
+        return location or "running"
+
+    @staticmethod
+    def _coro_module(task: asyncio.Task) -> Optional[str]:
+        coro = task.get_coro()
+        code = getattr(coro, "cr_code", None) or getattr(coro, "gi_code", None)
+        if code is None:
+            return None
+        return os.path.splitext(os.path.basename(code.co_filename))[0]
+
+    def inventory(self, resolve_owner: Optional[Callable[[str], Optional[str]]] = None) -> List[dict]:
+        """Every live asyncio task with its age, owner and current await point"""
+        now = time.time()
+        supervised = {job.task: job for job in self.jobs.values() if job.task}
+        rows = []
+        for task in asyncio.all_tasks():
+            job = supervised.get(task)
+            spawned = self.spawned.get(task)
+            owner = job.owner if job else spawned["owner"] if spawned else None
+            if owner is None:
+                module = self._coro_module(task)
+                owner = (resolve_owner(module) if resolve_owner and module else None) or module or "unknown"
+            created = job.created_at if job else spawned["created_at"] if spawned else None
+            rows.append({
+                "name": task.get_name(),
+                "owner": owner,
+                "age": now - created if created else None,
+                "await": self.await_point(task),
+                "supervised": job is not None,
+                "state": job.state if job else "running",
+                "restarts": job.restarts if job else 0,
+                "last_heartbeat": now - job.last_heartbeat if job and job.last_heartbeat else None,
+                "last_error": job.last_error if job else None,
+            })
+        rows.sort(key=lambda row: (not row["supervised"], row["owner"], row["name"]))
+        return rows
+
+SUPERVISOR = TaskSupervisor()
@@ -0,0 +1,77 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+from supervisor import SUPERVISOR
+
+class ThrottledUpdater:
+    """Applies only the latest submitted value, at most max_calls times per window
+
+    submit() never waits: it records the value and makes sure a single background
+    task is draining. That task applies the newest value as soon as the window has
+    room, and keeps going until nothing newer is pending (the trailing edit).
+    apply() may return False to say it had nothing to do, which frees the slot.
+    """
+
+    def __init__(self, name: str, apply: Callable[[Any], Awaitable], max_calls: int = 2,
+                 window: float = 600.0, owner: Optional[str] = None, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.apply = apply
+        self.max_calls = max_calls
+        self.window = window
+        self.owner = owner
+        self.clock = clock
+        self.calls: deque = deque()
+        self.latest: Any = None
+        self.applied: Any = None
+        self.submitted = 0
+        self.applies = 0
+        self.failures = 0
+        self._pending = False
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, value):
+        """Record the newest value; returns immediately"""
+        self.latest = value
+        self._pending = True
+        self.submitted += 1
+        if self._task is None or self._task.done():
+            self._task = SUPERVISOR.spawn(self._drain(), name=f"throttled:{self.name}", owner=self.owner)
+
+    def next_slot_in(self) -> float:
+        """Seconds until another call fits in the window"""
+        now = self.clock()
+        while self.calls and now - self.calls[0] >= self.window:
+            self.calls.popleft()
+        if len(self.calls) < self.max_calls:
+            return 0.0
+        return self.window - (now - self.calls[0])
+
+    async def _drain(self):
+        while self._pending:
+            delay = self.next_slot_in()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            self._pending = False
+            value = self.latest
+            if value == self.applied:
+                continue
+            self.calls.append(self.clock())
+            try:
+                changed = await self.apply(value)
+            except Exception as e:
+                self.failures += 1
+                self._pending = True
+                print(f"❌ Throttled update '{self.name}' failed: {type(e).__name__}: {e}")
+                continue
+            self.applied = value
+            if changed is False:
+                self.calls.pop()
+            else:
+                self.applies += 1
+
+    def cancel(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
@@ -0,0 +1,162 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+DEDUP_WINDOW_SECONDS = 120
+MAX_DELIVERY_ATTEMPTS = 10
+
+def normalize_service(service: str) -> str:
+    """Collapse the different spellings vote sites use across Votifier, VotingPlugin and the plugin API"""
+    key = (service or "unknown").strip().lower()
+    for prefix in ("https://", "http://", "www."):
+        if key.startswith(prefix):
+            key = key[len(prefix):]
+    if "planetminecraft" in key or key == "pmc":
+        return "planetminecraft.com"
+    return key
+
+class VoteOutbox:
+    """Durable outbox of parsed vote events awaiting delivery to Discord"""
+
+    def __init__(self, path: str, dedup_window: int = DEDUP_WINDOW_SECONDS):
+        self.path = path
+        self.dedup_window = dedup_window
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS vote_outbox ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "source_key TEXT UNIQUE, "
+                "source TEXT NOT NULL, "
+                "seq INTEGER, "
+                "player TEXT NOT NULL, "
+                "player_key TEXT NOT NULL, "
+                "service TEXT NOT NULL, "
+                "service_key TEXT NOT NULL, "
+                "payload TEXT, "
+                "event_at TEXT NOT NULL, "
+                "created_at TEXT NOT NULL, "
+                "delivered_at TEXT, "
+                "attempts INTEGER NOT NULL DEFAULT 0, "
+                "last_error TEXT, "
+                "dead_at TEXT)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(vote_outbox)")}
+            if "dead_at" not in columns:
+                self._conn.execute("ALTER TABLE vote_outbox ADD COLUMN dead_at TEXT")
+                self._conn.execute(
+                    "UPDATE vote_outbox SET dead_at = created_at WHERE delivered_at IS NULL AND attempts >= ?",
+                    (MAX_DELIVERY_ATTEMPTS,),
+                )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_vote_outbox_pending ON vote_outbox (delivered_at, id)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_vote_outbox_dedup ON vote_outbox (player_key, service_key, event_at)"
+            )
+
+    def enqueue(self, player: str, service: str, source: str, source_key: Optional[str] = None,
+                seq: Optional[int] = None, event_at: Optional[datetime] = None,
+                payload: Optional[dict] = None, dedupe: bool = True) -> Optional[int]:
+        """Durably record a vote event; returns its id, or None when it duplicates an earlier one"""
+        when = (event_at or datetime.now(timezone.utc)).astimezone(timezone.utc)
+        player_key = player.lower()
+        service_key = normalize_service(service)
+        window_start = (when - timedelta(seconds=self.dedup_window)).isoformat()
+        window_end = (when + timedelta(seconds=self.dedup_window)).isoformat()
+        with self._lock, self._conn:
+            if source_key is not None:
+                row = self._conn.execute(
+                    "SELECT 1 FROM vote_outbox WHERE source_key = ?", (source_key,)
+                ).fetchone()
+                if row:
+                    return None
+            if dedupe:
+                row = self._conn.execute(
+                    "SELECT 1 FROM vote_outbox WHERE player_key = ? AND service_key = ? AND event_at BETWEEN ? AND ?",
+                    (player_key, service_key, window_start, window_end),
+                ).fetchone()
+                if row:
+                    return None
+            cursor = self._conn.execute(
+                "INSERT INTO vote_outbox (source_key, source, seq, player, player_key, service, service_key, "
+                "payload, event_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (source_key, source, seq, player, player_key, service, service_key,
+                 json.dumps(payload) if payload is not None else None,
+                 when.isoformat(), datetime.now(timezone.utc).isoformat()),
+            )
+            return cursor.lastrowid
+
+    @staticmethod
+    def _events(rows) -> List[dict]:
+        events = []
+        for row in rows:
+            event = dict(row)
+            event["payload"] = json.loads(event["payload"]) if event["payload"] else None
+            events.append(event)
+        return events
+
+    def pending(self, limit: int = 20) -> List[dict]:
+        """Return undelivered events in arrival order, skipping dead-lettered ones"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM vote_outbox WHERE delivered_at IS NULL AND dead_at IS NULL ORDER BY id LIMIT ?",
+                (int(limit),),
+            ).fetchall()
+        return self._events(rows)
+
+    def dead_letters(self, limit: int = 10) -> List[dict]:
+        """Most recent events that gave up after MAX_DELIVERY_ATTEMPTS"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM vote_outbox WHERE dead_at IS NOT NULL ORDER BY id DESC LIMIT ?",
+                (int(limit),),
+            ).fetchall()
+        return self._events(rows)
+
+    def mark_delivered(self, event_id: int):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE vote_outbox SET delivered_at = ? WHERE id = ?",
+                (datetime.now(timezone.utc).isoformat(), event_id),
+            )
+
+    def mark_failed(self, event_id: int, error: str) -> bool:
+        """Count a failed attempt; returns True when this one dead-lettered the event"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE vote_outbox SET attempts = attempts + 1, last_error = ?, "
+                "dead_at = CASE WHEN attempts + 1 >= ? THEN ? ELSE dead_at END WHERE id = ?",
+                (error[:500], MAX_DELIVERY_ATTEMPTS, datetime.now(timezone.utc).isoformat(), event_id),
+            )
+            row = self._conn.execute("SELECT dead_at FROM vote_outbox WHERE id = ?", (event_id,)).fetchone()
+        return bool(row and row[0])
+
+    def pending_count(self) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM vote_outbox WHERE delivered_at IS NULL AND dead_at IS NULL"
+            ).fetchone()
+        return int(row[0])
+
+    def dead_count(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM vote_outbox WHERE dead_at IS NOT NULL").fetchone()
+        return int(row[0])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,160 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+PERIOD_ALIASES = {
+    "daily": "daily",
+    "day": "daily",
+    "today": "daily",
+    "monthly": "monthly",
+    "month": "monthly",
+    "alltime": "alltime",
+    "all": "alltime",
+    "total": "alltime",
+}
+
+class VoteStatsStore:
+    """SQLite vote ledger with incrementally maintained per-player rollups and streaks"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS votes ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "player TEXT NOT NULL, "
+                "player_key TEXT NOT NULL, "
+                "service TEXT NOT NULL, "
+                "source TEXT NOT NULL, "
+                "voted_at TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS vote_rollups ("
+                "period TEXT NOT NULL, "
+                "bucket TEXT NOT NULL, "
+                "player_key TEXT NOT NULL, "
+                "player TEXT NOT NULL, "
+                "count INTEGER NOT NULL DEFAULT 0, "
+                "PRIMARY KEY (period, bucket, player_key))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_vote_rollups_rank "
+                "ON vote_rollups (period, bucket, count DESC)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS vote_streaks ("
+                "player_key TEXT PRIMARY KEY, "
+                "player TEXT NOT NULL, "
+                "current INTEGER NOT NULL, "
+                "best INTEGER NOT NULL, "
+                "last_day TEXT NOT NULL, "
+                "last_vote_at TEXT NOT NULL)"
+            )
+
+    @staticmethod
+    def _buckets(when: datetime) -> List[Tuple[str, str]]:
+        return [
+            ("daily", when.strftime("%Y-%m-%d")),
+            ("monthly", when.strftime("%Y-%m")),
+            ("alltime", "all"),
+        ]
+
+    @staticmethod
+    def normalize_period(period: str) -> Optional[str]:
+        return PERIOD_ALIASES.get((period or "").lower())
+
+    def record_vote(self, player: str, service: str, source: str = "console", voted_at: Optional[datetime] = None):
+        """Append a vote to the ledger and bump the rollups it falls into"""
+        when = (voted_at or datetime.now(timezone.utc)).astimezone(timezone.utc)
+        player_key = player.lower()
+        day = when.strftime("%Y-%m-%d")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO votes (player, player_key, service, source, voted_at) VALUES (?, ?, ?, ?, ?)",
+                (player, player_key, service, source, when.isoformat()),
+            )
+            for period, bucket in self._buckets(when):
+                self._conn.execute(
+                    "INSERT INTO vote_rollups (period, bucket, player_key, player, count) VALUES (?, ?, ?, ?, 1) "
+                    "ON CONFLICT (period, bucket, player_key) DO UPDATE SET count = count + 1, player = excluded.player",
+                    (period, bucket, player_key, player),
+                )
+            row = self._conn.execute(
+                "SELECT current, best, last_day FROM vote_streaks WHERE player_key = ?",
+                (player_key,),
+            ).fetchone()
+            if row is None:
+                current, best = 1, 1
+            else:
+                current, best, last_day = row
+                if day < last_day:
+                    return
+                if day != last_day:
+                    yesterday = (when - timedelta(days=1)).strftime("%Y-%m-%d")
+                    current = current + 1 if last_day == yesterday else 1
+                best = max(best, current)
+            self._conn.execute(
+                "INSERT INTO vote_streaks (player_key, player, current, best, last_day, last_vote_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (player_key) DO UPDATE SET player = excluded.player, current = excluded.current, "
+                "best = excluded.best, last_day = excluded.last_day, last_vote_at = excluded.last_vote_at",
+                (player_key, player, current, best, day, when.isoformat()),
+            )
+
+    def top(self, period: str = "monthly", limit: int = 10, when: Optional[datetime] = None) -> List[Tuple[str, int]]:
+        """Return the leaderboard for the current bucket of a period"""
+        period = self.normalize_period(period) or "monthly"
+        when = (when or datetime.now(timezone.utc)).astimezone(timezone.utc)
+        bucket = dict(self._buckets(when))[period]
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT player, count FROM vote_rollups WHERE period = ? AND bucket = ? "
+                "ORDER BY count DESC, player_key ASC LIMIT ?",
+                (period, bucket, int(limit)),
+            ).fetchall()
+        return [(player, int(count)) for player, count in rows]
+
+    def player_stats(self, player: str, when: Optional[datetime] = None) -> Optional[dict]:
+        """Return daily, monthly and all-time counts plus streaks for one player"""
+        player_key = player.lower()
+        when = (when or datetime.now(timezone.utc)).astimezone(timezone.utc)
+        stats = {"player": player, "daily": 0, "monthly": 0, "alltime": 0,
+                 "current_streak": 0, "best_streak": 0, "last_vote_at": None}
+        with self._lock:
+            for period, bucket in self._buckets(when):
+                row = self._conn.execute(
+                    "SELECT player, count FROM vote_rollups WHERE period = ? AND bucket = ? AND player_key = ?",
+                    (period, bucket, player_key),
+                ).fetchone()
+                if row:
+                    stats["player"] = row[0]
+                    stats[period] = int(row[1])
+            streak = self._conn.execute(
+                "SELECT player, current, best, last_day, last_vote_at FROM vote_streaks WHERE player_key = ?",
+                (player_key,),
+            ).fetchone()
+        if streak is None and stats["alltime"] == 0:
+            return None
+        if streak:
+            name, current, best, last_day, last_vote_at = streak
+            yesterday = (when - timedelta(days=1)).strftime("%Y-%m-%d")
+            stats["player"] = name
+            stats["current_streak"] = int(current) if last_day >= yesterday else 0
+            stats["best_streak"] = int(best)
+            stats["last_vote_at"] = last_vote_at
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
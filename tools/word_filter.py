@@ -0,0 +1,173 @@
+import random
+import string
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+ACTIONS = ("delete", "warn", "case")
+SEVERITY = {action: rank for rank, action in enumerate(ACTIONS, start=1)}
+
+ZERO_WIDTH = dict.fromkeys(map(ord, "\u200b\u200c\u200d\u200e\u200f\u2060\u2061\u2062\u2063\u2064\ufeff\u00ad\u034f\u180e"))
+LEET = str.maketrans({"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "9": "g",
+                      "@": "a", "$": "s", "€": "e", "£": "l"})
+
+def normalize(text: str) -> str:
+    """Casefold, strip zero-width characters and accents, and undo common leetspeak"""
+    text = text.translate(ZERO_WIDTH).casefold()
+    if not text.isascii():
+        text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return text.translate(LEET)
+
+@dataclass(frozen=True)
+class Term:
+    """A filter entry; a leading or trailing * lets the match run into the surrounding word"""
+
+    text: str
+    action: str
+    whole_start: bool
+    whole_end: bool
+
+    @classmethod
+    def parse(cls, raw: str, action: str) -> "Term":
+        if action not in SEVERITY:
+            raise ValueError(f"Unknown filter action '{action}'")
+        raw = raw.strip()
+        text = normalize(raw.strip("*"))
+        if not text:
+            raise ValueError("Filter terms cannot be empty")
+        return cls(text, action, not raw.startswith("*"), not raw.endswith("*"))
+
+@dataclass(frozen=True)
+class FilterMatch:
+    term: Term
+    start: int
+    end: int
+
+class AhoCorasick:
+    """Aho-Corasick automaton: every term is found in one left-to-right pass over the text
+
+    States are list indexes; each keeps a goto dict, a failure link and the
+    terms that end there, with the outputs of its failure chain merged in at
+    build time so matching never walks suffix links for output.
+    """
+
+    def __init__(self, terms: Iterable[Term]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[Tuple[Term, ...]] = [()]
+        for term in terms:
+            self._insert(term)
+        self._link()
+
+    def _insert(self, term: Term):
+        state = 0
+        for char in term.text:
+            following = self.goto[state].get(char)
+            if following is None:
+                following = len(self.goto)
+                self.goto[state][char] = following
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            state = following
+        self.output[state] += (term,)
+
+    def _link(self):
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, following in self.goto[state].items():
+                queue.append(following)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                link = self.goto[fallback].get(char, 0)
+                self.fail[following] = link if link != following else 0
+                if self.output[self.fail[following]]:
+                    self.output[following] += self.output[self.fail[following]]
+
+    def __len__(self):
+        return len(self.goto)
+
+    def matches(self, text: str) -> List[FilterMatch]:
+        goto, fail, output = self.goto, self.fail, self.output
+        found = []
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                for term in output[state]:
+                    start = position - len(term.text) + 1
+                    if term.whole_start and start > 0 and text[start - 1].isalnum():
+                        continue
+                    if term.whole_end and position + 1 < len(text) and text[position + 1].isalnum():
+                        continue
+                    found.append(FilterMatch(term, start, position + 1))
+        return found
+
+class ChatFilter:
+    """Normalizes a message once and runs it through the automaton"""
+
+    def __init__(self, terms: Dict[str, str]):
+        parsed = []
+        for raw, action in terms.items():
+            try:
+                parsed.append(Term.parse(raw, action))
+            except ValueError as e:
+                print(f"⚠️ Skipping filter term '{raw}': {e}")
+        self.terms = parsed
+        self.automaton = AhoCorasick(parsed)
+
+    def scan(self, content: str) -> Tuple[Optional[str], List[FilterMatch]]:
+        """The strongest action any match calls for, and the matches themselves"""
+        if not content or not self.terms:
+            return None, []
+        found = self.automaton.matches(normalize(content))
+        if not found:
+            return None, []
+        action = max((match.term.action for match in found), key=SEVERITY.__getitem__)
+        return action, found
+
+def benchmark(term_count: int = 5000, message_count: int = 20000, hit_rate: float = 0.02, seed: int = 1) -> dict:
+    """Build a filter of random terms and time it over synthetic chat messages"""
+    rng = random.Random(seed)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(term_count)]
+    chat = ["hey", "anyone", "on", "the", "server", "tonight", "building", "a", "farm", "near", "spawn",
+            "lol", "gg", "need", "diamonds", "who", "wants", "to", "trade", "nether", "base"]
+    messages = []
+    for _ in range(message_count):
+        message = [rng.choice(chat) for _ in range(rng.randint(3, 20))]
+        if rng.random() < hit_rate:
+            message.insert(rng.randrange(len(message)), rng.choice(words).replace("e", "3").upper())
+        if rng.random() < 0.05:
+            message.insert(rng.randrange(len(message)), "\u200b")
+        messages.append(" ".join(message))
+
+    started = time.perf_counter()
+    chat_filter = ChatFilter({word: rng.choice(ACTIONS) for word in words})
+    build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    hits = sum(1 for message in messages if chat_filter.scan(message)[0])
+    elapsed = time.perf_counter() - started
+    return {
+        "terms": len(chat_filter.terms),
+        "states": len(chat_filter.automaton),
+        "build_ms": build * 1000,
+        "messages": message_count,
+        "hits": hits,
+        "per_message_us": elapsed / message_count * 1e6,
+        "messages_per_second": message_count / elapsed,
+    }
+
+def main():
+    for terms in (500, 5000, 20000):
+        result = benchmark(term_count=terms)
+        print(f"{result['terms']:>6} terms, {result['states']:>7} states | build {result['build_ms']:7.1f} ms | "
+              f"{result['per_message_us']:6.1f} us/message | {result['messages_per_second']:>9,.0f} messages/s | "
+              f"{result['hits']} hits")
+
+if __name__ == '__main__':
+    main()